@@ -55,6 +55,17 @@ export async function getClienteById(
   return response.data;
 }
 
+/**
+ * Obtener varios clientes por ID en una sola petición (GET /clientes?ids=3,1,2).
+ * - Vienen en el orden pedido; los que no existen se omiten.
+ */
+export async function getClientesByIds(ids: number[]): Promise<Cliente[]> {
+  const response = await apiClient.get("/clientes", {
+    params: { ids: ids.join(",") },
+  });
+  return response.data.data;
+}
+
 /**
  * Actualizar (parcial) un cliente (PATCH /clientes/{id}).
  * El backend retorna el cliente actualizado.
@@ -144,6 +144,17 @@ export async function obtenerEmpleadoPorId(id: number): Promise<Empleado> {
   return resp.data;
 }
 
+/**
+ * Obtener varios Empleados por ID en una sola petición (GET /empleados?ids=3,1,2).
+ * - Vienen en el orden pedido; los que no existen se omiten.
+ */
+export async function obtenerEmpleadosPorIds(ids: number[]): Promise<Empleado[]> {
+  const resp = await apiClient.get("/empleados", {
+    params: { ids: ids.join(",") },
+  });
+  return resp.data.data;
+}
+
 /**
  * Catálogo de tipos de documento (GET /catalogos/tipos-documento).
  */
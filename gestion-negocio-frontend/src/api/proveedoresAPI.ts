@@ -71,6 +71,17 @@ export async function getProveedorById(id: number): Promise<ProveedorResponse> {
   return resp.data;
 }
 
+/**
+ * Obtener varios proveedores por ID en una sola petición (GET /proveedores?ids=3,1,2).
+ * Vienen en el orden pedido; los que no existen se omiten.
+ */
+export async function getProveedoresByIds(ids: number[]): Promise<ProveedorResponse[]> {
+  const resp = await apiClient.get("/proveedores", {
+    params: { ids: ids.join(",") },
+  });
+  return resp.data.data;
+}
+
 /* ─────────────────────────────────────────────────────────────
    Catálogos. Los definimos según tu backend en /catalogos/...
    ─────────────────────────────────────────────────────────────
@@ -0,0 +1,33 @@
+// src/api/syncAPI.ts
+import apiClient from "./axiosConfig";
+
+export type EntidadSync = "clientes" | "empleados" | "proveedores" | "productos";
+
+/**
+ * Respuesta de GET /sync/{entidad}:
+ * - cambios: filas nuevas o modificadas desde el cursor.
+ * - eliminados: ids borrados (aplicarlos después de los cambios).
+ * - cursor: guardarlo y enviarlo en la siguiente llamada.
+ * - hay_mas: repetir de inmediato con el nuevo cursor.
+ */
+export interface RespuestaSync<T> {
+  entidad: string;
+  cambios: T[];
+  eliminados: number[];
+  cursor: string;
+  hay_mas: boolean;
+}
+
+/**
+ * Trae los cambios de una entidad desde `cursor` (sin cursor = carga completa).
+ * Si el backend responde 410, el cursor venció: volver a llamar sin cursor.
+ */
+export async function sincronizar<T = any>(
+  entidad: EntidadSync,
+  cursor?: string | null
+): Promise<RespuestaSync<T>> {
+  const response = await apiClient.get(`/sync/${entidad}`, {
+    params: cursor ? { since: cursor } : {},
+  });
+  return response.data;
+}
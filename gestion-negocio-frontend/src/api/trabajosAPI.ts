@@ -0,0 +1,52 @@
+// src/api/trabajosAPI.ts
+import apiClient from "./axiosConfig";
+
+export type EstadoTrabajo = "pendiente" | "en_curso" | "completado" | "fallido" | "cancelado";
+
+export interface Trabajo {
+  id: number;
+  tipo: string;
+  estado: EstadoTrabajo;
+  prioridad: number;
+  organizacion_id: number | null;
+  creado_por: number | null;
+  intentos: number;
+  max_intentos: number;
+  progreso: number | null;
+  mensaje_progreso: string | null;
+  resultado: any;
+  error: string | null;
+  disponible_en: string;
+  fecha_creacion: string;
+  fecha_inicio: string | null;
+  fecha_fin: string | null;
+}
+
+/** Encola un trabajo (responde 202 con el trabajo en estado 'pendiente'). */
+export async function crearTrabajo(
+  tipo: string,
+  payload: Record<string, any> = {},
+  prioridad?: number
+): Promise<Trabajo> {
+  const response = await apiClient.post("/trabajos/", { tipo, payload, prioridad });
+  return response.data;
+}
+
+export async function listarTrabajos(estado?: EstadoTrabajo, limite = 50): Promise<Trabajo[]> {
+  const response = await apiClient.get("/trabajos/", {
+    params: estado ? { estado, limite } : { limite },
+  });
+  return response.data;
+}
+
+/** Estado y progreso (0 a 100) de un trabajo; consultarlo cada pocos segundos. */
+export async function obtenerTrabajo(id: number): Promise<Trabajo> {
+  const response = await apiClient.get(`/trabajos/${id}`);
+  return response.data;
+}
+
+/** Solo trabajos pendientes; 409 si ya empezó o terminó. */
+export async function cancelarTrabajo(id: number): Promise<Trabajo> {
+  const response = await apiClient.post(`/trabajos/${id}/cancelar`);
+  return response.data;
+}
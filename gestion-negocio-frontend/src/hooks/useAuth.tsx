@@ -11,6 +11,7 @@ import apiClient from "../api/axiosConfig";
 
 interface AuthContextType {
   user: any;
+  bootstrap: any;                   // organización, rol, permisos y huellas de catálogos
   token: string | null;
   isLoading: boolean;               // <-- nuevo
   login: (email: string, password: string) => Promise<void>;
@@ -19,6 +20,7 @@ interface AuthContextType {
 
 const AuthContext = createContext<AuthContextType>({
   user: null,
+  bootstrap: null,
   token: null,
   isLoading: true,
   login: async () => {},
@@ -27,6 +29,7 @@ const AuthContext = createContext<AuthContextType>({
 
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<any>(null);
+  const [bootstrap, setBootstrap] = useState<any>(null);
   const [token, setToken] = useState<string | null>(() => {
     return localStorage.getItem("access_token");
   });
@@ -34,17 +37,19 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   useEffect(() => {
     // Cada vez que cambie 'token' (o la primera vez si existe)
-    // consultamos /users/me y actualizamos 'user'
+    // consultamos /bootstrap (usuario, organización, permisos, ...) en una sola petición
     if (token) {
       apiClient
-        .get("/users/me")
+        .get("/bootstrap")
         .then((resp) => {
-          setUser(resp.data);
+          setUser(resp.data.usuario);
+          setBootstrap(resp.data);
         })
         .catch((err) => {
           console.error("Error al cargar usuario actual:", err);
           setToken(null);
           setUser(null);
+          setBootstrap(null);
           localStorage.removeItem("access_token");
         })
         .finally(() => {
@@ -53,6 +58,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     } else {
       // Si no hay token, ya no cargamos nada
       setUser(null);
+      setBootstrap(null);
       setIsLoading(false);
     }
   }, [token]);
@@ -74,12 +80,13 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const logout = () => {
     setUser(null);
+    setBootstrap(null);
     setToken(null);
     localStorage.removeItem("access_token");
   };
 
   return (
-    <AuthContext.Provider value={{ user, token, isLoading, login, logout }}>
+    <AuthContext.Provider value={{ user, bootstrap, token, isLoading, login, logout }}>
       {children}
     </AuthContext.Provider>
   );
@@ -0,0 +1,58 @@
+"""fecha_actualizacion en clientes, empleados y proveedores
+
+Revision ID: 7fb5b949d990
+Revises: c12b9a3d123c
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7fb5b949d990"
+down_revision: Union[str, None] = "c12b9a3d123c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS = ("clientes", "empleados", "proveedores")
+
+
+def upgrade() -> None:
+    # Las filas existentes quedan con la fecha de la migración
+    for tabla in TABLAS:
+        op.add_column(
+            tabla,
+            sa.Column(
+                "fecha_actualizacion",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+    # organizaciones ya tenía la columna, pero quedaba NULL hasta el primer UPDATE
+    op.execute(
+        "UPDATE organizaciones "
+        "SET fecha_actualizacion = COALESCE(fecha_creacion, now()) "
+        "WHERE fecha_actualizacion IS NULL"
+    )
+    op.alter_column(
+        "organizaciones",
+        "fecha_actualizacion",
+        server_default=sa.text("now()"),
+        existing_type=sa.DateTime(timezone=True),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "organizaciones",
+        "fecha_actualizacion",
+        server_default=None,
+        existing_type=sa.DateTime(timezone=True),
+    )
+    for tabla in TABLAS:
+        op.drop_column(tabla, "fecha_actualizacion")
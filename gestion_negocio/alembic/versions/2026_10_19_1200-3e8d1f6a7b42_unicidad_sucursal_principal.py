@@ -0,0 +1,46 @@
+"""una sola sucursal principal por organización
+
+Revision ID: 3e8d1f6a7b42
+Revises: 7fb5b949d990
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8d1f6a7b42"
+down_revision: Union[str, None] = "7fb5b949d990"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Si alguna org quedó con varias principales, se conserva la más antigua
+    op.execute(
+        """
+        UPDATE sucursales s
+        SET sucursal_principal = false
+        WHERE s.sucursal_principal
+          AND EXISTS (
+              SELECT 1 FROM sucursales o
+              WHERE o.organizacion_id = s.organizacion_id
+                AND o.sucursal_principal
+                AND o.id < s.id
+          )
+        """
+    )
+    op.create_index(
+        "uq_sucursal_principal_org",
+        "sucursales",
+        ["organizacion_id"],
+        unique=True,
+        postgresql_where=sa.text("sucursal_principal"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_sucursal_principal_org", table_name="sucursales")
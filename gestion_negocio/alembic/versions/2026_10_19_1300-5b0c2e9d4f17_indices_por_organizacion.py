@@ -0,0 +1,96 @@
+"""índices por organización y búsqueda por nombre
+
+Revision ID: 5b0c2e9d4f17
+Revises: 3e8d1f6a7b42
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0c2e9d4f17"
+down_revision: Union[str, None] = "3e8d1f6a7b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Listados: WHERE organizacion_id = :org ORDER BY id LIMIT/OFFSET
+TABLAS_ORG = (
+    "sucursales",
+    "centros_costos",
+    "bodegas",
+    "cajas",
+    "tiendas_virtuales",
+    "numeraciones_transaccion",
+    "usuarios",
+    "roles",
+    "clientes",
+    "empleados",
+    "proveedores",
+)
+
+# Búsqueda: lower(nombre_razon_social) ILIKE '%term%'
+TABLAS_TRGM = ("clientes", "empleados", "proveedores")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY no puede ir dentro de una transacción: las tablas de
+    # terceros ya tienen volumen y no deben bloquear escrituras.
+    with op.get_context().autocommit_block():
+        for tabla in TABLAS_ORG:
+            op.create_index(
+                f"ix_{tabla}_org_id",
+                tabla,
+                ["organizacion_id", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for tabla in TABLAS_TRGM:
+            op.create_index(
+                f"ix_{tabla}_nombre_trgm",
+                tabla,
+                [sa.text("lower(nombre_razon_social) gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        op.create_index(
+            "ix_empleados_org_vendedor",
+            "empleados",
+            ["organizacion_id", "id"],
+            postgresql_where=sa.text("es_vendedor"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # La extensión pg_trgm se deja instalada (puede usarla otra cosa)
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_empleados_org_vendedor",
+            table_name="empleados",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for tabla in TABLAS_TRGM:
+            op.drop_index(
+                f"ix_{tabla}_nombre_trgm",
+                table_name=tabla,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        for tabla in TABLAS_ORG:
+            op.drop_index(
+                f"ix_{tabla}_org_id",
+                table_name=tabla,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
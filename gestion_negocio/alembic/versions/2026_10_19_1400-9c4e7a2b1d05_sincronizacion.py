@@ -0,0 +1,91 @@
+"""sincronización: lápidas, fecha_actualizacion en productos e índices keyset
+
+Revision ID: 9c4e7a2b1d05
+Revises: 5b0c2e9d4f17
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e7a2b1d05"
+down_revision: Union[str, None] = "5b0c2e9d4f17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /sync/{entidad}: WHERE organizacion_id = :org AND (fecha_actualizacion, id) > (:f, :id)
+TABLAS_SYNC = ("clientes", "empleados", "proveedores")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "eliminaciones",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("tabla", sa.String(length=50), nullable=False),
+        sa.Column("registro_id", sa.Integer(), nullable=False),
+        sa.Column("organizacion_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "fecha_eliminacion",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_eliminaciones_sync",
+        "eliminaciones",
+        ["tabla", "organizacion_id", "fecha_eliminacion", "id"],
+    )
+
+    # now() es estable: PostgreSQL guarda el default sin reescribir la tabla
+    op.add_column(
+        "productos",
+        sa.Column(
+            "fecha_actualizacion",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        for tabla in TABLAS_SYNC:
+            op.create_index(
+                f"ix_{tabla}_org_sync",
+                tabla,
+                ["organizacion_id", "fecha_actualizacion", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            "ix_productos_sync",
+            "productos",
+            ["fecha_actualizacion", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_productos_sync",
+            table_name="productos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for tabla in TABLAS_SYNC:
+            op.drop_index(
+                f"ix_{tabla}_org_sync",
+                table_name=tabla,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.drop_column("productos", "fecha_actualizacion")
+    op.drop_index("ix_eliminaciones_sync", table_name="eliminaciones")
+    op.drop_table("eliminaciones")
@@ -0,0 +1,82 @@
+"""cola de trabajos en segundo plano
+
+Revision ID: 3f8d1c6a7e20
+Revises: 9c4e7a2b1d05
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8d1c6a7e20"
+down_revision: Union[str, None] = "9c4e7a2b1d05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trabajos",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("tipo", sa.String(length=100), nullable=False),
+        sa.Column(
+            "payload",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("estado", sa.String(length=20), nullable=False),
+        sa.Column("prioridad", sa.SmallInteger(), nullable=False),
+        sa.Column("organizacion_id", sa.Integer(), nullable=True),
+        sa.Column("creado_por", sa.Integer(), nullable=True),
+        sa.Column("intentos", sa.Integer(), nullable=False),
+        sa.Column("max_intentos", sa.Integer(), nullable=False),
+        sa.Column(
+            "disponible_en",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("bloqueado_por", sa.String(length=100), nullable=True),
+        sa.Column("bloqueado_en", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("progreso", sa.Float(), nullable=True),
+        sa.Column("mensaje_progreso", sa.String(length=255), nullable=True),
+        sa.Column("resultado", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "fecha_creacion",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("fecha_inicio", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("fecha_fin", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Índices parciales: el de reclamo solo contiene los pendientes, así no
+    # crece con el historial de trabajos terminados
+    op.create_index(
+        "ix_trabajos_pendientes",
+        "trabajos",
+        ["prioridad", "disponible_en", "id"],
+        postgresql_where=sa.text("estado = 'pendiente'"),
+    )
+    op.create_index(
+        "ix_trabajos_en_curso",
+        "trabajos",
+        ["organizacion_id"],
+        postgresql_where=sa.text("estado = 'en_curso'"),
+    )
+    op.create_index("ix_trabajos_org_id", "trabajos", ["organizacion_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trabajos_org_id", table_name="trabajos")
+    op.drop_index("ix_trabajos_en_curso", table_name="trabajos")
+    op.drop_index("ix_trabajos_pendientes", table_name="trabajos")
+    op.drop_table("trabajos")
@@ -0,0 +1,87 @@
+# gestion_negocio/benchmarks/batch_check.py
+
+"""
+Chequeo de /batch anidado: ninguna variante de la ruta debe llegar a
+ejecutar un /batch dentro de otro.
+
+  - por ruta: /batch con percent-encoding, barras repetidas o finales y
+    query string se rechaza con 400 antes de despachar;
+  - por marca: una sub-petición a /batch que llegara a despacharse (scope
+    armado por routes.batch._scope) también responde 400.
+
+Las rutas rechazadas no tocan la BD (get_current_user se reemplaza por un
+usuario fijo), así que corre sin PostgreSQL (desde gestion_negocio/):
+    python -m benchmarks.batch_check
+"""
+
+import asyncio
+import json
+import sys
+
+import httpx
+
+import main
+from dependencies.auth import ROLE_ADMIN, get_current_user
+from models.usuarios import EstadoUsuario, TipoUsuario, Usuario
+from routes.batch import _despachar, _scope
+from schemas.batch_schemas import SubPeticion
+
+RUTAS_ANIDADAS = [
+    "/batch",
+    "/batch/",
+    "/batch?x=1",
+    "/%62atch",
+    "/%62%61%74%63%68",
+    "//batch",
+    "/batch//",
+    "/%2Fbatch",
+]
+
+
+async def ejecutar() -> int:
+    usuario = Usuario(
+        id=1,
+        nombre="batch",
+        email="batch@ejemplo.com",
+        tipo_usuario=TipoUsuario.admin,
+        estado=EstadoUsuario.activo,
+        tiene_mfa=False,
+        rol_id=ROLE_ADMIN,
+        organizacion_id=1,
+    )
+    main.app.dependency_overrides[get_current_user] = lambda: usuario
+    errores = []
+    try:
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://batch") as cliente:
+            for ruta in RUTAS_ANIDADAS:
+                respuesta = await cliente.post("/batch", json=[{"method": "POST", "path": ruta, "body": []}])
+                print(f"{ruta:<22} {respuesta.status_code}")
+                if respuesta.status_code != 400:
+                    errores.append(f"{ruta}: respondió {respuesta.status_code}, se esperaba 400")
+
+        # Sub-petición a /batch ya despachada: la rechaza la marca del scope
+        sub = SubPeticion(method="POST", path="/batch", body=[{"method": "GET", "path": "/bootstrap"}])
+        cuerpo = json.dumps(sub.body).encode("utf-8")
+        padre = {
+            "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+            "server": ("batch", 80), "client": ("127.0.0.1", 1), "headers": [],
+        }
+        estado, _, respuesta = await _despachar(main.app, _scope(padre, sub, 0, cuerpo, usuario), cuerpo)
+        print(f"{'(marca de scope)':<22} {estado}")
+        if estado != 400:
+            errores.append(f"marca de scope: respondió {estado} {respuesta[:120]!r}, se esperaba 400")
+    finally:
+        main.app.dependency_overrides.pop(get_current_user, None)
+
+    for error in errores:
+        print(f"ERROR   {error}")
+    return 1 if errores else 0
+
+
+def main_cli():
+    sys.exit(asyncio.run(ejecutar()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,113 @@
+# gestion_negocio/benchmarks/bench_arranque.py
+
+"""
+Arranque en frío: desglose de imports y tiempo hasta la primera respuesta.
+
+1) Imports: corre `python -X importtime -c "import main"` y agrupa el
+   tiempo por módulo propio (routes.*, schemas.*, ...) y por paquete de
+   terceros (fastapi, sqlalchemy, ...). Muestra los más caros.
+
+2) Primera respuesta: lanza `uvicorn main:app` R veces y mide desde el
+   spawn hasta la primera respuesta HTTP a --ruta, con los routers
+   diferidos (ROUTERS_PEREZOSOS=1) y sin ellos (=0).
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.bench_arranque --top 25 --repeticiones 5
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+PROPIOS = ("main", "database", "models", "routes", "schemas", "services", "core", "dependencies")
+
+
+def desglose_imports(entorno: dict) -> tuple:
+    """(ms por módulo propio [self], ms por paquete de terceros [acumulado], total ms)."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=entorno, capture_output=True, text=True, check=True,
+    ).stderr
+    propios, terceros = defaultdict(float), defaultdict(float)
+    total = 0.0
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        try:
+            _, propio, acumulado, nombre = (p.strip() for p in linea.replace("import time:", "|").split("|"))
+            propio_us, acumulado_us = int(propio), int(acumulado)
+        except ValueError:
+            continue  # encabezado
+        modulo = nombre.strip()
+        raiz = modulo.split(".")[0]
+        profundidad = len(nombre) - len(nombre.lstrip())
+        if raiz in PROPIOS:
+            propios[modulo] += propio_us / 1000
+        elif profundidad == 0 or raiz not in terceros:
+            # Primera aparición de un paquete: su acumulado ya incluye sus submódulos
+            terceros[raiz] = max(terceros[raiz], acumulado_us / 1000)
+        if modulo == "main":
+            total = acumulado_us / 1000
+    return propios, terceros, total
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def primera_respuesta(entorno: dict, ruta: str, limite: float = 60.0) -> float:
+    puerto = _puerto_libre()
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(puerto), "--log-level", "warning"],
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - inicio < limite:
+            try:
+                httpx.get(f"http://127.0.0.1:{puerto}{ruta}", timeout=5)
+                return time.perf_counter() - inicio
+            except httpx.TransportError:
+                time.sleep(0.01)
+        raise RuntimeError(f"Sin respuesta en {limite}s")
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=15)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Desglose de imports y tiempo hasta la primera respuesta")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--ruta", default="/")
+    args = parser.parse_args()
+
+    for perezosos in ("1", "0"):
+        entorno = dict(os.environ, ROUTERS_PEREZOSOS=perezosos)
+        propios, terceros, total = desglose_imports(entorno)
+        print(f"\n=== ROUTERS_PEREZOSOS={perezosos}: import main = {total:.0f} ms")
+        print("  Módulos propios (tiempo propio):")
+        for modulo, ms in sorted(propios.items(), key=lambda x: -x[1])[:args.top]:
+            print(f"    {modulo:<40} {ms:8.1f} ms")
+        print("  Paquetes de terceros (acumulado):")
+        for paquete, ms in sorted(terceros.items(), key=lambda x: -x[1])[:args.top]:
+            print(f"    {paquete:<40} {ms:8.1f} ms")
+
+        tiempos = [primera_respuesta(entorno, args.ruta) for _ in range(args.repeticiones)]
+        print(
+            f"  Primera respuesta a {args.ruta}: mediana {statistics.median(tiempos) * 1000:.0f} ms "
+            f"(min {min(tiempos) * 1000:.0f}, max {max(tiempos) * 1000:.0f}, n={len(tiempos)})"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
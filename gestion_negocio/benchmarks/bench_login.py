@@ -0,0 +1,100 @@
+# gestion_negocio/benchmarks/bench_login.py
+
+"""
+Ráfaga de credential stuffing contra /auth/login.
+
+1) Modelo de CPU: N intentos desde pocas IPs contra muchos emails. Cada
+   intento que el limitador deja pasar paga una verificación bcrypt real
+   (lo que haría authenticate_user); los rechazados no. Compara el CPU
+   consumido sin limitador y con él.
+
+2) App (ASGI en proceso): con el balde de la IP ya agotado, envía la ráfaga
+   a /auth/login y mide latencia de los 429. No necesita base de datos: los
+   intentos rechazados nunca abren una consulta.
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.bench_login --intentos 300 --ips 5 --emails 100
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import bcrypt
+import httpx
+
+import main
+from services.limite_service import BucketsEnMemoria, Limite, LimitadorLogin, limitador_login
+
+
+def _rafaga(intentos: int, ips: int, emails: int) -> list:
+    rnd = random.Random(42)
+    return [
+        (f"10.0.0.{rnd.randrange(ips)}", f"usuario{rnd.randrange(emails)}@example.com")
+        for _ in range(intentos)
+    ]
+
+
+async def modelo_cpu(rafaga: list, limitador) -> tuple:
+    hash_ = bcrypt.hashpw(b"clave-correcta", bcrypt.gensalt())
+    verificados = 0
+    inicio = time.process_time()
+    for ip, email in rafaga:
+        if limitador is not None and await limitador.verificar(ip, email):
+            continue
+        bcrypt.checkpw(b"clave-incorrecta", hash_)
+        verificados += 1
+    return verificados, time.process_time() - inicio
+
+
+async def rafaga_app(intentos: int) -> list:
+    ip = "10.9.9.9"
+    # Agotar el balde de la IP
+    while not await limitador_login.verificar(ip, None):
+        pass
+
+    latencias = []
+    transporte = httpx.ASGITransport(app=main.app, client=(ip, 50000))
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        for i in range(intentos):
+            t0 = time.perf_counter()
+            respuesta = await cliente.post(
+                "/auth/login",
+                data={"username": f"usuario{i}@example.com", "password": "x"},
+            )
+            latencias.append(time.perf_counter() - t0)
+            assert respuesta.status_code == 429, respuesta.status_code
+    return latencias
+
+
+async def ejecutar(args):
+    rafaga = _rafaga(args.intentos, args.ips, args.emails)
+    limitador = LimitadorLogin(
+        backend=BucketsEnMemoria(),
+        por_ip=limitador_login.por_ip,
+        por_email=limitador_login.por_email,
+    )
+
+    print(f"Ráfaga: {args.intentos} intentos, {args.ips} IPs, {args.emails} emails")
+    print(f"Límites: ip={limitador.por_ip}  email={limitador.por_email}")
+    for nombre, lim in (("sin limitador", None), ("con limitador", limitador)):
+        verificados, cpu = await modelo_cpu(rafaga, lim)
+        print(f"  {nombre:<14} bcrypt={verificados:>6}  cpu={cpu:8.2f}s")
+
+    latencias = await rafaga_app(args.intentos)
+    p = statistics.quantiles(latencias, n=100)
+    print(
+        f"App, intentos rechazados (429): {len(latencias)}  "
+        f"p50={p[49] * 1000:.2f}ms  p99={p[98] * 1000:.2f}ms  "
+        f"({len(latencias) / sum(latencias):.0f} req/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ráfaga de credential stuffing contra /auth/login")
+    parser.add_argument("--intentos", type=int, default=300)
+    parser.add_argument("--ips", type=int, default=5)
+    parser.add_argument("--emails", type=int, default=100)
+    asyncio.run(ejecutar(parser.parse_args()))
@@ -0,0 +1,106 @@
+# gestion_negocio/benchmarks/bench_metricas.py
+
+"""
+Costo del middleware de métricas (core/metricas.py) por petición.
+
+1. Costo fijo: MetricasHTTP sobre una app ASGI mínima que responde de
+   inmediato (lo que agrega el middleware, sin ruido de la app).
+2. Sobre la app real: una ruta sin base de datos, con y sin el middleware,
+   llamando a la app ASGI directamente (sin red ni cliente HTTP).
+
+El criterio es < 2% sobre la latencia de las rutas reales, que con SQL
+están en milisegundos. Para medirlo de punta a punta, correr el harness
+de carga con METRICAS=0 y METRICAS=1 y comparar los reportes:
+
+    python -m benchmarks.carga comparar sin_metricas.json con_metricas.json --umbral 2
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.bench_metricas --peticiones 20000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["METRICAS"] = "0"
+
+import main  # noqa: E402
+from core.metricas import MetricasHTTP, RegistroMetricas  # noqa: E402
+
+
+def _scope(ruta: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": ruta,
+        "raw_path": ruta.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+async def _recibir():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _enviar(mensaje):
+    pass
+
+
+async def _medir(app, ruta: str, peticiones: int) -> float:
+    """Microsegundos por petición."""
+    inicio = time.perf_counter()
+    for _ in range(peticiones):
+        await app(_scope(ruta), _recibir, _enviar)
+    return (time.perf_counter() - inicio) / peticiones * 1e6
+
+
+async def _app_minima(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _comparar(sin, con, ruta: str, peticiones: int, rondas: int) -> tuple:
+    # Calentamiento: arma el stack de middlewares y las cachés de rutas
+    await _medir(sin, ruta, 200)
+    await _medir(con, ruta, 200)
+    tiempos_sin, tiempos_con = [], []
+    for _ in range(rondas):
+        tiempos_sin.append(await _medir(sin, ruta, peticiones))
+        tiempos_con.append(await _medir(con, ruta, peticiones))
+    return statistics.median(tiempos_sin), statistics.median(tiempos_con)
+
+
+async def ejecutar(ruta: str, peticiones: int, rondas: int):
+    base, medido = await _comparar(
+        _app_minima, MetricasHTTP(_app_minima, registro=RegistroMetricas()), ruta, peticiones, rondas
+    )
+    print(f"Costo fijo del middleware: {medido - base:.1f} µs/petición")
+
+    base, medido = await _comparar(
+        main.app, MetricasHTTP(main.app, registro=RegistroMetricas()), ruta, peticiones, rondas
+    )
+    print(f"App real, ruta {ruta} ({peticiones} peticiones x {rondas} rondas, mediana)")
+    print(f"  sin métricas: {base:8.1f} µs/petición")
+    print(f"  con métricas: {medido:8.1f} µs/petición ({(medido - base) / base * 100:+.1f}%)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ruta", default="/")
+    parser.add_argument("--peticiones", type=int, default=20000)
+    parser.add_argument("--rondas", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(ejecutar(args.ruta, args.peticiones, args.rondas))
+
+
+if __name__ == "__main__":
+    main_cli()
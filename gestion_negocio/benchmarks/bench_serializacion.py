@@ -0,0 +1,121 @@
+# gestion_negocio/benchmarks/bench_serializacion.py
+
+"""
+Compara el costo de serializar un listado paginado de clientes:
+
+  antes:   [Schema.from_orm(c) ...] + validación de FastAPI + jsonable_encoder + json.dumps
+  despues: FastJSONRoute (una validación con TypeAdapter + dump_json)
+
+No requiere base de datos: construye objetos ORM transitorios.
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.bench_serializacion --filas 1000 --repeticiones 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import main  # noqa: F401  (registra todos los modelos en el mapper)
+from core.fast_json import serializar_json
+from models.catalogos import TipoDocumento
+from models.clientes import Cliente
+from models.ubicaciones import Ciudad, Departamento
+from schemas.clientes import ClienteResponseSchema, PaginatedClientes
+
+
+def _generar_clientes(n: int) -> list:
+    tipo_doc = TipoDocumento(id=1, nombre="Cédula de ciudadanía", abreviatura="CC")
+    depto = Departamento(id=5, nombre="ANTIOQUIA")
+    ciudad = Ciudad(id=1, nombre="MEDELLÍN", departamento_id=5)
+    return [
+        Cliente(
+            id=i,
+            tipo_documento_id=1,
+            tipo_documento=tipo_doc,
+            organizacion_id=1,
+            numero_documento=f"{10000000 + i}",
+            nombre_razon_social=f"CLIENTE DE PRUEBA {i}",
+            email=f"cliente{i}@example.com",
+            departamento_id=5,
+            departamento=depto,
+            ciudad_id=1,
+            ciudad=ciudad,
+            direccion="Calle 1 # 2-3",
+            telefono1="6040000000",
+            celular="3000000000",
+            tipos_persona_id=1,
+            regimen_tributario_id=5,
+            moneda_principal_id=1,
+            tarifa_precios_id=1,
+            forma_pago_id=1,
+            permitir_venta=True,
+            descuento=0.0,
+            cupo_credito=0.0,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+_CAMPO = create_model_field(name="Response_bench", type_=PaginatedClientes, mode="serialization")
+
+
+async def _antes(clientes: list) -> bytes:
+    contenido = {
+        "data": [ClienteResponseSchema.from_orm(c) for c in clientes],
+        "page": 1,
+        "total_paginas": 1,
+        "total_registros": len(clientes),
+    }
+    valor = await serialize_response(field=_CAMPO, response_content=contenido, is_coroutine=True)
+    return JSONResponse(valor).body
+
+
+async def _despues(clientes: list) -> bytes:
+    contenido = {
+        "data": clientes,
+        "page": 1,
+        "total_paginas": 1,
+        "total_registros": len(clientes),
+    }
+    return serializar_json(PaginatedClientes, contenido)
+
+
+async def _medir(fn, clientes: list, repeticiones: int) -> list:
+    await fn(clientes)  # calentamiento (TypeAdapter, caches de pydantic)
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        await fn(clientes)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return tiempos
+
+
+async def _main(filas: int, repeticiones: int):
+    clientes = _generar_clientes(filas)
+
+    a = await _antes(clientes)
+    d = await _despues(clientes)
+    assert json.loads(a) == json.loads(d), "Las dos rutas producen JSON distinto"
+
+    print(f"{filas} filas, {repeticiones} repeticiones (ms por respuesta)")
+    for nombre, fn in (("antes", _antes), ("despues", _despues)):
+        t = await _medir(fn, clientes, repeticiones)
+        print(
+            f"  {nombre:8s} mediana={statistics.median(t):8.2f}  "
+            f"min={min(t):8.2f}  max={max(t):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_main(args.filas, args.repeticiones))
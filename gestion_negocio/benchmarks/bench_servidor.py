@@ -0,0 +1,131 @@
+# gestion_negocio/benchmarks/bench_servidor.py
+
+"""
+Throughput del servidor: configuración anterior vs gunicorn.conf.py.
+
+Levanta cada perfil como subproceso en un puerto libre, le aplica carga con
+N clientes concurrentes (conexiones keep-alive) durante D segundos y
+reporta req/s y latencias p50/p95/p99.
+
+  anterior: gunicorn main:app -k uvicorn.workers.UvicornH11Worker
+            (1 worker, keep-alive por defecto, asyncio + h11: lo mismo que
+            corría el Dockerfile cuando uvloop/httptools no estaban instalados)
+  perfil:   gunicorn main:app -c gunicorn.conf.py
+
+El generador de carga corre en la misma máquina: para números comparables
+con Cloud Run, limitar el servidor con taskset/--cpus y repetir.
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.bench_servidor --concurrencia 64 --segundos 15 --ruta /
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+PERFILES = {
+    "anterior": ["-c", "/dev/null", "-k", "uvicorn.workers.UvicornH11Worker"],
+    "perfil": ["-c", "gunicorn.conf.py"],
+}
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _esperar(url: str, limite: float = 60.0):
+    inicio = time.monotonic()
+    async with httpx.AsyncClient() as cliente:
+        while time.monotonic() - inicio < limite:
+            try:
+                await cliente.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {limite}s")
+
+
+async def _carga(url: str, concurrencia: int, segundos: float) -> tuple:
+    latencias, errores = [], 0
+    fin = time.monotonic() + segundos
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+
+    async with httpx.AsyncClient(limits=limites, timeout=30) as cliente:
+        async def usuario():
+            nonlocal errores
+            while time.monotonic() < fin:
+                t0 = time.perf_counter()
+                try:
+                    respuesta = await cliente.get(url)
+                    if respuesta.status_code >= 500:
+                        errores += 1
+                except httpx.TransportError:
+                    errores += 1
+                latencias.append(time.perf_counter() - t0)
+
+        inicio = time.monotonic()
+        await asyncio.gather(*(usuario() for _ in range(concurrencia)))
+        duracion = time.monotonic() - inicio
+    return latencias, errores, duracion
+
+
+async def medir(nombre: str, args) -> dict:
+    puerto = _puerto_libre()
+    comando = [
+        sys.executable, "-m", "gunicorn", "main:app",
+        *PERFILES[nombre],
+        "--bind", f"127.0.0.1:{puerto}",
+    ]
+    entorno = dict(os.environ)
+    if args.workers:
+        entorno["WEB_WORKERS"] = str(args.workers)
+    proceso = subprocess.Popen(
+        comando, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{puerto}{args.ruta}"
+    try:
+        await _esperar(url)
+        await _carga(url, args.concurrencia, min(2.0, args.segundos))  # calentamiento
+        latencias, errores, duracion = await _carga(url, args.concurrencia, args.segundos)
+    finally:
+        proceso.send_signal(signal.SIGTERM)
+        proceso.wait(timeout=15)
+
+    p = statistics.quantiles(latencias, n=100)
+    return {
+        "req_s": len(latencias) / duracion,
+        "p50": p[49] * 1000,
+        "p95": p[94] * 1000,
+        "p99": p[98] * 1000,
+        "errores": errores,
+    }
+
+
+async def ejecutar(args):
+    print(f"Ruta {args.ruta}, {args.concurrencia} clientes, {args.segundos}s por perfil")
+    for nombre in PERFILES:
+        r = await medir(nombre, args)
+        print(
+            f"  {nombre:<9} {r['req_s']:9.1f} req/s  "
+            f"p50={r['p50']:.1f}ms  p95={r['p95']:.1f}ms  p99={r['p99']:.1f}ms  "
+            f"errores={r['errores']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput: configuración anterior vs gunicorn.conf.py")
+    parser.add_argument("--ruta", default="/")
+    parser.add_argument("--concurrencia", type=int, default=64)
+    parser.add_argument("--segundos", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=0, help="Forzar WEB_WORKERS en el perfil")
+    asyncio.run(ejecutar(parser.parse_args()))
@@ -0,0 +1,25 @@
+# gestion_negocio/benchmarks/carga/__init__.py
+
+"""
+Pruebas de carga reproducibles.
+
+  datos      Llena una BD local con N organizaciones y M clientes /
+             empleados / proveedores / usuarios por organización (COPY) y
+             escribe un manifiesto (credenciales, rangos de ids, términos
+             de búsqueda) para los escenarios.
+  correr     Ejecuta los escenarios (login, listado con búsqueda, detalle,
+             creación, actualización) con clientes HTTP asíncronos contra
+             un servidor ya levantado y guarda el reporte en JSON.
+  comparar   Compara dos reportes (p50/p95/p99 y req/s por endpoint).
+
+Uso (desde gestion_negocio/, con la BD de prueba en las variables DB_*):
+
+    python -m benchmarks.carga datos --orgs 20 --por-org 2000
+    LOGIN_LIMITE_IP=100000/1 LOGIN_LIMITE_EMAIL=100000/1 \\
+        gunicorn main:app -c gunicorn.conf.py --bind 127.0.0.1:8080 &
+    python -m benchmarks.carga correr --url http://127.0.0.1:8080 --salida base.json
+    python -m benchmarks.carga comparar base.json nuevo.json
+
+El servidor bajo prueba debe correr con límites de login altos: todos los
+usuarios virtuales vienen de la misma IP.
+"""
@@ -0,0 +1,80 @@
+# gestion_negocio/benchmarks/carga/__main__.py
+
+import argparse
+import asyncio
+import json
+import sys
+
+from benchmarks.carga import reporte
+
+
+def _datos(args):
+    from benchmarks.carga.datos import generar
+
+    asyncio.run(generar(
+        orgs=args.orgs,
+        por_org=args.por_org,
+        usuarios_por_org=args.usuarios_por_org,
+        sucursales_por_org=args.sucursales_por_org,
+        manifiesto=args.manifiesto,
+        semilla=args.semilla,
+    ))
+
+
+def _correr(args):
+    from benchmarks.carga.escenarios import correr
+
+    with open(args.manifiesto) as archivo:
+        manifiesto = json.load(archivo)
+    resumen = asyncio.run(correr(
+        args.url, manifiesto, args.usuarios, args.segundos, args.calentamiento, args.semilla
+    ))
+    reporte.imprimir(resumen)
+    if args.salida:
+        reporte.guardar(resumen, args.salida)
+        print(f"Reporte: {args.salida}")
+
+
+def _comparar(args):
+    regresiones = reporte.comparar(reporte.cargar(args.base), reporte.cargar(args.nuevo), args.umbral)
+    for regresion in regresiones:
+        print(f"REGRESIÓN  {regresion}")
+    sys.exit(1 if regresiones else 0)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.carga")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("datos", help="Generar el dataset con COPY")
+    p.add_argument("--orgs", type=int, default=20)
+    p.add_argument("--por-org", type=int, default=2000, help="Clientes, empleados y proveedores por organización")
+    p.add_argument("--usuarios-por-org", type=int, default=10)
+    p.add_argument("--sucursales-por-org", type=int, default=3)
+    p.add_argument("--manifiesto", default="carga_manifiesto.json")
+    p.add_argument("--semilla", type=int, default=42)
+    p.set_defaults(func=_datos)
+
+    p = sub.add_parser("correr", help="Ejecutar los escenarios contra un servidor")
+    p.add_argument("--url", default="http://127.0.0.1:8080")
+    p.add_argument("--manifiesto", default="carga_manifiesto.json")
+    p.add_argument("--usuarios", type=int, default=32, help="Usuarios virtuales concurrentes")
+    p.add_argument("--segundos", type=float, default=60)
+    p.add_argument("--calentamiento", type=float, default=5)
+    p.add_argument("--semilla", type=int, default=7)
+    p.add_argument("--salida", help="Guardar el reporte en JSON")
+    p.set_defaults(func=_correr)
+
+    p = sub.add_parser("comparar", help="Comparar dos reportes")
+    p.add_argument("base")
+    p.add_argument("nuevo")
+    p.add_argument("--umbral", type=float, default=10.0,
+                   help="%% de empeoramiento de p95 o req/s que cuenta como regresión")
+    p.set_defaults(func=_comparar)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,225 @@
+# gestion_negocio/benchmarks/carga/datos.py
+
+"""
+Generador del dataset de carga con COPY (asyncpg copy_records_to_table).
+
+Las filas se arman desde la metadata de los modelos: columnas NOT NULL sin
+valor explícito reciben su default de Python o un valor generado, y las FK
+a catálogos toman ids reales de la BD (ciudad y departamento coherentes).
+Los ids de organizaciones y sucursales se reservan con nextval() para poder
+referenciarlos en el mismo COPY de las tablas hijas.
+"""
+
+import enum
+import json
+import random
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import asyncpg
+import bcrypt
+from sqlalchemy import Boolean, Date, DateTime, Enum, Float, Integer, Numeric, String
+from sqlalchemy.engine import make_url
+
+from database import database_url
+from dependencies.auth import ROLE_ADMIN
+from models.clientes import Cliente
+from models.empleados import Empleado
+from models.organizaciones import Organizacion, Sucursal
+from models.proveedores import Proveedor
+from models.usuarios import TipoUsuario, Usuario
+
+CLAVE_USUARIOS = "bench-clave-123"
+
+NOMBRES = (
+    "ANA", "CARLOS", "MARIA", "JUAN", "LUISA", "PEDRO", "SOFIA", "ANDRES",
+    "CAMILA", "JORGE", "VALENTINA", "DIEGO", "PAULA", "FELIPE", "LAURA",
+)
+APELLIDOS = (
+    "GOMEZ", "RODRIGUEZ", "MARTINEZ", "LOPEZ", "GARCIA", "PEREZ", "SANCHEZ",
+    "RAMIREZ", "TORRES", "FLOREZ", "RIVERA", "MORALES", "ORTIZ", "CASTRO",
+)
+EMPRESAS = (
+    "DISTRIBUCIONES", "COMERCIALIZADORA", "INVERSIONES", "SOLUCIONES",
+    "SERVICIOS", "INDUSTRIAS", "LOGISTICA", "TECNOLOGIA", "ALIMENTOS",
+)
+
+
+def dsn() -> str:
+    """URL de la app sin el driver de SQLAlchemy (asyncpg la acepta tal cual)."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _nombre(rnd: random.Random) -> str:
+    if rnd.random() < 0.4:
+        return f"{rnd.choice(EMPRESAS)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)} SAS"
+    return f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+
+
+class Generador:
+    def __init__(self, conn: asyncpg.Connection, semilla: int = 42):
+        self.conn = conn
+        self.rnd = random.Random(semilla)
+        self._ids: dict[str, list] = {}
+        self._ciudades: list = []
+
+    async def cargar_catalogos(self, modelos) -> None:
+        """ids existentes de cada tabla referenciada por FKs NOT NULL."""
+        for modelo in modelos:
+            for columna in modelo.__table__.columns:
+                for fk in columna.foreign_keys:
+                    tabla = fk.column.table.name
+                    if columna.nullable or tabla in self._ids or "organizacion_id" in fk.column.table.c:
+                        continue
+                    if tabla in ("organizaciones", "sucursales"):
+                        continue
+                    filas = await self.conn.fetch(f"SELECT id FROM {tabla}")
+                    if not filas:
+                        raise SystemExit(
+                            f"La tabla {tabla} está vacía: poblar catálogos y ubicaciones "
+                            f"(scripts/populate_*.py) antes de generar el dataset."
+                        )
+                    self._ids[tabla] = [f["id"] for f in filas]
+        self._ciudades = [
+            (f["id"], f["departamento_id"])
+            for f in await self.conn.fetch("SELECT id, departamento_id FROM ciudades")
+        ]
+
+    async def reservar_ids(self, tabla: str, cantidad: int) -> list:
+        filas = await self.conn.fetch(
+            "SELECT nextval(pg_get_serial_sequence($1, 'id')) AS id FROM generate_series(1, $2)",
+            tabla, cantidad,
+        )
+        return [f["id"] for f in filas]
+
+    def _valor(self, columna, i: int):
+        """Valor para una columna sin override (None = NULL / default del servidor)."""
+        fks = list(columna.foreign_keys)
+        if fks:
+            if columna.nullable:
+                return None
+            return self.rnd.choice(self._ids[fks[0].column.table.name])
+
+        if columna.default is not None and columna.default.is_scalar:
+            valor = columna.default.arg
+            return valor.name if isinstance(valor, enum.Enum) else valor
+        if columna.nullable or columna.server_default is not None:
+            return None
+
+        tipo = columna.type
+        if isinstance(tipo, Enum):
+            return tipo.enums[0]
+        if isinstance(tipo, String):
+            return f"{columna.name[:8].upper()}-{i}"
+        if isinstance(tipo, Boolean):
+            return False
+        if isinstance(tipo, Integer):
+            return i
+        if isinstance(tipo, Numeric) and not isinstance(tipo, Float):
+            return Decimal(i)
+        if isinstance(tipo, Float):
+            return float(i)
+        if isinstance(tipo, DateTime):
+            return datetime.now(timezone.utc) if tipo.timezone else datetime.utcnow()
+        if isinstance(tipo, Date):
+            return date.today()
+        raise ValueError(f"Sin generador para {columna.table.name}.{columna.name} ({tipo})")
+
+    async def copiar(self, modelo, filas: list[dict]) -> None:
+        """COPY de `filas` (dicts con overrides); el resto de columnas se genera."""
+        if not filas:
+            return
+        tabla = modelo.__table__
+        columnas = [
+            c for c in tabla.columns
+            if c.name in filas[0] or not (c.primary_key or (c.server_default is not None and c.default is None))
+        ]
+        nombres = [c.name for c in columnas]
+        registros = []
+        for i, fila in enumerate(filas, start=1):
+            registros.append(tuple(
+                fila[c.name] if c.name in fila else self._valor(c, i) for c in columnas
+            ))
+        await self.conn.copy_records_to_table(tabla.name, records=registros, columns=nombres)
+
+    def ubicacion(self) -> dict:
+        ciudad_id, departamento_id = self.rnd.choice(self._ciudades)
+        return {"ciudad_id": ciudad_id, "departamento_id": departamento_id}
+
+    def tercero(self, org_id: int, i: int, prefijo: str) -> dict:
+        return {
+            "organizacion_id": org_id,
+            "numero_documento": str(10_000_000 + i),
+            "nombre_razon_social": _nombre(self.rnd),
+            "email": f"{prefijo}{i}@org{org_id}.bench",
+            "direccion": f"CALLE {self.rnd.randint(1, 200)} # {self.rnd.randint(1, 99)}-{self.rnd.randint(1, 99)}",
+            **self.ubicacion(),
+        }
+
+
+async def generar(orgs: int, por_org: int, usuarios_por_org: int, sucursales_por_org: int,
+                  manifiesto: str, semilla: int = 42) -> dict:
+    conn = await asyncpg.connect(dsn())
+    inicio = time.perf_counter()
+    try:
+        gen = Generador(conn, semilla)
+        await gen.cargar_catalogos((Cliente, Empleado, Proveedor, Sucursal, Usuario, Organizacion))
+        hash_clave = bcrypt.hashpw(CLAVE_USUARIOS.encode(), bcrypt.gensalt()).decode()
+
+        org_ids = await gen.reservar_ids("organizaciones", orgs)
+        await gen.copiar(Organizacion, [
+            {"id": org_id, "nombre_fiscal": f"ORGANIZACION BENCH {org_id}",
+             "email_principal": f"admin@org{org_id}.bench"}
+            for org_id in org_ids
+        ])
+
+        datos_orgs = []
+        for org_id in org_ids:
+            sucursal_ids = await gen.reservar_ids("sucursales", sucursales_por_org)
+            await gen.copiar(Sucursal, [
+                {"id": s_id, "organizacion_id": org_id, "nombre": f"SUCURSAL {n}",
+                 "sucursal_principal": n == 1, **gen.ubicacion()}
+                for n, s_id in enumerate(sucursal_ids, start=1)
+            ])
+            await gen.copiar(Usuario, [
+                {"organizacion_id": org_id, "nombre": _nombre(gen.rnd),
+                 "email": f"usuario{i}@org{org_id}.bench", "hashed_password": hash_clave,
+                 "tipo_usuario": TipoUsuario.admin.name, "rol_id": ROLE_ADMIN}
+                for i in range(1, usuarios_por_org + 1)
+            ])
+            for modelo, prefijo in ((Cliente, "c"), (Empleado, "e"), (Proveedor, "p")):
+                filas = [gen.tercero(org_id, i, prefijo) for i in range(1, por_org + 1)]
+                if modelo is Empleado:
+                    for fila in filas:
+                        fila["sucursal_id"] = gen.rnd.choice(sucursal_ids)
+                        fila["es_vendedor"] = gen.rnd.random() < 0.1
+                await gen.copiar(modelo, filas)
+
+            rango = await conn.fetchrow(
+                "SELECT min(id) AS desde, max(id) AS hasta FROM clientes WHERE organizacion_id = $1",
+                org_id,
+            )
+            datos_orgs.append({
+                "id": org_id,
+                "usuarios": [f"usuario{i}@org{org_id}.bench" for i in range(1, usuarios_por_org + 1)],
+                "clientes": [rango["desde"], rango["hasta"]],
+            })
+
+        for tabla in ("organizaciones", "sucursales", "usuarios", "clientes", "empleados", "proveedores"):
+            await conn.execute(f"ANALYZE {tabla}")
+    finally:
+        await conn.close()
+
+    datos = {
+        "clave": CLAVE_USUARIOS,
+        "busquedas": [n.lower() for n in APELLIDOS + EMPRESAS],
+        "organizaciones": datos_orgs,
+    }
+    with open(manifiesto, "w") as archivo:
+        json.dump(datos, archivo, indent=2)
+    print(
+        f"{orgs} organizaciones x {por_org} clientes/empleados/proveedores y "
+        f"{usuarios_por_org} usuarios en {time.perf_counter() - inicio:.1f}s. Manifiesto: {manifiesto}"
+    )
+    return datos
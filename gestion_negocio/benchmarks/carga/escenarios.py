@@ -0,0 +1,153 @@
+# gestion_negocio/benchmarks/carga/escenarios.py
+
+"""
+Escenarios de carga sobre la API real (httpx asíncrono, conexiones keep-alive).
+
+Cada usuario virtual inicia sesión con un usuario del manifiesto y luego,
+hasta que se acaba el tiempo, elige un escenario según su peso:
+
+  clientes.lista.busqueda   GET   /clientes/?search=<apellido>&page=<1..5>
+  clientes.detalle          GET   /clientes/{id}
+  clientes.crear            POST  /clientes/
+  clientes.actualizar       PATCH /clientes/{id}
+  auth.login                POST  /auth/login
+
+Los ids salen de los rangos de su organización (manifiesto), así que las
+lecturas y escrituras quedan repartidas entre tenants.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+
+from benchmarks.carga.reporte import Registro
+
+PESOS = {
+    "clientes.lista.busqueda": 35,
+    "clientes.detalle": 35,
+    "clientes.crear": 10,
+    "clientes.actualizar": 15,
+    "auth.login": 5,
+}
+
+# Campos del detalle que se copian para armar un cliente válido (FKs reales)
+CAMPOS_PLANTILLA = (
+    "tipo_documento_id", "organizacion_id", "departamento_id", "ciudad_id",
+    "direccion", "telefono1", "tipos_persona_id", "regimen_tributario_id",
+    "moneda_principal_id", "tarifa_precios_id", "forma_pago_id",
+)
+
+
+class UsuarioVirtual:
+    def __init__(self, cliente: httpx.AsyncClient, registro: Registro, org: dict,
+                 email: str, clave: str, busquedas: list, rnd: random.Random):
+        self.cliente = cliente
+        self.registro = registro
+        self.org = org
+        self.email = email
+        self.clave = clave
+        self.busquedas = busquedas
+        self.rnd = rnd
+        self.headers = {}
+        self.plantilla = None
+
+    async def _pedir(self, endpoint: str, metodo: str, url: str, **kwargs) -> httpx.Response | None:
+        t0 = time.perf_counter()
+        try:
+            respuesta = await self.cliente.request(metodo, url, headers=self.headers, **kwargs)
+            estado = respuesta.status_code
+        except httpx.TransportError:
+            respuesta, estado = None, 0
+        self.registro.agregar(endpoint, time.perf_counter() - t0, estado)
+        return respuesta
+
+    def _id_cliente(self) -> int:
+        desde, hasta = self.org["clientes"]
+        return self.rnd.randint(desde, hasta)
+
+    async def login(self) -> bool:
+        respuesta = await self._pedir(
+            "auth.login", "POST", "/auth/login",
+            data={"username": self.email, "password": self.clave},
+        )
+        if respuesta is None or respuesta.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {respuesta.json()['access_token']}"}
+        return True
+
+    async def clientes_lista_busqueda(self):
+        termino = self.rnd.choice(self.busquedas)
+        pagina = self.rnd.randint(1, 5)
+        await self._pedir(
+            "clientes.lista.busqueda", "GET", "/clientes/",
+            params={"search": termino, "page": pagina, "page_size": 20},
+        )
+
+    async def clientes_detalle(self):
+        respuesta = await self._pedir("clientes.detalle", "GET", f"/clientes/{self._id_cliente()}")
+        if self.plantilla is None and respuesta is not None and respuesta.status_code == 200:
+            datos = respuesta.json()
+            self.plantilla = {campo: datos[campo] for campo in CAMPOS_PLANTILLA}
+
+    async def clientes_crear(self):
+        if self.plantilla is None:
+            return await self.clientes_detalle()
+        await self._pedir("clientes.crear", "POST", "/clientes/", json={
+            **self.plantilla,
+            "numero_documento": f"B{uuid.uuid4().int % 10**12}",
+            "nombre_razon_social": f"CLIENTE CARGA {self.rnd.randint(1, 10**6)}",
+        })
+
+    async def clientes_actualizar(self):
+        await self._pedir(
+            "clientes.actualizar", "PATCH", f"/clientes/{self._id_cliente()}",
+            json={"telefono1": str(self.rnd.randint(3000000000, 3999999999))},
+        )
+
+    async def auth_login(self):
+        await self.login()
+
+    async def correr(self, fin: float):
+        if not await self.login():
+            return
+        nombres = list(PESOS)
+        pesos = list(PESOS.values())
+        while time.monotonic() < fin:
+            escenario = self.rnd.choices(nombres, weights=pesos)[0]
+            await getattr(self, escenario.replace(".", "_"))()
+
+
+async def correr(url: str, manifiesto: dict, usuarios: int, segundos: float,
+                 calentamiento: float = 5.0, semilla: int = 7) -> dict:
+    """Corre `usuarios` usuarios virtuales y retorna el resumen (sin el calentamiento)."""
+    limites = httpx.Limits(max_connections=usuarios, max_keepalive_connections=usuarios)
+    orgs = manifiesto["organizaciones"]
+
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as cliente:
+        async def fase(duracion: float) -> tuple:
+            registro = Registro()
+            fin = time.monotonic() + duracion
+            virtuales = []
+            for i in range(usuarios):
+                org = orgs[i % len(orgs)]
+                virtuales.append(UsuarioVirtual(
+                    cliente, registro, org,
+                    email=org["usuarios"][(i // len(orgs)) % len(org["usuarios"])],
+                    clave=manifiesto["clave"],
+                    busquedas=manifiesto["busquedas"],
+                    rnd=random.Random(semilla + i),
+                ))
+            inicio = time.monotonic()
+            await asyncio.gather(*(v.correr(fin) for v in virtuales))
+            return registro, time.monotonic() - inicio
+
+        if calentamiento > 0:
+            await fase(calentamiento)
+        registro, duracion = await fase(segundos)
+
+    resumen = registro.resumen(duracion)
+    resumen["parametros"] = {"url": url, "usuarios": usuarios, "segundos": segundos, "semilla": semilla}
+    return resumen
@@ -0,0 +1,94 @@
+# gestion_negocio/benchmarks/carga/reporte.py
+
+"""
+Métricas por endpoint (p50/p95/p99, req/s, errores) y comparación entre corridas.
+"""
+
+import json
+import math
+from collections import defaultdict
+
+
+def percentil(valores_ordenados: list, p: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)."""
+    if not valores_ordenados:
+        return 0.0
+    rango = max(math.ceil(p / 100 * len(valores_ordenados)), 1)
+    return valores_ordenados[rango - 1]
+
+
+class Registro:
+    def __init__(self):
+        self.latencias: dict[str, list] = defaultdict(list)
+        self.errores: dict[str, int] = defaultdict(int)
+        self.estados: dict[str, dict] = defaultdict(lambda: defaultdict(int))
+
+    def agregar(self, endpoint: str, segundos: float, estado: int) -> None:
+        self.latencias[endpoint].append(segundos)
+        self.estados[endpoint][estado] += 1
+        if estado == 0 or estado >= 400:
+            self.errores[endpoint] += 1
+
+    def resumen(self, duracion: float) -> dict:
+        endpoints = {}
+        for endpoint, latencias in sorted(self.latencias.items()):
+            ordenadas = sorted(latencias)
+            endpoints[endpoint] = {
+                "n": len(ordenadas),
+                "req_s": len(ordenadas) / duracion,
+                "p50_ms": percentil(ordenadas, 50) * 1000,
+                "p95_ms": percentil(ordenadas, 95) * 1000,
+                "p99_ms": percentil(ordenadas, 99) * 1000,
+                "errores": self.errores[endpoint],
+                "estados": {str(k): v for k, v in sorted(self.estados[endpoint].items())},
+            }
+        total = sum(len(v) for v in self.latencias.values())
+        return {"duracion_s": duracion, "req_s_total": total / duracion, "endpoints": endpoints}
+
+
+def imprimir(reporte: dict) -> None:
+    print(f"{'endpoint':<28}{'n':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}")
+    for endpoint, m in reporte["endpoints"].items():
+        print(
+            f"{endpoint:<28}{m['n']:>8}{m['req_s']:>10.1f}{m['p50_ms']:>10.1f}"
+            f"{m['p95_ms']:>10.1f}{m['p99_ms']:>10.1f}{m['errores']:>9}"
+        )
+    print(f"Total: {reporte['req_s_total']:.1f} req/s en {reporte['duracion_s']:.0f}s")
+
+
+def guardar(reporte: dict, ruta: str) -> None:
+    with open(ruta, "w") as archivo:
+        json.dump(reporte, archivo, indent=2)
+
+
+def cargar(ruta: str) -> dict:
+    with open(ruta) as archivo:
+        return json.load(archivo)
+
+
+def _delta(antes: float, despues: float) -> float:
+    return (despues - antes) / antes * 100 if antes else 0.0
+
+
+def comparar(base: dict, nuevo: dict, umbral: float) -> list:
+    """
+    Imprime la tabla de diferencias y retorna las regresiones: p95 que
+    empeora más de `umbral` % o req/s que cae más de `umbral` %.
+    """
+    regresiones = []
+    print(f"{'endpoint':<28}{'req/s':>20}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}")
+    for endpoint in sorted(set(base["endpoints"]) | set(nuevo["endpoints"])):
+        a, b = base["endpoints"].get(endpoint), nuevo["endpoints"].get(endpoint)
+        if a is None or b is None:
+            print(f"{endpoint:<28}  (solo en {'el nuevo' if a is None else 'la base'})")
+            continue
+        celdas = []
+        for clave in ("req_s", "p50_ms", "p95_ms", "p99_ms"):
+            celdas.append(f"{b[clave]:>9.1f} ({_delta(a[clave], b[clave]):+6.1f}%)")
+        print(f"{endpoint:<28}" + "".join(f"{c:>20}" for c in celdas))
+
+        if _delta(a["p95_ms"], b["p95_ms"]) > umbral:
+            regresiones.append(f"{endpoint}: p95 {a['p95_ms']:.1f} -> {b['p95_ms']:.1f} ms")
+        if _delta(a["req_s"], b["req_s"]) < -umbral:
+            regresiones.append(f"{endpoint}: req/s {a['req_s']:.1f} -> {b['req_s']:.1f}")
+    return regresiones
@@ -0,0 +1,442 @@
+# gestion_negocio/benchmarks/explain_check.py
+
+"""
+Chequeo de planes (EXPLAIN) de los listados y detalles por organización.
+
+Cada escenario se ejecuta a través de la app (ASGI en proceso, sin red):
+se capturan las sentencias SELECT que emite el handler y se corre
+`EXPLAIN (FORMAT JSON)` de cada una con sus mismos parámetros. Así se
+revisan las consultas reales de las rutas, no una copia.
+
+Falla (exit 1) si algún plan:
+
+  - hace Seq Scan CON filtro sobre una tabla de organización con volumen
+    (>= --min-filas): falta un índice para ese patrón de consulta;
+  - supera el costo total de la línea base (explain_baseline.json) en
+    más de --tolerancia, o no figura en ella.
+
+Sin explain_baseline.json el chequeo falla: la línea base versionada se
+genera sobre la misma semilla que CI (BD vacía):
+    python -m benchmarks.explain_check --crear-esquema --poblar --sembrar-catalogos --actualizar-baseline
+
+Un Seq Scan SIN filtro (p.ej. el count de un listado sin organización ni
+búsqueda) lee la tabla completa por definición: se informa como aviso.
+
+Requiere una BD DE PRUEBA con las migraciones aplicadas y los catálogos
+poblados (scripts/populate_catalogos.py, populate_ubicaciones_csv.py), o
+--sembrar-catalogos para crear una fila en cada catálogo vacío (CI);
+usa las mismas variables DB_* que la app. Sobre una BD vacía,
+--crear-esquema crea las tablas desde los modelos (las migraciones
+iniciales del repo suponen una BD existente y no corren desde cero).
+
+Uso (desde gestion_negocio/):
+    python -m benchmarks.explain_check --poblar --orgs 100
+    python -m benchmarks.explain_check --actualizar-baseline
+    python -m benchmarks.explain_check
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+from sqlalchemy import (
+    Boolean, Date, DateTime, Integer, Numeric, Float, String, Enum,
+    cast, event, func, insert, literal, select, text
+)
+
+import main
+from database import AsyncSessionLocal, engine
+from models import Base
+from dependencies.auth import ROLE_ADMIN, get_current_user
+from models.clientes import Cliente
+from models.empleados import Empleado
+from models.organizaciones import (
+    Bodega, Caja, CentroCosto, NumeracionTransaccion, Organizacion, Sucursal,
+    TiendaVirtual
+)
+from models.proveedores import Proveedor
+from models.roles import Rol
+from models.usuarios import TipoUsuario, Usuario
+
+BASELINE = Path(__file__).with_name("explain_baseline.json")
+
+# Filas por organización (en orden: las FK apuntan a tablas ya pobladas)
+VOLUMEN = (
+    (Sucursal, 5),
+    (CentroCosto, 20),
+    (Bodega, 10),
+    (Caja, 10),
+    (TiendaVirtual, 3),
+    (NumeracionTransaccion, 5),
+    (Rol, 5),
+    (Usuario, 20),
+    (Cliente, 2000),
+    (Empleado, 200),
+    (Proveedor, 500),
+)
+
+TABLAS_ORG = {modelo.__tablename__ for modelo, _ in VOLUMEN}
+
+# Columnas de nombre: texto variado para que las búsquedas sean selectivas
+COLUMNAS_NOMBRE = {"nombre", "nombre_razon_social", "nombre_fiscal"}
+
+
+# ---------------------------------------------------------------------------
+# Población
+# ---------------------------------------------------------------------------
+
+def _expresion(columna, g, org_id):
+    """Valor de la columna para la fila g de la organización (o None = omitir)."""
+    if columna.primary_key:
+        return None
+    if columna.name == "organizacion_id":
+        return literal(org_id)
+    if columna.name == "sucursal_principal":
+        return g == 1
+    if columna.name == "es_vendedor":
+        return g % 10 == 0
+    if columna.name == "telefono1":
+        # Los esquemas de terceros exigen al menos un número de contacto
+        return literal("6010000000")
+
+    fks = list(columna.foreign_keys)
+    if fks:
+        destino = fks[0].column.table
+        # Las FKs opcionales a filas de la organización (sucursal_id) también
+        # se llenan: algunos esquemas de respuesta las exigen
+        if columna.nullable and "organizacion_id" not in destino.c:
+            return None
+        stmt = select(func.min(destino.c.id))
+        if "organizacion_id" in destino.c:
+            stmt = stmt.where(destino.c.organizacion_id == org_id)
+        return stmt.scalar_subquery()
+
+    if columna.nullable or columna.default is not None or columna.server_default is not None:
+        return None
+
+    tipo = columna.type
+    if isinstance(tipo, Enum):
+        return None
+    if isinstance(tipo, String):
+        if columna.name in COLUMNAS_NOMBRE:
+            semilla = literal(f"{org_id}-") + cast(g, String)
+            return literal(f"{columna.table.name.upper()} ") + func.upper(
+                func.substr(func.md5(semilla), 1, 10)
+            )
+        if columna.name == "email":
+            # Único global y válido para EmailStr
+            return literal(f"{org_id}-") + cast(g, String) + literal("@ejemplo.com")
+        # Único por organización (numero_documento)
+        return literal(f"{org_id}-") + cast(g, String)
+    if isinstance(tipo, Boolean):
+        return literal(False)
+    if isinstance(tipo, (Integer, Numeric, Float)):
+        return g
+    if isinstance(tipo, (Date, DateTime)):
+        return func.now()
+    raise ValueError(f"Sin generador para {columna.table.name}.{columna.name} ({tipo})")
+
+
+def _insert_serie(modelo, n: int, org_id):
+    tabla = getattr(modelo, "__table__", modelo)
+    g = func.generate_series(1, n).column_valued("g")
+    columnas, valores = [], []
+    for columna in tabla.columns:
+        valor = _expresion(columna, g, org_id)
+        if valor is not None:
+            columnas.append(columna.name)
+            valores.append(valor)
+    return insert(tabla).from_select(columnas, select(*valores))
+
+
+async def _catalogos_vacios(conn) -> list:
+    """
+    Tablas globales vacías alcanzables por FKs NOT NULL desde las tablas a
+    poblar, en orden de dependencias (departamentos antes que ciudades).
+    """
+    pendientes = [Organizacion.__table__] + [modelo.__table__ for modelo, _ in VOLUMEN]
+    revisadas, vacias = set(), set()
+    while pendientes:
+        tabla = pendientes.pop()
+        for columna in tabla.columns:
+            for fk in columna.foreign_keys:
+                destino = fk.column.table
+                if columna.nullable or destino.name in TABLAS_ORG or destino.name == "organizaciones":
+                    continue
+                if destino.name in revisadas:
+                    continue
+                revisadas.add(destino.name)
+                if (await conn.execute(select(func.count()).select_from(destino))).scalar() == 0:
+                    vacias.add(destino.name)
+                    pendientes.append(destino)
+    return [tabla for tabla in Base.metadata.sorted_tables if tabla.name in vacias]
+
+
+async def _verificar_catalogos(conn, sembrar: bool):
+    faltantes = await _catalogos_vacios(conn)
+    if not faltantes:
+        return
+    if not sembrar:
+        raise SystemExit(
+            "Catálogos vacíos: " + ", ".join(t.name for t in faltantes)
+            + ". Ejecutar primero los scripts de scripts/populate_*.py (o --sembrar-catalogos)"
+        )
+    for tabla in faltantes:
+        await conn.execute(_insert_serie(tabla, 1, 0))
+    print("Catálogos sembrados: " + ", ".join(t.name for t in faltantes))
+
+
+async def crear_esquema():
+    """Tablas e índices desde los modelos (declaran los mismos que las migraciones)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def poblar(orgs: int, escala: float, sembrar_catalogos: bool = False):
+    async with engine.begin() as conn:
+        await _verificar_catalogos(conn, sembrar_catalogos)
+        org_ids = (await conn.execute(
+            _insert_serie(Organizacion, orgs, 0).returning(Organizacion.id)
+        )).scalars().all()
+        for org_id in org_ids:
+            for modelo, filas in VOLUMEN:
+                await conn.execute(_insert_serie(modelo, max(int(filas * escala), 1), org_id))
+        print(f"Pobladas {len(org_ids)} organizaciones (escala {escala}).")
+
+    await analizar_tablas()
+
+
+async def analizar_tablas():
+    """
+    Estadísticas al día para que el planner vea el volumen. Con el objetivo
+    alto ANALYZE lee las tablas completas (no una muestra al azar) y VACUUM
+    marca las páginas visibles sin esperar al autovacuum: sobre la misma
+    semilla los costos salen iguales en cada corrida.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("SET default_statistics_target = 1000")
+        await conn.exec_driver_sql("VACUUM (ANALYZE)")
+        await conn.exec_driver_sql("RESET default_statistics_target")
+
+
+# ---------------------------------------------------------------------------
+# Escenarios
+# ---------------------------------------------------------------------------
+
+async def _contexto():
+    """Organización con más clientes, ids de muestra y un término de búsqueda."""
+    async with AsyncSessionLocal() as db:
+        org_id = (await db.execute(
+            select(Cliente.organizacion_id)
+            .group_by(Cliente.organizacion_id)
+            .order_by(func.count().desc(), Cliente.organizacion_id)
+            .limit(1)
+        )).scalar()
+        if org_id is None:
+            raise SystemExit("La BD no tiene datos: ejecutar con --poblar.")
+
+        ids = {}
+        for modelo, _ in VOLUMEN:
+            ids[modelo.__tablename__] = (await db.execute(
+                select(func.max(modelo.id)).where(modelo.organizacion_id == org_id)
+            )).scalar()
+
+        nombre = (await db.execute(
+            select(Cliente.nombre_razon_social).where(Cliente.id == ids["clientes"])
+        )).scalar()
+    # 5 caracteres del nombre: búsqueda selectiva, como la de un usuario
+    termino = nombre.split()[-1][:5].lower()
+    return org_id, ids, termino
+
+
+def _varios(id_):
+    # Orden a propósito distinto del de la tabla (?ids= lo conserva)
+    return ",".join(str(i) for i in (id_, id_ - 2, id_ - 1) if i > 0)
+
+
+def escenarios(org_id, ids, termino):
+    o = f"/organizations/{org_id}"
+    return {
+        "clientes.lista": "/clientes/",
+        "clientes.lista.busqueda": f"/clientes/?search={termino}",
+        "clientes.lista.pagina": "/clientes/?page=50",
+        "clientes.lista.campos": "/clientes/?view=summary",
+        "clientes.detalle": f"/clientes/{ids['clientes']}",
+        "clientes.ids": f"/clientes/?ids={_varios(ids['clientes'])}",
+        "clientes.ids.campos": f"/clientes/?ids={_varios(ids['clientes'])}&view=summary",
+        "empleados.lista": "/empleados/",
+        "empleados.lista.vendedores": "/empleados/?es_vendedor=true",
+        "empleados.lista.busqueda": f"/empleados/?search={termino}",
+        "empleados.detalle": f"/empleados/{ids['empleados']}",
+        "empleados.ids": f"/empleados/?ids={_varios(ids['empleados'])}",
+        "proveedores.lista": "/proveedores/",
+        "proveedores.lista.busqueda": f"/proveedores/?search={termino}",
+        "proveedores.detalle": f"/proveedores/{ids['proveedores']}",
+        "proveedores.ids": f"/proveedores/?ids={_varios(ids['proveedores'])}",
+        "sucursales.lista": f"{o}/sucursales",
+        "sucursales.lista.busqueda": f"{o}/sucursales?search=suc",
+        "sucursales.detalle": f"{o}/sucursales/{ids['sucursales']}",
+        "centros_costos.lista": f"{o}/centros_costos",
+        "centros_costos.detalle": f"{o}/centros_costos/{ids['centros_costos']}",
+        "bodegas.lista": f"{o}/bodegas",
+        "bodegas.detalle": f"{o}/bodegas/{ids['bodegas']}",
+        "cajas.lista": f"{o}/cajas",
+        "tiendas_virtuales.lista": f"{o}/tiendas_virtuales",
+        "tiendas_virtuales.detalle": f"{o}/tiendas_virtuales/{ids['tiendas_virtuales']}",
+        "numeraciones.lista": f"{o}/numeraciones",
+        "numeraciones.detalle": f"{o}/numeraciones/{ids['numeraciones_transaccion']}",
+        "usuarios.lista": "/users/",
+        "usuarios.lista.org": f"/users/organizations/{org_id}/users",
+        "usuarios.detalle": f"/users/{ids['usuarios']}",
+        "roles.lista": "/roles/",
+        "roles.detalle": f"/roles/{ids['roles']}",
+    }
+
+
+async def capturar(rutas: dict, org_id: int) -> dict:
+    """Ejecuta cada ruta como admin de la organización y captura sus SELECT."""
+    admin = Usuario(
+        id=0,
+        nombre="explain",
+        email="explain@localhost",
+        tipo_usuario=TipoUsuario.admin,
+        rol_id=ROLE_ADMIN,
+        organizacion_id=org_id,
+    )
+    main.app.dependency_overrides[get_current_user] = lambda: admin
+
+    actual = []
+
+    def _capturar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            actual.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capturar)
+    capturas = {}
+    try:
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://explain") as cliente:
+            for nombre, ruta in rutas.items():
+                actual.clear()
+                respuesta = await cliente.get(ruta)
+                if respuesta.status_code != 200:
+                    print(f"  ! {nombre}: {ruta} respondió {respuesta.status_code}")
+                capturas[nombre] = list(actual)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capturar)
+        main.app.dependency_overrides.pop(get_current_user, None)
+    return capturas
+
+
+# ---------------------------------------------------------------------------
+# Análisis de planes
+# ---------------------------------------------------------------------------
+
+def _nodos(plan):
+    yield plan
+    for hijo in plan.get("Plans", ()):
+        yield from _nodos(hijo)
+
+
+async def _filas_por_tabla(conn) -> dict:
+    resultado = await conn.execute(
+        text("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:tablas)"),
+        {"tablas": sorted(TABLAS_ORG)},
+    )
+    return {fila.relname: fila.reltuples for fila in resultado}
+
+
+async def analizar(capturas: dict, min_filas: int) -> tuple:
+    """Retorna (costos por consulta, errores, avisos)."""
+    costos, errores, avisos = {}, [], []
+    async with engine.connect() as conn:
+        filas = await _filas_por_tabla(conn)
+        for nombre, sentencias in capturas.items():
+            for i, (sql, parametros) in enumerate(sentencias):
+                clave = f"{nombre}#{i}"
+                plan = (await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + sql, parametros
+                )).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                raiz = plan[0]["Plan"]
+                costos[clave] = raiz["Total Cost"]
+
+                for nodo in _nodos(raiz):
+                    tabla = nodo.get("Relation Name")
+                    if nodo["Node Type"] != "Seq Scan" or tabla not in TABLAS_ORG:
+                        continue
+                    if filas.get(tabla, 0) < min_filas:
+                        continue
+                    detalle = f"{clave}: Seq Scan en {tabla}"
+                    if "Filter" in nodo:
+                        errores.append(f"{detalle} (Filter: {nodo['Filter']})")
+                    else:
+                        avisos.append(f"{detalle} sin filtro (lectura completa)")
+    return costos, errores, avisos
+
+
+def comparar(costos: dict, baseline: dict, tolerancia: float) -> list:
+    regresiones = []
+    for clave, costo in costos.items():
+        base = baseline.get(clave)
+        if base is None:
+            regresiones.append(f"{clave}: sin línea base (--actualizar-baseline)")
+        elif costo > base * (1 + tolerancia):
+            regresiones.append(f"{clave}: costo {costo:.1f} > línea base {base:.1f}")
+    return regresiones
+
+
+async def ejecutar(args) -> int:
+    if args.crear_esquema:
+        await crear_esquema()
+    if args.poblar:
+        await poblar(args.orgs, args.escala, args.sembrar_catalogos)
+
+    org_id, ids, termino = await _contexto()
+    capturas = await capturar(escenarios(org_id, ids, termino), org_id)
+    costos, errores, avisos = await analizar(capturas, args.min_filas)
+    await engine.dispose()
+
+    for clave, costo in costos.items():
+        print(f"{clave:<40} costo {costo:>12.1f}")
+    for aviso in avisos:
+        print(f"AVISO   {aviso}")
+
+    if args.actualizar_baseline:
+        BASELINE.write_text(json.dumps(costos, indent=2, sort_keys=True) + "\n")
+        print(f"Línea base escrita en {BASELINE}")
+    elif BASELINE.exists():
+        errores += comparar(costos, json.loads(BASELINE.read_text()), args.tolerancia)
+    else:
+        errores.append(f"no existe {BASELINE.name}: generarla con --actualizar-baseline")
+
+    for error in errores:
+        print(f"ERROR   {error}")
+    return 1 if errores else 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--crear-esquema", action="store_true",
+                        help="Crear tablas e índices desde los modelos (BD vacía)")
+    parser.add_argument("--poblar", action="store_true", help="Insertar volumen de prueba antes del chequeo")
+    parser.add_argument("--orgs", type=int, default=100)
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica las filas por organización")
+    parser.add_argument("--sembrar-catalogos", action="store_true",
+                        help="Con --poblar: una fila en cada catálogo vacío (BD recién migrada)")
+    parser.add_argument("--min-filas", type=int, default=1000,
+                        help="Tablas con menos filas se ignoran (el Seq Scan es el plan correcto)")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento de costo permitido sobre la línea base (0.25 = 25%%)")
+    parser.add_argument("--actualizar-baseline", action="store_true")
+    sys.exit(asyncio.run(ejecutar(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main_cli()
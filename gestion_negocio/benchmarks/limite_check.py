@@ -0,0 +1,134 @@
+# gestion_negocio/benchmarks/limite_check.py
+
+"""
+Chequeo del desalojo de BucketsEnMemoria bajo una ráfaga de claves
+distintas (credential stuffing): ninguna ráfaga debe devolverle los
+intentos a un email que el limitador está frenando.
+
+  - víctima agotada + shard lleno de otras claves + una clave nueva: la
+    víctima solo recibe el intento que recargó, no el balde completo;
+  - una clave de IP (otra recarga) no hace ver "lleno" al balde de un email;
+  - ráfaga de miles de emails distintos intercalada con intentos contra la
+    víctima: el shard no pasa su tope y la víctima no logra más intentos
+    que los que recarga en ese tiempo;
+  - con todos los baldes del shard frenando, la clave nueva se rechaza;
+  - con el shard lleno se descarta el de uso menos reciente.
+
+Usa un reloj simulado; no necesita base de datos (desde gestion_negocio/):
+    python -m benchmarks.limite_check
+"""
+
+import sys
+
+from services.limite_service import BucketsEnMemoria, Limite
+
+IP = Limite.desde_texto("30/60")
+EMAIL = Limite.desde_texto("5/300")
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+def _agotar(baldes: BucketsEnMemoria, clave: str, limite: Limite) -> None:
+    while not baldes.consumir_sync(clave, limite.capacidad, limite.recarga):
+        pass
+
+
+def _frenada(baldes: BucketsEnMemoria, clave: str, limite: Limite = EMAIL) -> bool:
+    return baldes.consumir_sync(clave, limite.capacidad, limite.recarga) > 0
+
+
+def _intentos(baldes: BucketsEnMemoria, clave: str, limite: Limite = EMAIL) -> int:
+    """Intentos seguidos que pasan ahora (sin avanzar el reloj)."""
+    pasan = 0
+    while pasan <= limite.capacidad and not _frenada(baldes, clave, limite):
+        pasan += 1
+    return pasan
+
+
+def victima_con_shard_lleno() -> list:
+    reloj = Reloj()
+    baldes = BucketsEnMemoria(shards=1, max_claves_por_shard=100, reloj=reloj)
+    _agotar(baldes, "email:victima", EMAIL)
+    reloj.ahora += 60
+    for i in range(99):
+        baldes.consumir_sync(f"email:otro{i}", EMAIL.capacidad, EMAIL.recarga)
+    baldes.consumir_sync("email:nueva", EMAIL.capacidad, EMAIL.recarga)
+    # En 60 s recargó 1 intento; si se descartó, tendría los 5
+    pasan = _intentos(baldes, "email:victima")
+    return [] if pasan <= 1 else [f"shard lleno: la víctima recuperó {pasan} intentos"]
+
+
+def clave_ip_no_purga_email() -> list:
+    reloj = Reloj()
+    baldes = BucketsEnMemoria(shards=1, max_claves_por_shard=2, reloj=reloj)
+    _agotar(baldes, "email:victima", EMAIL)
+    baldes.consumir_sync("ip:10.0.0.1", IP.capacidad, IP.recarga)
+    reloj.ahora += 60
+    # Shard lleno: la clave de IP nueva no debe juzgar al email con la recarga de IP
+    baldes.consumir_sync("ip:10.0.0.2", IP.capacidad, IP.recarga)
+    pasan = _intentos(baldes, "email:victima")
+    return [] if pasan <= 1 else [f"clave de IP: el email se purgó como lleno ({pasan} intentos)"]
+
+
+def rafaga_de_claves() -> list:
+    reloj = Reloj()
+    baldes = BucketsEnMemoria(shards=4, max_claves_por_shard=64, reloj=reloj)
+    _agotar(baldes, "email:victima", EMAIL)
+    inicio, pasan, errores = reloj.ahora, 0, []
+    for i in range(20000):
+        reloj.ahora += 0.01
+        baldes.consumir_sync(f"email:usuario{i}@ejemplo.com", EMAIL.capacidad, EMAIL.recarga)
+        if i % 50 == 0:
+            pasan += _intentos(baldes, "email:victima")
+    # Lo que recargó en el tiempo de la ráfaga (200 s => 3 intentos)
+    permitidos = int((reloj.ahora - inicio) * EMAIL.recarga)
+    if pasan > permitidos:
+        errores.append(f"ráfaga: la víctima logró {pasan} intentos, recargó {permitidos}")
+    tope = max(len(shard.baldes) for shard in baldes._shards)
+    if tope > baldes.max_claves_por_shard:
+        errores.append(f"ráfaga: un shard llegó a {tope} claves")
+    return errores
+
+
+def falla_cerrado() -> list:
+    baldes = BucketsEnMemoria(shards=1, max_claves_por_shard=10, reloj=Reloj())
+    for i in range(10):
+        _agotar(baldes, f"email:atacada{i}", EMAIL)
+    errores = []
+    if not _frenada(baldes, "email:nueva"):
+        errores.append("todos frenando: la clave nueva pasó")
+    if not all(_frenada(baldes, f"email:atacada{i}") for i in range(10)):
+        errores.append("todos frenando: se descartó un balde frenado")
+    return errores
+
+
+def desalojo_lru() -> list:
+    baldes = BucketsEnMemoria(shards=1, max_claves_por_shard=3, reloj=Reloj())
+    for clave in ("a", "b", "c"):
+        baldes.consumir_sync(clave, EMAIL.capacidad, EMAIL.recarga)
+    baldes.consumir_sync("a", EMAIL.capacidad, EMAIL.recarga)  # "b" queda como el menos reciente
+    baldes.consumir_sync("d", EMAIL.capacidad, EMAIL.recarga)
+    claves = list(baldes._shards[0].baldes)
+    return [] if claves == ["c", "a", "d"] else [f"LRU: quedaron {claves}, se esperaba ['c', 'a', 'd']"]
+
+
+def main_cli():
+    errores = []
+    for chequeo in (victima_con_shard_lleno, clave_ip_no_purga_email, rafaga_de_claves,
+                    falla_cerrado, desalojo_lru):
+        fallos = chequeo()
+        print(f"{chequeo.__name__:<26} {'ERROR' if fallos else 'ok'}")
+        errores += fallos
+    for error in errores:
+        print(f"ERROR   {error}")
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main_cli()
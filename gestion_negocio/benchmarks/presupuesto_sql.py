@@ -0,0 +1,194 @@
+# gestion_negocio/benchmarks/presupuesto_sql.py
+
+"""
+Presupuesto de sentencias SQL por endpoint (guardia contra N+1).
+
+Cada escenario se ejecuta a través de la app (ASGI en proceso) y se
+cuentan las sentencias que emite la petición con core.sql_stats (eventos
+before/after_cursor_execute del engine). Si un endpoint emite más
+sentencias que su presupuesto, el chequeo falla (exit 1) y muestra el
+SQL de esa petición: una verificación extra de existencia, un refresh
+después del commit, un re-select tras el PATCH o una relación cargada
+perezosamente aparecen aquí antes de llegar a producción.
+
+El presupuesto se declara abajo (PRESUPUESTO) y se revisa en el PR como
+cualquier otro cambio. Un endpoint que queda POR DEBAJO de su presupuesto
+se informa como aviso, para ajustarlo.
+
+get_current_user se reemplaza por un admin fijo, así que los conteos no
+incluyen la consulta del usuario del token (una por petición autenticada).
+
+Usa los mismos datos que explain_check (desde gestion_negocio/):
+    python -m benchmarks.presupuesto_sql --crear-esquema --poblar --orgs 3 --sembrar-catalogos
+    python -m benchmarks.presupuesto_sql
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+import main
+from benchmarks.carga.escenarios import CAMPOS_PLANTILLA
+from benchmarks.explain_check import _contexto, crear_esquema, escenarios, poblar
+from core.sql_stats import medir_sql
+from database import engine
+from dependencies.auth import ROLE_ADMIN, get_current_user
+from models.usuarios import EstadoUsuario, TipoUsuario, Usuario
+from services.referencias_service import recargar_referencias
+
+# Sentencias máximas por escenario (GET de explain_check + escrituras).
+# Son los conteos medidos con el comando del CI sobre una BD recién creada;
+# bajarlos o subirlos requiere volver a medir.
+PRESUPUESTO = {
+    # Listados: count + página
+    "clientes.lista": 2,
+    "clientes.lista.busqueda": 2,
+    "clientes.lista.pagina": 2,
+    "clientes.lista.campos": 2,
+    "empleados.lista": 2,
+    "empleados.lista.vendedores": 2,
+    "empleados.lista.busqueda": 2,
+    "proveedores.lista": 2,
+    "proveedores.lista.busqueda": 2,
+    "usuarios.lista": 2,
+    "roles.lista": 2,
+    # Listados bajo /organizations/{id}: + verificación de la organización
+    "sucursales.lista": 3,
+    "sucursales.lista.busqueda": 3,
+    "centros_costos.lista": 3,
+    "bodegas.lista": 3,
+    "cajas.lista": 3,
+    "tiendas_virtuales.lista": 3,
+    "numeraciones.lista": 3,
+    "usuarios.lista.org": 3,
+    # Detalles: una sentencia (referencias desde el registro en memoria)
+    "clientes.detalle": 1,
+    "empleados.detalle": 1,
+    "proveedores.detalle": 1,
+    "sucursales.detalle": 1,
+    "centros_costos.detalle": 1,
+    "bodegas.detalle": 1,
+    "tiendas_virtuales.detalle": 1,
+    "numeraciones.detalle": 1,
+    "usuarios.detalle": 1,
+    "roles.detalle": 1,
+    # Varios por id: una sentencia con id = ANY(:ids)
+    "clientes.ids": 1,
+    "clientes.ids.campos": 1,
+    "empleados.ids": 1,
+    "proveedores.ids": 1,
+    # Rol + permisos (selectin)
+    "roles.permisos": 2,
+    # Organización + plan (join), rol y permisos, en paralelo
+    "bootstrap": 3,
+    # Escrituras
+    "clientes.crear": 1,          # INSERT ... RETURNING (FKs contra el registro)
+    "clientes.actualizar": 2,     # SELECT + UPDATE ... RETURNING
+    "sucursales.actualizar": 2,   # UPDATE ... RETURNING + auditoría
+}
+
+
+async def _plantilla_cliente(cliente: httpx.AsyncClient, ruta_detalle: str) -> dict:
+    datos = (await cliente.get(ruta_detalle)).json()
+    return {campo: datos[campo] for campo in CAMPOS_PLANTILLA}
+
+
+async def medir(org_id: int, ids: dict, termino: str) -> dict:
+    """Ejecuta cada escenario como admin de la organización. Retorna {nombre: (estado, EstadisticasSQL)}."""
+    # Usuario real de la organización: las escrituras lo registran en la auditoría
+    admin = Usuario(
+        id=ids["usuarios"],
+        nombre="presupuesto",
+        email="presupuesto@ejemplo.com",
+        tipo_usuario=TipoUsuario.admin,
+        estado=EstadoUsuario.activo,
+        tiene_mfa=False,
+        rol_id=ROLE_ADMIN,
+        organizacion_id=org_id,
+    )
+    main.app.dependency_overrides[get_current_user] = lambda: admin
+
+    pedidos = [("GET", nombre, ruta, None) for nombre, ruta in escenarios(org_id, ids, termino).items()]
+    resultados = {}
+    try:
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://presupuesto") as cliente:
+            plantilla = await _plantilla_cliente(cliente, f"/clientes/{ids['clientes']}")
+            pedidos += [
+                ("GET", "roles.permisos", f"/roles/{ids['roles']}/permissions", None),
+                ("GET", "bootstrap", "/bootstrap", None),
+                ("POST", "clientes.crear", "/clientes/", {
+                    **plantilla,
+                    "numero_documento": f"P{time.time_ns() % 10**12}",
+                    "nombre_razon_social": "CLIENTE PRESUPUESTO SQL",
+                }),
+                ("PATCH", "clientes.actualizar", f"/clientes/{ids['clientes']}", {"telefono1": "3000000000"}),
+                ("PATCH", "sucursales.actualizar",
+                 f"/organizations/{org_id}/sucursales/{ids['sucursales']}", {"telefonos": "6010000000"}),
+            ]
+            for metodo, nombre, ruta, cuerpo in pedidos:
+                with medir_sql(guardar_detalle=True) as sql:
+                    respuesta = await cliente.request(metodo, ruta, json=cuerpo)
+                resultados[nombre] = (respuesta.status_code, sql)
+    finally:
+        main.app.dependency_overrides.pop(get_current_user, None)
+    return resultados
+
+
+def revisar(resultados: dict) -> tuple:
+    """Retorna (errores, avisos) contra PRESUPUESTO."""
+    errores, avisos = [], []
+    for nombre, (estado, sql) in resultados.items():
+        maximo = PRESUPUESTO.get(nombre)
+        print(f"{nombre:<28} {estado:>4} {sql.sentencias:>3} / {maximo if maximo is not None else '-'}")
+        if estado >= 400:
+            errores.append(f"{nombre}: respondió {estado}")
+        if maximo is None:
+            errores.append(f"{nombre}: sin presupuesto declarado en PRESUPUESTO")
+        elif sql.sentencias > maximo:
+            detalle = "\n".join(f"      {i}. {' '.join(s.split())[:160]}" for i, s in enumerate(sql.detalle, 1))
+            errores.append(f"{nombre}: {sql.sentencias} sentencias > presupuesto {maximo}\n{detalle}")
+        elif sql.sentencias < maximo:
+            avisos.append(f"{nombre}: {sql.sentencias} sentencias < presupuesto {maximo} (ajustar)")
+    for nombre in sorted(set(PRESUPUESTO) - set(resultados)):
+        avisos.append(f"{nombre}: declarado pero no se ejecutó")
+    return errores, avisos
+
+
+async def ejecutar(args) -> int:
+    if args.crear_esquema:
+        await crear_esquema()
+    if args.poblar:
+        await poblar(args.orgs, args.escala, args.sembrar_catalogos)
+    # Como en el lifespan de la app: sin registro, las referencias costarían consultas
+    await recargar_referencias()
+
+    org_id, ids, termino = await _contexto()
+    resultados = await medir(org_id, ids, termino)
+    await engine.dispose()
+
+    errores, avisos = revisar(resultados)
+    for aviso in avisos:
+        print(f"AVISO   {aviso}")
+    for error in errores:
+        print(f"ERROR   {error}")
+    return 1 if errores else 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--crear-esquema", action="store_true",
+                        help="Crear tablas e índices desde los modelos (BD vacía)")
+    parser.add_argument("--poblar", action="store_true", help="Insertar datos de prueba antes del chequeo")
+    parser.add_argument("--orgs", type=int, default=3)
+    parser.add_argument("--escala", type=float, default=0.1, help="Multiplica las filas por organización")
+    parser.add_argument("--sembrar-catalogos", action="store_true",
+                        help="Con --poblar: una fila en cada catálogo vacío (BD recién migrada)")
+    sys.exit(asyncio.run(ejecutar(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,241 @@
+# gestion_negocio/core/compresion.py
+
+"""
+Compresión de respuestas (gzip y, si está instalado, brotli).
+
+CompresionRespuestas es un middleware ASGI que negocia la codificación
+con Accept-Encoding (br > gzip, respetando q=0) y comprime solo si vale
+la pena:
+
+  - el content-type es texto (JSON, HTML, CSV, ...), no binarios ya
+    comprimidos (imágenes, zip, .prof);
+  - el cuerpo completo mide al menos COMPRESION_MIN_BYTES. Si la
+    respuesta llega en varios trozos (StreamingResponse) se comprime en
+    streaming: cada trozo se envía comprimido apenas llega (flush de
+    sincronización), sin acumular el cuerpo ni perder el envío
+    progresivo;
+  - la respuesta no trae ya Content-Encoding.
+
+Para cuerpos que viven en memoria y se repiten idénticos (catálogos y
+ubicaciones del registro de referencias) está CuerpoPrecomprimido: cada
+variante se comprime una sola vez por proceso, con el nivel máximo, y se
+sirve tal cual. El middleware no las vuelve a tocar.
+
+brotli está en requirements.txt; si no está instalado solo se ofrece gzip.
+
+Variables: COMPRESION (1), COMPRESION_MIN_BYTES (1024),
+COMPRESION_NIVEL_GZIP (6), COMPRESION_CALIDAD_BR (4).
+"""
+
+import gzip
+import os
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+COMPRESION = os.getenv("COMPRESION", "1") == "1"
+COMPRESION_MIN_BYTES = int(os.getenv("COMPRESION_MIN_BYTES", "1024"))
+# Por petición: niveles rápidos. Precomprimido: se paga una vez, nivel máximo.
+COMPRESION_NIVEL_GZIP = int(os.getenv("COMPRESION_NIVEL_GZIP", "6"))
+COMPRESION_CALIDAD_BR = int(os.getenv("COMPRESION_CALIDAD_BR", "4"))
+NIVEL_GZIP_ESTATICO = 9
+CALIDAD_BR_ESTATICO = 11
+
+CODIFICACIONES = ("br", "gzip") if brotli is not None else ("gzip",)
+
+_TIPOS_COMPRIMIBLES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+_SIN_CUERPO = {204, 304}
+
+
+def elegir_codificacion(aceptadas: Optional[str]) -> Optional[str]:
+    """Codificación a usar según Accept-Encoding (None = sin comprimir)."""
+    if not aceptadas:
+        return None
+    pesos = {}
+    for parte in aceptadas.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        peso = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                peso = float(parametros[2:])
+            except ValueError:
+                peso = 0.0
+        pesos[nombre.strip().lower()] = peso
+    comodin = pesos.get("*", 0.0)
+    for codificacion in CODIFICACIONES:
+        if pesos.get(codificacion, comodin) > 0:
+            return codificacion
+    return None
+
+
+def _comprimible(tipo: Optional[str]) -> bool:
+    if not tipo:
+        return False
+    tipo = tipo.lower()
+    return tipo.startswith(_TIPOS_COMPRIMIBLES) or tipo.split(";", 1)[0].endswith(("+json", "+xml"))
+
+
+def comprimir(cuerpo: bytes, codificacion: str, estatico: bool = False) -> bytes:
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=CALIDAD_BR_ESTATICO if estatico else COMPRESION_CALIDAD_BR)
+    return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP_ESTATICO if estatico else COMPRESION_NIVEL_GZIP, mtime=0)
+
+
+class _Compresor:
+    """Compresión incremental con la misma interfaz para gzip y brotli."""
+
+    def __init__(self, codificacion: str):
+        self.br = codificacion == "br"
+        if self.br:
+            self._obj = brotli.Compressor(quality=COMPRESION_CALIDAD_BR)
+        else:
+            self._obj = zlib.compressobj(COMPRESION_NIVEL_GZIP, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def trozo(self, datos: bytes) -> bytes:
+        # Flush de sincronización: el cliente puede descomprimir lo recibido
+        if self.br:
+            return self._obj.process(datos) + self._obj.flush()
+        return self._obj.compress(datos) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def final(self, datos: bytes = b"") -> bytes:
+        if self.br:
+            return self._obj.process(datos) + self._obj.finish()
+        return self._obj.compress(datos) + self._obj.flush()
+
+
+def _agregar_vary(headers: list) -> list:
+    for i, (clave, valor) in enumerate(headers):
+        if clave.lower() == b"vary":
+            if b"accept-encoding" not in valor.lower():
+                headers[i] = (clave, valor + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+class CompresionRespuestas:
+    def __init__(self, app, minimo: int = COMPRESION_MIN_BYTES):
+        self.app = app
+        self.minimo = minimo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        aceptadas = None
+        for clave, valor in scope["headers"]:
+            if clave == b"accept-encoding":
+                aceptadas = valor.decode("latin-1")
+                break
+        codificacion = elegir_codificacion(aceptadas)
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        compresor: Optional[_Compresor] = None
+        directo = False
+
+        async def enviar(mensaje):
+            nonlocal inicio, compresor, directo
+            if directo:
+                await send(mensaje)
+                return
+            if mensaje["type"] == "http.response.start":
+                inicio = mensaje  # se decide con el primer trozo del cuerpo
+                return
+            if mensaje["type"] != "http.response.body":
+                await send(mensaje)
+                return
+
+            cuerpo = mensaje.get("body", b"")
+            mas = mensaje.get("more_body", False)
+
+            if compresor is not None:
+                salida = compresor.trozo(cuerpo) if mas else compresor.final(cuerpo)
+                await send({"type": "http.response.body", "body": salida, "more_body": mas})
+                return
+
+            headers = list(inicio.get("headers", ()))
+            tipo = ya_codificada = None
+            for clave, valor in headers:
+                clave = clave.lower()
+                if clave == b"content-type":
+                    tipo = valor.decode("latin-1")
+                elif clave == b"content-encoding":
+                    ya_codificada = True
+            if (
+                ya_codificada
+                or inicio["status"] in _SIN_CUERPO
+                or not _comprimible(tipo)
+                or (not mas and len(cuerpo) < self.minimo)
+            ):
+                directo = True
+                await send(inicio)
+                await send(mensaje)
+                return
+
+            headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+            headers.append((b"content-encoding", codificacion.encode()))
+            _agregar_vary(headers)
+            if mas:
+                # StreamingResponse: se comprime trozo a trozo, sin Content-Length
+                compresor = _Compresor(codificacion)
+                await send({**inicio, "headers": headers})
+                await send({"type": "http.response.body", "body": compresor.trozo(cuerpo), "more_body": True})
+                return
+            salida = comprimir(cuerpo, codificacion)
+            headers.append((b"content-length", str(len(salida)).encode()))
+            await send({**inicio, "headers": headers})
+            await send({"type": "http.response.body", "body": salida})
+
+        await self.app(scope, receive, enviar)
+
+
+class CuerpoPrecomprimido:
+    """
+    Cuerpo inmutable con sus variantes comprimidas, calculadas una sola
+    vez (la primera vez que un cliente pide cada codificación).
+    """
+
+    __slots__ = ("cuerpo", "media_type", "_variantes")
+
+    def __init__(self, cuerpo: bytes, media_type: str = "application/json"):
+        self.cuerpo = cuerpo
+        self.media_type = media_type
+        self._variantes: dict = {}
+
+    async def variante(self, codificacion: str) -> bytes:
+        datos = self._variantes.get(codificacion)
+        if datos is None:
+            # Nivel máximo (brotli 11 tarda): fuera del event loop
+            datos = await run_in_threadpool(comprimir, self.cuerpo, codificacion, True)
+            self._variantes[codificacion] = datos
+        return datos
+
+    async def respuesta(self, request) -> Response:
+        codificacion = None
+        if len(self.cuerpo) >= COMPRESION_MIN_BYTES:
+            codificacion = elegir_codificacion(request.headers.get("accept-encoding"))
+        if codificacion is None:
+            respuesta = Response(self.cuerpo, media_type=self.media_type)
+        else:
+            respuesta = Response(await self.variante(codificacion), media_type=self.media_type)
+            respuesta.headers["content-encoding"] = codificacion
+        respuesta.headers["vary"] = "Accept-Encoding"
+        return respuesta
@@ -0,0 +1,161 @@
+# gestion_negocio/core/consultas_lentas.py
+
+"""
+Registro de consultas lentas con su plan (EXPLAIN), opt-in.
+
+Con CONSULTAS_LENTAS_MS > 0, toda sentencia que tarda más que ese umbral
+queda registrada con:
+
+  - el SQL (con placeholders) y la forma de sus parámetros: tipo y largo,
+    nunca los valores (pueden ser datos personales);
+  - la ruta y la organización de la petición (core.contexto);
+  - su plan: `EXPLAIN (ANALYZE OFF, FORMAT JSON)` con los mismos
+    parámetros, en una tarea aparte y con otra conexión del pool, así la
+    petición no espera por él.
+
+Se guardan las últimas CONSULTAS_LENTAS_MAX en un buffer circular
+(routes/diagnostico.py las expone a superadmins). Como mucho
+EXPLAIN_CONCURRENTES planes se piden a la vez; el resto se registra sin
+plan, para no sumar presión al pool justo cuando la BD está lenta.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+
+from core import contexto
+
+logger = logging.getLogger(__name__)
+
+CONSULTAS_LENTAS_MS = float(os.getenv("CONSULTAS_LENTAS_MS", "0"))
+CONSULTAS_LENTAS_MAX = int(os.getenv("CONSULTAS_LENTAS_MAX", "50"))
+EXPLAIN_CONCURRENTES = 2
+EXPLAIN_TIMEOUT_S = 5.0
+
+# Solo sentencias con plan (EXPLAIN sin ANALYZE no ejecuta las escrituras)
+_CON_PLAN = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def _forma(valor) -> str:
+    if isinstance(valor, (str, bytes)):
+        return f"{type(valor).__name__}({len(valor)})"
+    if isinstance(valor, (list, tuple, set)):
+        return f"{type(valor).__name__}[{len(valor)}]"
+    return type(valor).__name__
+
+
+def forma_parametros(parametros):
+    """Tipos (y largos) de los parámetros, sin sus valores."""
+    if isinstance(parametros, dict):
+        return {clave: _forma(valor) for clave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_forma(valor) for valor in parametros]
+    return None
+
+
+class RegistroConsultasLentas:
+    def __init__(self, engine, umbral_ms: float, maximo: int = CONSULTAS_LENTAS_MAX):
+        self.engine = engine
+        self.umbral = umbral_ms / 1000
+        self.entradas: deque = deque(maxlen=maximo)
+        self._explains_en_curso = 0
+        self._tareas: set = set()
+
+    # -- eventos del engine (síncronos, dentro del greenlet) --
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["consultas_lentas_inicio"] = time.perf_counter()
+
+    def _despues(self, conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info.pop("consultas_lentas_inicio", None)
+        if inicio is None:
+            return
+        duracion = time.perf_counter() - inicio
+        if duracion < self.umbral:
+            return
+        self.registrar(statement, parameters, duracion, executemany)
+
+    # --
+
+    def registrar(self, statement: str, parameters, duracion: float, executemany: bool = False) -> None:
+        verbo = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verbo == "EXPLAIN":
+            return  # los planes que pide este mismo registro
+        entrada = {
+            "fecha": datetime.now(timezone.utc).isoformat(),
+            "duracion_ms": round(duracion * 1000, 1),
+            "sql": statement,
+            "parametros": forma_parametros(parameters),
+            "ruta": contexto.ruta_actual(),
+            "organizacion_id": contexto.organizacion_actual(),
+            "usuario_id": contexto.usuario_actual(),
+            "plan": None,
+            "plan_error": None,
+        }
+        self.entradas.append(entrada)
+        logger.warning(
+            "Consulta lenta (%.1f ms) en %s: %s",
+            entrada["duracion_ms"], entrada["ruta"] or "-", " ".join(statement.split())[:200]
+        )
+
+        if executemany or verbo not in _CON_PLAN:
+            entrada["plan_error"] = "Sin plan para este tipo de sentencia"
+            return
+        if self._explains_en_curso >= EXPLAIN_CONCURRENTES:
+            entrada["plan_error"] = "Omitido: demasiados EXPLAIN en curso"
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            entrada["plan_error"] = "Sin event loop"
+            return
+        self._explains_en_curso += 1
+        tarea = loop.create_task(self._explicar(entrada, statement, parameters))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _explicar(self, entrada: dict, statement: str, parameters) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                resultado = await asyncio.wait_for(
+                    conn.exec_driver_sql(
+                        "EXPLAIN (ANALYZE OFF, FORMAT JSON) " + statement, parameters
+                    ),
+                    EXPLAIN_TIMEOUT_S,
+                )
+                plan = resultado.scalar()
+            entrada["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as e:
+            entrada["plan_error"] = f"{type(e).__name__}: {e}"
+        finally:
+            self._explains_en_curso -= 1
+
+    def ultimas(self, limite: Optional[int] = None) -> list:
+        """Las más recientes primero."""
+        entradas = list(reversed(self.entradas))
+        return entradas[:limite] if limite else entradas
+
+    def limpiar(self) -> None:
+        self.entradas.clear()
+
+
+registro: Optional[RegistroConsultasLentas] = None
+
+
+def instalar(engine) -> Optional[RegistroConsultasLentas]:
+    """Activa el registro en `engine` (AsyncEngine) si CONSULTAS_LENTAS_MS > 0."""
+    global registro
+    if CONSULTAS_LENTAS_MS <= 0 or registro is not None:
+        return registro
+    registro = RegistroConsultasLentas(engine, CONSULTAS_LENTAS_MS)
+    event.listen(engine.sync_engine, "before_cursor_execute", registro._antes)
+    event.listen(engine.sync_engine, "after_cursor_execute", registro._despues)
+    logger.info("Registro de consultas lentas activo (umbral %.0f ms)", CONSULTAS_LENTAS_MS)
+    return registro
@@ -0,0 +1,95 @@
+# gestion_negocio/core/contexto.py
+
+"""
+Contexto de la petición en curso (ContextVars).
+
+ContextoPeticion (middleware ASGI) guarda el scope y un id de la
+petición, y get_current_user el usuario autenticado. Con eso, código que
+no recibe el request (eventos del engine, logging) puede saber en qué
+ruta y para qué organización está trabajando:
+
+    contexto.ruta_actual()         -> "GET /clientes/{cliente_id}"
+    contexto.organizacion_actual() -> 12
+    contexto.request_id_actual()   -> "9f2c..."
+
+El id viene de X-Request-ID (o de la traza de Cloud Run) si el cliente lo
+envía; si no, se genera. Se devuelve en el header X-Request-ID.
+
+El greenlet de SQLAlchemy hereda el contexto de la tarea, así que los
+eventos before/after_cursor_execute ven los valores de su petición.
+"""
+
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+_scope: ContextVar[Optional[dict]] = ContextVar("scope_peticion", default=None)
+_usuario: ContextVar[Optional[tuple]] = ContextVar("usuario_peticion", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def fijar_usuario(usuario) -> None:
+    """(id, organizacion_id) del usuario autenticado, para el resto de la petición."""
+    _usuario.set((usuario.id, usuario.organizacion_id))
+
+
+def usuario_actual() -> Optional[int]:
+    usuario = _usuario.get()
+    return usuario[0] if usuario else None
+
+
+def organizacion_actual() -> Optional[int]:
+    usuario = _usuario.get()
+    return usuario[1] if usuario else None
+
+
+def request_id_actual() -> Optional[str]:
+    return _request_id.get()
+
+
+def ruta_actual() -> Optional[str]:
+    """Método y plantilla de la ruta (o la URL si aún no se resolvió)."""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    ruta = scope.get("route")
+    return f"{scope['method']} {getattr(ruta, 'path', None) or scope['path']}"
+
+
+def _id_de_headers(headers) -> Optional[str]:
+    traza = None
+    for clave, valor in headers:
+        if clave == b"x-request-id":
+            return valor.decode("latin-1")[:64]
+        if clave == b"x-cloud-trace-context":
+            traza = valor.decode("latin-1").split("/", 1)[0][:64]
+    return traza
+
+
+class ContextoPeticion:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = _id_de_headers(scope["headers"]) or uuid.uuid4().hex
+        token_scope = _scope.set(scope)
+        token_usuario = _usuario.set(None)
+        token_id = _request_id.set(request_id)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                mensaje = {
+                    **mensaje,
+                    "headers": [*mensaje.get("headers", ()), (b"x-request-id", request_id.encode("latin-1"))],
+                }
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _scope.reset(token_scope)
+            _usuario.reset(token_usuario)
+            _request_id.reset(token_id)
@@ -0,0 +1,134 @@
+# gestion_negocio/core/fast_json.py
+
+"""
+Ruta de FastAPI que valida la respuesta UNA sola vez y la serializa
+directamente a bytes con pydantic_core.
+
+Por defecto FastAPI, para cada respuesta con `response_model`:
+  1) valida el valor retornado contra el modelo,
+  2) lo pasa por `jsonable_encoder` (dict/list de Python),
+  3) lo vuelve a recorrer con `json.dumps` en JSONResponse.
+Si además el handler hizo `Schema.from_orm(obj)`, la data se valida dos veces.
+
+Con `FastJSONRoute` el handler puede devolver directamente objetos ORM
+(o dicts que los contienen); se validan con un `TypeAdapter` cacheado
+(`from_attributes=True`) y se serializan con `dump_json`.
+El `response_model` se sigue declarando igual, así que el OpenAPI no cambia.
+
+Uso (opt-in por router):
+    router = APIRouter(prefix="/clientes", route_class=FastJSONRoute)
+"""
+
+import functools
+import inspect
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+# Parámetro oculto por el que FastAPI inyecta la sub-respuesta compartida
+# (la misma que reciben los handlers/dependencias que declaran `response: Response`).
+_PARAM_SUBRESPUESTA = "_fast_json_subrespuesta"
+
+
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(tipo: Any) -> TypeAdapter:
+    """TypeAdapter cacheado por tipo (construirlo es caro; usarlo no)."""
+    return TypeAdapter(tipo)
+
+
+def serializar_json(tipo: Any, contenido: Any) -> bytes:
+    """Valida `contenido` contra `tipo` y devuelve el JSON en bytes."""
+    adapter = get_type_adapter(tipo)
+    try:
+        valor = adapter.validate_python(contenido, from_attributes=True)
+    except ValidationError as exc:
+        raise ResponseValidationError(errors=exc.errors(), body=contenido) from exc
+    return adapter.dump_json(valor, by_alias=True)
+
+
+def _envolver_endpoint(endpoint: Callable, response_model: Any, status_code: int | None) -> Callable:
+    es_async = inspect.iscoroutinefunction(endpoint)
+    firma = get_typed_signature(endpoint)
+
+    # FastAPI inyecta la sub-respuesta en un único parámetro: si el handler
+    # ya declara `response: Response` se reutiliza ese mismo.
+    param_propio = next(
+        (p.name for p in firma.parameters.values() if p.annotation is Response),
+        None
+    )
+
+    @functools.wraps(endpoint)
+    async def envoltura(*args, **kwargs):
+        if param_propio:
+            sub_respuesta: Response = kwargs[param_propio]
+        else:
+            sub_respuesta = kwargs.pop(_PARAM_SUBRESPUESTA)
+        if es_async:
+            contenido = await endpoint(*args, **kwargs)
+        else:
+            contenido = await run_in_threadpool(endpoint, *args, **kwargs)
+
+        if isinstance(contenido, Response):
+            return contenido
+
+        # Misma precedencia de status_code que FastAPI
+        codigo = sub_respuesta.status_code or status_code or 200
+        cuerpo = serializar_json(response_model, contenido)
+        if not is_body_allowed_for_status_code(codigo):
+            cuerpo = b""
+        respuesta = Response(cuerpo, status_code=codigo, media_type="application/json")
+        respuesta.headers.raw.extend(sub_respuesta.headers.raw)
+        return respuesta
+
+    parametros = list(firma.parameters.values())
+    if not param_propio:
+        parametros.append(
+            inspect.Parameter(
+                _PARAM_SUBRESPUESTA,
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=Response,
+            )
+        )
+    envoltura.__signature__ = firma.replace(parameters=parametros)
+    envoltura._fast_json = True
+    return envoltura
+
+
+class FastJSONRoute(APIRoute):
+    """
+    APIRoute con serialización rápida. Solo aplica cuando hay `response_model`,
+    la clase de respuesta es la JSONResponse por defecto y no se usan
+    `response_model_include/exclude/...` (en esos casos se comporta como
+    una APIRoute normal).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        response_model = kwargs.get("response_model")
+        response_class = kwargs.get("response_class")
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        aplica = (
+            response_model is not None
+            and not isinstance(response_model, DefaultPlaceholder)
+            and response_class in (None, JSONResponse)
+            and not kwargs.get("response_model_include")
+            and not kwargs.get("response_model_exclude")
+            and not kwargs.get("response_model_exclude_unset")
+            and not kwargs.get("response_model_exclude_defaults")
+            and not kwargs.get("response_model_exclude_none")
+            and kwargs.get("response_model_by_alias", True)
+        )
+        # include_router vuelve a crear la ruta con el endpoint ya envuelto
+        if aplica and not getattr(endpoint, "_fast_json", False):
+            endpoint = _envolver_endpoint(endpoint, response_model, kwargs.get("status_code"))
+
+        super().__init__(path, endpoint, **kwargs)
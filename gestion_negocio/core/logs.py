@@ -0,0 +1,224 @@
+# gestion_negocio/core/logs.py
+
+"""
+Logging estructurado (JSON por línea) que no bloquea el event loop.
+
+    handler de la app ──► QueueHandler ──► cola ──► QueueListener (hilo) ──► stdout
+
+El código de la app solo encola el registro (put_nowait); la escritura en
+stdout la hace el hilo del listener. Si la cola se llena, el registro se
+descarta y se cuenta (logs_descartados): un log nunca frena una petición.
+
+Antes de encolar, en el contexto de la petición, se agregan request_id,
+organizacion_id, usuario_id y ruta (core.contexto). Cada línea es un JSON
+con los campos que Cloud Logging reconoce (severity, message, time) más
+esos y los `extra=` del llamado:
+
+    {"time": "...", "severity": "INFO", "logger": "routes.clientes",
+     "message": "...", "request_id": "9f2c...", "organizacion_id": 12, ...}
+
+Muestreo para eventos de mucho volumen (WARNING y superiores nunca se
+muestrean):
+
+    LOG_MUESTREO="sqlalchemy.engine=0.01,core.metricas=0.1"
+    logger.info("...", extra={"muestreo": 0.05})   # por llamado
+
+Los loggers propios del servidor (uvicorn.*, gunicorn.*) traen sus propios
+StreamHandler y no propagan: se les quitan y propagan al raíz, así el
+access log también pasa por la cola.
+
+Variables: LOG_NIVEL (INFO), LOG_FORMATO (json | texto), LOG_COLA (10000),
+LOG_MUESTREO.
+"""
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from core import contexto
+
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO").upper()
+LOG_FORMATO = os.getenv("LOG_FORMATO", "json")
+LOG_COLA = int(os.getenv("LOG_COLA", "10000"))
+LOG_MUESTREO = os.getenv("LOG_MUESTREO", "")
+
+_ATRIBUTOS_ESTANDAR = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "excepcion", "muestreo",
+    "request_id", "organizacion_id", "usuario_id", "ruta",
+}
+_CAMPOS_CONTEXTO = ("request_id", "organizacion_id", "usuario_id", "ruta")
+_LOGGERS_SERVIDOR = (
+    "uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error", "gunicorn.access",
+)
+
+
+def _tasas(texto: str) -> dict:
+    tasas = {}
+    for parte in texto.split(","):
+        if "=" in parte:
+            nombre, tasa = parte.split("=", 1)
+            tasas[nombre.strip()] = float(tasa)
+    return tasas
+
+
+class FiltroContexto(logging.Filter):
+    """Copia al registro los datos de la petición en curso (corre en el contexto de quien loguea)."""
+
+    def filter(self, record):
+        record.request_id = contexto.request_id_actual()
+        record.organizacion_id = contexto.organizacion_actual()
+        record.usuario_id = contexto.usuario_actual()
+        record.ruta = contexto.ruta_actual()
+        return True
+
+
+class FiltroMuestreo(logging.Filter):
+    def __init__(self, tasas: dict):
+        super().__init__()
+        # Prefijo más largo primero: "sqlalchemy.engine" gana sobre "sqlalchemy"
+        self.tasas = sorted(tasas.items(), key=lambda par: -len(par[0]))
+
+    def _tasa(self, record) -> float:
+        tasa = getattr(record, "muestreo", None)
+        if tasa is not None:
+            return tasa
+        for prefijo, tasa in self.tasas:
+            if record.name == prefijo or record.name.startswith(prefijo + "."):
+                return tasa
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        tasa = self._tasa(record)
+        return tasa >= 1.0 or random.random() < tasa
+
+
+class FormatoJSON(logging.Formatter):
+    def format(self, record):
+        datos = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for campo in _CAMPOS_CONTEXTO:
+            valor = getattr(record, campo, None)
+            if valor is not None:
+                datos[campo] = valor
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_ESTANDAR and not clave.startswith("_"):
+                datos[clave] = valor
+        excepcion = getattr(record, "excepcion", None)
+        if excepcion:
+            datos["excepcion"] = excepcion
+        if record.stack_info:
+            datos["stack"] = record.stack_info
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class FormatoTexto(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        texto = super().format(record)
+        excepcion = getattr(record, "excepcion", None)
+        return f"{texto}\n{excepcion}" if excepcion else texto
+
+
+class ColaNoBloqueante(QueueHandler):
+    def __init__(self, cola: queue.Queue):
+        super().__init__(cola)
+        self.descartados = 0
+
+    def prepare(self, record):
+        # Mensaje y traceback se resuelven aquí (los argumentos pueden
+        # cambiar después); el formato final lo hace el hilo del listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.excepcion = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+_handler: Optional[ColaNoBloqueante] = None
+_listener: Optional[QueueListener] = None
+
+
+def _iniciar_listener() -> None:
+    global _listener
+    salida = logging.StreamHandler(sys.stdout)
+    salida.setFormatter(FormatoTexto() if LOG_FORMATO == "texto" else FormatoJSON())
+    _listener = QueueListener(_handler.queue, salida, respect_handler_level=False)
+    _listener.start()
+
+
+def _encaminar_servidor() -> None:
+    for nombre in _LOGGERS_SERVIDOR:
+        logger = logging.getLogger(nombre)
+        logger.handlers = []
+        logger.propagate = True
+
+
+def _reiniciar_en_hijo() -> None:
+    # Los hilos no sobreviven al fork (gunicorn con preload_app): cada
+    # worker arranca su propio listener sobre una cola nueva. El
+    # UvicornWorker ya copió a uvicorn.* los handlers de gunicorn en el
+    # master, antes del fork: se vuelven a encaminar a la cola.
+    if _handler is not None:
+        _handler.queue = queue.Queue(LOG_COLA)
+        _iniciar_listener()
+        _encaminar_servidor()
+
+
+def configurar_logging() -> None:
+    """
+    Instala el pipeline en el logger raíz. Idempotente: si ya está
+    instalado solo rearma el listener que haya detenido detener_logging().
+    """
+    global _handler
+    if _handler is not None:
+        if _listener is None:
+            _iniciar_listener()
+        _encaminar_servidor()
+        return
+    _handler = ColaNoBloqueante(queue.Queue(LOG_COLA))
+    _handler.addFilter(FiltroMuestreo(_tasas(LOG_MUESTREO)))
+    _handler.addFilter(FiltroContexto())
+
+    raiz = logging.getLogger()
+    raiz.handlers = [_handler]
+    raiz.setLevel(LOG_NIVEL)
+    _iniciar_listener()
+    _encaminar_servidor()
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_reiniciar_en_hijo)
+
+
+def detener_logging() -> None:
+    """Vacía la cola y detiene el hilo (al apagar el proceso o la app)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def descartados() -> int:
+    return _handler.descartados if _handler is not None else 0
@@ -0,0 +1,193 @@
+# gestion_negocio/core/metricas.py
+
+"""
+Métricas de peticiones HTTP y de base de datos, en formato Prometheus.
+
+MetricasHTTP es un middleware ASGI (sin BaseHTTPMiddleware: no crea
+tareas ni copia el cuerpo) que por cada petición registra:
+
+  - latencia por método y plantilla de ruta (histograma),
+  - respuestas por método, ruta y estado,
+  - peticiones en curso,
+  - sentencias SQL y su tiempo total (core.sql_stats),
+  - espera por una conexión del pool (histograma).
+
+Y agrega a la respuesta el header Server-Timing:
+
+    Server-Timing: app;dur=12.4, db;dur=3.1;desc="2 sentencias", pool;dur=0.0
+
+La ruta es la plantilla (`/clientes/{cliente_id}`), no la URL: la
+cardinalidad queda acotada por la cantidad de rutas. Las peticiones que
+no coinciden con ninguna ruta se agrupan en "(sin ruta)".
+
+Las métricas son por proceso: con varios workers, cada uno expone las
+suyas en /metrics.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from core.sql_stats import medir_sql
+
+# Segundos
+CUBETAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CUBETAS_POOL = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+SIN_RUTA = "(sin ruta)"
+
+
+class Histograma:
+    __slots__ = ("limites", "cubetas", "suma", "cuenta")
+
+    def __init__(self, limites: tuple):
+        self.limites = limites
+        self.cubetas = [0] * (len(limites) + 1)  # la última es +Inf
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, valor: float) -> None:
+        self.cubetas[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cuenta += 1
+
+
+def _etiquetas(**valores) -> str:
+    partes = []
+    for nombre, valor in valores.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{nombre}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+
+def _formato(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self.en_curso = 0
+        self.latencia: dict[tuple, Histograma] = {}
+        self.respuestas: dict[tuple, int] = {}
+        self.db_sentencias: dict[tuple, int] = {}
+        self.db_segundos: dict[tuple, float] = {}
+        self.espera_pool = Histograma(CUBETAS_POOL)
+
+    def registrar(self, metodo: str, ruta: str, estado: int, segundos: float, sql) -> None:
+        clave = (metodo, ruta)
+        histograma = self.latencia.get(clave)
+        if histograma is None:
+            histograma = self.latencia[clave] = Histograma(CUBETAS_LATENCIA)
+        histograma.observar(segundos)
+
+        clave_estado = (metodo, ruta, estado)
+        self.respuestas[clave_estado] = self.respuestas.get(clave_estado, 0) + 1
+
+        if sql.sentencias:
+            self.db_sentencias[clave] = self.db_sentencias.get(clave, 0) + sql.sentencias
+            self.db_segundos[clave] = self.db_segundos.get(clave, 0.0) + sql.segundos
+            self.espera_pool.observar(sql.espera_pool)
+
+    def exportar(self, pool: Optional[dict] = None) -> str:
+        """Texto en el formato de exposición de Prometheus (0.0.4)."""
+        lineas = []
+
+        def encabezado(nombre, tipo, ayuda):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+
+        def histograma(nombre, h: Histograma, **etiquetas):
+            acumulado = 0
+            for limite, cantidad in zip(h.limites + ("+Inf",), h.cubetas):
+                acumulado += cantidad
+                le = limite if limite == "+Inf" else _formato(limite)
+                lineas.append(f"{nombre}_bucket{_etiquetas(**etiquetas, le=le)} {acumulado}")
+            sufijo = _etiquetas(**etiquetas) if etiquetas else ""
+            lineas.append(f"{nombre}_sum{sufijo} {_formato(h.suma)}")
+            lineas.append(f"{nombre}_count{sufijo} {h.cuenta}")
+
+        encabezado("http_peticiones_en_curso", "gauge", "Peticiones HTTP en curso.")
+        lineas.append(f"http_peticiones_en_curso {self.en_curso}")
+
+        encabezado("http_peticion_duracion_segundos", "histogram", "Latencia de las peticiones HTTP.")
+        for (metodo, ruta), h in sorted(self.latencia.items()):
+            histograma("http_peticion_duracion_segundos", h, metodo=metodo, ruta=ruta)
+
+        encabezado("http_respuestas_total", "counter", "Respuestas HTTP por estado.")
+        for (metodo, ruta, estado), cantidad in sorted(self.respuestas.items()):
+            lineas.append(
+                f"http_respuestas_total{_etiquetas(metodo=metodo, ruta=ruta, estado=estado)} {cantidad}"
+            )
+
+        encabezado("db_sentencias_total", "counter", "Sentencias SQL emitidas por las peticiones.")
+        for (metodo, ruta), cantidad in sorted(self.db_sentencias.items()):
+            lineas.append(f"db_sentencias_total{_etiquetas(metodo=metodo, ruta=ruta)} {cantidad}")
+
+        encabezado("db_sentencias_segundos_total", "counter", "Tiempo total de las sentencias SQL.")
+        for (metodo, ruta), segundos in sorted(self.db_segundos.items()):
+            lineas.append(
+                f"db_sentencias_segundos_total{_etiquetas(metodo=metodo, ruta=ruta)} {_formato(segundos)}"
+            )
+
+        encabezado("db_pool_espera_segundos", "histogram",
+                   "Espera por una conexión del pool, por petición con SQL.")
+        histograma("db_pool_espera_segundos", self.espera_pool)
+
+        if pool:
+            for nombre, valor in pool.items():
+                encabezado(f"db_pool_{nombre}", "gauge", f"Pool de conexiones: {nombre}.")
+                lineas.append(f"db_pool_{nombre} {valor}")
+
+        return "\n".join(lineas) + "\n"
+
+
+registro = RegistroMetricas()
+
+
+def _server_timing(segundos: float, sql) -> bytes:
+    valor = f"app;dur={segundos * 1000:.1f}"
+    if sql.sentencias:
+        valor += (
+            f', db;dur={sql.segundos * 1000:.1f};desc="{sql.sentencias} sentencias"'
+            f", pool;dur={sql.espera_pool * 1000:.1f}"
+        )
+    return valor.encode("latin-1")
+
+
+class MetricasHTTP:
+    def __init__(self, app, registro: RegistroMetricas = registro, server_timing: bool = True):
+        self.app = app
+        self.registro = registro
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        estado = 500  # si la app falla antes de responder
+        self.registro.en_curso += 1
+        with medir_sql() as sql:
+            async def enviar(mensaje):
+                nonlocal estado
+                if mensaje["type"] == "http.response.start":
+                    estado = mensaje["status"]
+                    if self.server_timing:
+                        encabezados = list(mensaje.get("headers", ()))
+                        encabezados.append(
+                            (b"server-timing", _server_timing(time.perf_counter() - inicio, sql))
+                        )
+                        mensaje = {**mensaje, "headers": encabezados}
+                await send(mensaje)
+
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                self.registro.en_curso -= 1
+                # FastAPI deja la ruta resuelta en el scope
+                ruta = scope.get("route")
+                plantilla = getattr(ruta, "path", None) or SIN_RUTA
+                self.registro.registrar(
+                    scope["method"], plantilla, estado, time.perf_counter() - inicio, sql
+                )
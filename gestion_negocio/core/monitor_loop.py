@@ -0,0 +1,169 @@
+# gestion_negocio/core/monitor_loop.py
+
+"""
+Monitor del retraso del event loop y detector de bloqueos.
+
+Una tarea duerme LOOP_INTERVALO_MS y mide cuánto de más tardó en
+despertar: ese retraso es lo que esperó detrás de código que no cede el
+loop (bcrypt, E/S síncrona o CPU dentro de un `async def`). Las últimas
+muestras dan los percentiles.
+
+Los handlers `def` (p.ej. routes/ventas.py) corren en el threadpool, no
+en el loop: este detector no los ve. Su costo aparece en la latencia de
+la ruta (/metrics) y, si saturan el threadpool, en la espera por un hilo.
+
+Un hilo vigilante revisa el último latido de esa tarea. Si el loop lleva
+más de LOOP_BLOQUEO_MS sin latir, toma la pila del hilo del loop en ese
+momento (sys._current_frames): es la llamada que lo está bloqueando. Al
+despertar, la tarea completa la duración del bloqueo.
+
+Los datos son por worker: /metrics (percentiles y conteo) y
+/diagnostico/bloqueos (pilas, solo superadmin).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "1") == "1"
+LOOP_INTERVALO_MS = float(os.getenv("LOOP_INTERVALO_MS", "100"))
+LOOP_BLOQUEO_MS = float(os.getenv("LOOP_BLOQUEO_MS", "100"))
+
+CUANTILES = (0.5, 0.9, 0.99)
+
+
+def _percentil(ordenados: list, q: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+
+class MonitorLoop:
+    def __init__(self, intervalo_ms: float = LOOP_INTERVALO_MS, umbral_ms: float = LOOP_BLOQUEO_MS,
+                 muestras: int = 3000, max_bloqueos: int = 50):
+        self.intervalo = intervalo_ms / 1000
+        self.umbral = umbral_ms / 1000
+        self.retrasos: deque = deque(maxlen=muestras)
+        self.bloqueos: deque = deque(maxlen=max_bloqueos)
+        self.total_bloqueos = 0
+        self.retraso_maximo = 0.0
+        self.suma_total = 0.0
+        self.muestras_total = 0
+        self._latido = time.monotonic()
+        self._bloqueo_actual: Optional[dict] = None
+        self._hilo_loop: Optional[int] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+
+    # -- tarea en el loop --
+
+    async def _muestrear(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._hilo_loop = threading.get_ident()
+        while True:
+            self._latido = time.monotonic()
+            inicio = loop.time()
+            await asyncio.sleep(self.intervalo)
+            retraso = max(loop.time() - inicio - self.intervalo, 0.0)
+            self._latido = time.monotonic()
+            self.retrasos.append(retraso)
+            self.suma_total += retraso
+            self.muestras_total += 1
+            if retraso > self.retraso_maximo:
+                self.retraso_maximo = retraso
+            bloqueo = self._bloqueo_actual
+            if bloqueo is not None:
+                self._bloqueo_actual = None
+                bloqueo["duracion_ms"] = round(retraso * 1000, 1)
+                logger.warning(
+                    "Event loop bloqueado %.0f ms en:\n%s",
+                    bloqueo["duracion_ms"], "".join(bloqueo["pila"][-8:])
+                )
+
+    # -- hilo vigilante --
+
+    def _vigilar(self) -> None:
+        latido_reportado = None
+        while not self._detener.wait(self.umbral / 2):
+            latido = self._latido
+            atraso = time.monotonic() - latido - self.intervalo
+            if atraso < self.umbral or latido == latido_reportado or self._hilo_loop is None:
+                continue
+            latido_reportado = latido
+            frame = sys._current_frames().get(self._hilo_loop)
+            bloqueo = {
+                "fecha": datetime.now(timezone.utc).isoformat(),
+                "duracion_ms": None,  # se completa cuando el loop vuelve
+                "pila": traceback.format_stack(frame) if frame is not None else [],
+            }
+            self.total_bloqueos += 1
+            self.bloqueos.append(bloqueo)
+            self._bloqueo_actual = bloqueo
+
+    # --
+
+    def iniciar(self) -> None:
+        if self._tarea is not None:
+            return
+        self._detener.clear()
+        self._tarea = asyncio.get_running_loop().create_task(self._muestrear())
+        self._hilo = threading.Thread(target=self._vigilar, name="monitor-loop", daemon=True)
+        self._hilo.start()
+        logger.info(
+            "Monitor del event loop activo (muestra cada %.0f ms, bloqueo > %.0f ms)",
+            self.intervalo * 1000, self.umbral * 1000
+        )
+
+    async def detener(self) -> None:
+        self._detener.set()
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    def percentiles(self) -> dict:
+        ordenados = sorted(self.retrasos)
+        return {q: _percentil(ordenados, q) for q in CUANTILES}
+
+    def resumen(self, limite: Optional[int] = None) -> dict:
+        return {
+            "activo": self._tarea is not None,
+            "umbral_ms": self.umbral * 1000,
+            "retraso_ms": {f"p{int(q * 100)}": round(v * 1000, 2) for q, v in self.percentiles().items()},
+            "retraso_maximo_ms": round(self.retraso_maximo * 1000, 1),
+            "total_bloqueos": self.total_bloqueos,
+            "bloqueos": list(reversed(self.bloqueos))[:limite] if limite else list(reversed(self.bloqueos)),
+        }
+
+    def exportar(self) -> str:
+        """Líneas de Prometheus para /metrics."""
+        lineas = [
+            "# HELP event_loop_retraso_segundos Retraso del event loop (últimas muestras).",
+            "# TYPE event_loop_retraso_segundos summary",
+        ]
+        for q, valor in self.percentiles().items():
+            lineas.append(f'event_loop_retraso_segundos{{quantile="{q}"}} {valor!r}')
+        lineas += [
+            f"event_loop_retraso_segundos_sum {self.suma_total!r}",
+            f"event_loop_retraso_segundos_count {self.muestras_total}",
+            "# HELP event_loop_bloqueos_total Bloqueos del event loop mayores al umbral.",
+            "# TYPE event_loop_bloqueos_total counter",
+            f"event_loop_bloqueos_total {self.total_bloqueos}",
+        ]
+        return "\n".join(lineas) + "\n"
+
+
+monitor = MonitorLoop()
@@ -0,0 +1,155 @@
+# gestion_negocio/core/perfilador.py
+
+"""
+Perfilado bajo demanda de una petición (cProfile), solo para superadmin.
+
+Una petición con el header `X-Perfilar` y un token de ROLE_SUPERADMIN se
+ejecuta completa bajo cProfile: dependencias (get_current_user, get_db),
+handler, SQL y serialización. En lugar de su respuesta se devuelve el
+perfil:
+
+    X-Perfilar: prof    archivo .prof (pstats) para snakeviz, flameprof
+                        o `python -m pstats`
+    X-Perfilar: texto   resumen por tiempo acumulado (top 60)
+
+El estado y la duración de la respuesta original van en X-Perfil-Estado
+y X-Perfil-Duracion-Ms.
+
+El rol se toma del token firmado (claim "rol") y se confirma en la BD
+antes de perfilar. Un perfil a la vez por worker (409 si hay otro en
+curso). cProfile mide el hilo del event loop: el trabajo de otras
+peticiones concurrentes puede aparecer en el perfil, y lo que corre en
+el threadpool (handlers síncronos) no.
+
+Las peticiones sin el header solo pagan la búsqueda del header.
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+from datetime import datetime
+
+import jwt
+from sqlalchemy import select
+
+from database import get_sessionmaker
+from dependencies.auth import ROLE_SUPERADMIN
+from models.usuarios import Usuario
+from services.auth_service import JWT_ALGORITHM, JWT_SECRET
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"x-perfilar"
+FORMATOS = {"prof", "texto"}
+
+
+def _header(scope, nombre: bytes):
+    for clave, valor in scope["headers"]:
+        if clave == nombre:
+            return valor.decode("latin-1")
+    return None
+
+
+async def _responder(send, estado: int, cuerpo: bytes, tipo: bytes, extra: list = ()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": estado,
+        "headers": [
+            (b"content-type", tipo),
+            (b"content-length", str(len(cuerpo)).encode()),
+            *extra,
+        ],
+    })
+    await send({"type": "http.response.body", "body": cuerpo})
+
+
+async def _es_superadmin(scope) -> bool:
+    autorizacion = _header(scope, b"authorization") or ""
+    if not autorizacion.lower().startswith("bearer "):
+        return False
+    try:
+        payload = jwt.decode(autorizacion[7:], JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        usuario_id = int(payload.get("sub"))
+    except Exception:
+        return False
+    if str(payload.get("rol")) != str(ROLE_SUPERADMIN):
+        return False
+
+    # El claim puede estar desactualizado: se confirma el rol vigente
+    async with get_sessionmaker()() as db:
+        rol_id = (await db.execute(select(Usuario.rol_id).where(Usuario.id == usuario_id))).scalar()
+    return rol_id == ROLE_SUPERADMIN
+
+
+class PerfiladorPeticion:
+    def __init__(self, app):
+        self.app = app
+        self.en_curso = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        formato = _header(scope, HEADER)
+        if formato is None:
+            await self.app(scope, receive, send)
+            return
+
+        formato = formato.strip().lower() or "prof"
+        if formato not in FORMATOS:
+            await _responder(send, 400, f"X-Perfilar: {' | '.join(sorted(FORMATOS))}".encode(), b"text/plain")
+            return
+        if not await _es_superadmin(scope):
+            await _responder(send, 403, b"Perfilado solo para superadmin", b"text/plain")
+            return
+        if self.en_curso:
+            await _responder(send, 409, b"Ya hay un perfilado en curso en este worker", b"text/plain")
+            return
+
+        estado = 500
+
+        async def descartar(mensaje):
+            # La respuesta original no se envía: se reemplaza por el perfil
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+
+        self.en_curso = True
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        try:
+            perfil.enable()
+            try:
+                await self.app(scope, receive, descartar)
+            except Exception:
+                # El error también es parte de lo que se quiere ver: se
+                # registra y se devuelve el perfil con X-Perfil-Estado 500
+                logger.exception("Error en la petición perfilada")
+            finally:
+                perfil.disable()
+        finally:
+            self.en_curso = False
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        logger.info("Petición perfilada: %s %s (%.1f ms)", scope["method"], scope["path"], duracion_ms)
+        extra = [
+            (b"x-perfil-estado", str(estado).encode()),
+            (b"x-perfil-duracion-ms", f"{duracion_ms:.1f}".encode()),
+            (b"cache-control", b"no-store"),
+        ]
+        if formato == "texto":
+            salida = io.StringIO()
+            pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(60)
+            await _responder(send, 200, salida.getvalue().encode(), b"text/plain; charset=utf-8", extra)
+            return
+
+        perfil.create_stats()
+        nombre = "perfil-{}-{}.prof".format(
+            scope["path"].strip("/").replace("/", "_") or "raiz",
+            datetime.now().strftime("%Y%m%d-%H%M%S"),
+        )
+        extra.append((b"content-disposition", f'attachment; filename="{nombre}"'.encode()))
+        await _responder(send, 200, marshal.dumps(perfil.stats), b"application/octet-stream", extra)
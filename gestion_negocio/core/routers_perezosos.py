@@ -0,0 +1,64 @@
+# gestion_negocio/core/routers_perezosos.py
+
+"""
+Carga diferida de routers poco usados.
+
+Importar un router cuesta su módulo, sus esquemas Pydantic y la
+construcción de cada ruta. Para los que casi no se usan, ese costo se
+paga en el arranque (cold start de Cloud Run) sin necesidad. Con este
+middleware el router se importa e incluye en la app la primera vez que
+llega una petición bajo su prefijo:
+
+    app.add_middleware(
+        RoutersPerezosos,
+        fastapi_app=app,
+        routers={"/ventas": "routes.ventas", ...},
+    )
+
+Las rutas del esquema OpenAPI (/openapi.json, /docs, /redoc) cargan todos
+los pendientes antes de responder, así la documentación queda completa.
+Cada worker carga sus routers por su cuenta (después del fork).
+"""
+
+import importlib
+import logging
+import time
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+class RoutersPerezosos:
+    def __init__(self, app, fastapi_app: FastAPI, routers: dict[str, str]):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        # prefijo => módulo con un `router`
+        self.pendientes = dict(routers)
+        self.rutas_esquema = {
+            ruta for ruta in (fastapi_app.openapi_url, fastapi_app.docs_url, fastapi_app.redoc_url)
+            if ruta
+        }
+
+    def _cargar(self, prefijo: str) -> None:
+        nombre = self.pendientes.pop(prefijo, None)
+        if nombre is None:
+            return
+        inicio = time.perf_counter()
+        modulo = importlib.import_module(nombre)
+        self.fastapi_app.include_router(modulo.router)
+        # El esquema cacheado ya no incluye todas las rutas
+        self.fastapi_app.openapi_schema = None
+        logger.info("Router %s cargado en %.1f ms", nombre, (time.perf_counter() - inicio) * 1000)
+
+    async def __call__(self, scope, receive, send):
+        if self.pendientes and scope["type"] in ("http", "websocket"):
+            ruta = scope["path"]
+            if ruta in self.rutas_esquema:
+                for prefijo in list(self.pendientes):
+                    self._cargar(prefijo)
+            else:
+                for prefijo in list(self.pendientes):
+                    if ruta == prefijo or ruta.startswith(prefijo + "/"):
+                        self._cargar(prefijo)
+        await self.app(scope, receive, send)
@@ -0,0 +1,107 @@
+# gestion_negocio/core/sql_stats.py
+
+"""
+Conteo y tiempo de las sentencias SQL por petición.
+
+Los eventos before/after_cursor_execute del engine suman en las
+`EstadisticasSQL` activas en el contexto (ContextVar). SQLAlchemy corre
+el código del driver en un greenlet que hereda el contexto de la tarea,
+así que cada petición concurrente cuenta solo sus propias sentencias.
+Sin una medición activa, el costo por sentencia es leer la ContextVar.
+
+    with medir_sql() as sql:
+        ...
+    sql.sentencias, sql.segundos, sql.espera_pool
+
+Las mediciones anidadas (el middleware de métricas dentro de un chequeo)
+suman al salir en la medición que las contiene.
+
+La espera por una conexión del pool se mide con PoolMedido (poolclass del
+engine): el tiempo dentro de la obtención de la conexión, que incluye
+abrir una nueva cuando el pool no tiene libres.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class EstadisticasSQL:
+    __slots__ = ("sentencias", "segundos", "espera_pool", "detalle")
+
+    def __init__(self, guardar_detalle: bool = False):
+        self.sentencias = 0
+        self.segundos = 0.0
+        self.espera_pool = 0.0
+        # SQL de cada sentencia (solo para diagnóstico: chequeos y tests)
+        self.detalle: Optional[list] = [] if guardar_detalle else None
+
+
+_actual: ContextVar[Optional[EstadisticasSQL]] = ContextVar("estadisticas_sql", default=None)
+
+
+@contextmanager
+def medir_sql(guardar_detalle: bool = False):
+    """Activa un contador nuevo para el contexto actual y lo entrega."""
+    padre = _actual.get()
+    if padre is not None and padre.detalle is not None:
+        guardar_detalle = True
+    estadisticas = EstadisticasSQL(guardar_detalle)
+    token = _actual.set(estadisticas)
+    try:
+        yield estadisticas
+    finally:
+        _actual.reset(token)
+        if padre is not None:
+            padre.sentencias += estadisticas.sentencias
+            padre.segundos += estadisticas.segundos
+            padre.espera_pool += estadisticas.espera_pool
+            if padre.detalle is not None and estadisticas.detalle is not None:
+                padre.detalle.extend(estadisticas.detalle)
+
+
+def estadisticas_actuales() -> Optional[EstadisticasSQL]:
+    return _actual.get()
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if _actual.get() is not None:
+        conn.info["sql_stats_inicio"] = time.perf_counter()
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    estadisticas = _actual.get()
+    if estadisticas is None:
+        return
+    inicio = conn.info.pop("sql_stats_inicio", None)
+    estadisticas.sentencias += 1
+    if inicio is not None:
+        estadisticas.segundos += time.perf_counter() - inicio
+    if estadisticas.detalle is not None:
+        estadisticas.detalle.append(statement)
+
+
+class PoolMedido(AsyncAdaptedQueuePool):
+    """Pool por defecto de asyncpg que suma la espera del checkout a la medición activa."""
+
+    def _do_get(self):
+        estadisticas = _actual.get()
+        if estadisticas is None:
+            return super()._do_get()
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            estadisticas.espera_pool += time.perf_counter() - inicio
+
+
+def instalar(engine) -> None:
+    """Registra los eventos en `engine` (AsyncEngine o Engine). Idempotente."""
+    motor = getattr(engine, "sync_engine", engine)
+    if not event.contains(motor, "after_cursor_execute", _despues):
+        event.listen(motor, "before_cursor_execute", _antes)
+        event.listen(motor, "after_cursor_execute", _despues)
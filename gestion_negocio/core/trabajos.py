@@ -0,0 +1,489 @@
+# gestion_negocio/core/trabajos.py
+
+"""
+Cola de trabajos en segundo plano sobre PostgreSQL (tabla `trabajos`), sin
+broker externo.
+
+    encolar(db, "sync.purgar_eliminaciones", {...}, organizacion_id=org)
+    await db.commit()          # el trabajo existe solo si la transacción confirma
+
+Cada worker reclama de a un trabajo con
+
+    UPDATE trabajos SET estado = 'en_curso', ...
+    WHERE id = (SELECT id FROM trabajos WHERE estado = 'pendiente' ...
+                ORDER BY prioridad, disponible_en, id LIMIT 1
+                FOR UPDATE SKIP LOCKED)
+    RETURNING ...
+
+SKIP LOCKED: dos workers nunca toman el mismo trabajo ni se esperan entre
+sí. El reclamo confirma de inmediato; el trabajo corre fuera de esa
+transacción y el worker renueva su arriendo (bloqueado_en) con un latido.
+
+- Reintentos: un fallo vuelve a 'pendiente' con disponible_en = now() +
+  backoff exponencial (TRABAJOS_BACKOFF_BASE_S * 2^(intento-1), tope
+  TRABAJOS_BACKOFF_MAX_S, ±20 %). Al agotar max_intentos queda 'fallido'.
+- Prioridad: menor número => antes.
+- Límite por organización: no se reclama un trabajo si su organización ya
+  tiene TRABAJOS_POR_ORG en curso. Es un límite blando: dos workers que
+  reclaman en el mismo instante pueden excederlo en uno.
+- Arriendos vencidos (worker caído): cualquier worker devuelve a la cola
+  los trabajos en curso sin latido hace más de TRABAJOS_ARRIENDO_S.
+- Progreso: el handler llama `await ctx.progreso(40, "Procesando...")`; se
+  consulta en GET /trabajos/{id}. Si el worker perdió el arriendo (otro
+  retomó el trabajo), progreso() lanza ArriendoPerdido y el handler se
+  detiene sin registrar resultado.
+- Periódicos: @trabajo("nombre", cada_s=86400). El mantenimiento de cada
+  pool se asegura de que haya uno pendiente o en curso; si no, lo encola
+  para dentro de cada_s (un candado de transacción por tipo evita que dos
+  workers lo encolen a la vez).
+
+Los handlers se registran con @trabajo("nombre") (ver
+services/tareas_service.py). Los workers corren dentro de cada worker de
+Gunicorn (TRABAJOS_EN_PROCESO = concurrencia, 0 = no) o aparte con
+`python -m core.trabajos`.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import Integer, and_, any_, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import aliased
+
+from database import get_sessionmaker
+from models.trabajos import EstadoTrabajo, Trabajo
+
+logger = logging.getLogger(__name__)
+
+# Concurrencia del pool dentro de cada worker de la API (0 = no corre)
+TRABAJOS_EN_PROCESO = int(os.getenv("TRABAJOS_EN_PROCESO", "0"))
+# Concurrencia de `python -m core.trabajos`
+TRABAJOS_CONCURRENCIA = int(os.getenv("TRABAJOS_CONCURRENCIA", "4"))
+TRABAJOS_POR_ORG = int(os.getenv("TRABAJOS_POR_ORG", "2"))
+TRABAJOS_INTERVALO_S = float(os.getenv("TRABAJOS_INTERVALO_S", "1"))
+TRABAJOS_ARRIENDO_S = float(os.getenv("TRABAJOS_ARRIENDO_S", "60"))
+TRABAJOS_BACKOFF_BASE_S = float(os.getenv("TRABAJOS_BACKOFF_BASE_S", "10"))
+TRABAJOS_BACKOFF_MAX_S = float(os.getenv("TRABAJOS_BACKOFF_MAX_S", "3600"))
+
+PENDIENTE = EstadoTrabajo.pendiente.value
+EN_CURSO = EstadoTrabajo.en_curso.value
+
+
+# -----------------------------------------------------------------------------
+#                                 REGISTRO
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class DefinicionTrabajo:
+    nombre: str
+    funcion: Callable[["ContextoTrabajo"], Awaitable[Any]]
+    max_intentos: int
+    timeout_s: float
+    # Se puede encolar desde POST /trabajos (admin de la organización)
+    expuesto: bool
+    # Periódico: segundos entre una ejecución y la siguiente (None = no)
+    cada_s: Optional[float] = None
+
+
+REGISTRO: dict[str, DefinicionTrabajo] = {}
+
+
+def trabajo(nombre: str, *, max_intentos: int = 5, timeout_s: float = 3600, expuesto: bool = False,
+            cada_s: Optional[float] = None):
+    """
+    Registra un handler: `async def handler(ctx: ContextoTrabajo) -> dict | None`.
+    Lo que retorna (serializable a JSON) queda en `resultado`. Con `cada_s`
+    los pools lo encolan solos (sin organización) cada `cada_s` segundos.
+    """
+    def decorador(funcion):
+        if nombre in REGISTRO:
+            raise ValueError(f"Trabajo '{nombre}' registrado dos veces")
+        REGISTRO[nombre] = DefinicionTrabajo(nombre, funcion, max_intentos, timeout_s, expuesto, cada_s)
+        return funcion
+    return decorador
+
+
+# -----------------------------------------------------------------------------
+#                                 ENCOLAR
+# -----------------------------------------------------------------------------
+_aviso: Optional[asyncio.Event] = None
+
+
+def despertar() -> None:
+    """Avisa al pool de este proceso que hay trabajo (si no, lo ve en el próximo sondeo)."""
+    if _aviso is not None:
+        _aviso.set()
+
+
+def encolar(db, tipo: str, payload: Optional[dict] = None, *,
+            organizacion_id: Optional[int] = None, prioridad: int = 100,
+            creado_por: Optional[int] = None,
+            disponible_en: Optional[datetime] = None) -> Trabajo:
+    """
+    Agrega el trabajo a la sesión `db`; se guarda con el commit de quien llama
+    (junto con los datos que lo originan). Lanza ValueError si `tipo` no
+    está registrado.
+    """
+    definicion = REGISTRO.get(tipo)
+    if definicion is None:
+        raise ValueError(f"Tipo de trabajo desconocido: '{tipo}'")
+    nuevo = Trabajo(
+        tipo=tipo,
+        payload=payload or {},
+        estado=PENDIENTE,
+        prioridad=prioridad,
+        organizacion_id=organizacion_id,
+        creado_por=creado_por,
+        intentos=0,
+        max_intentos=definicion.max_intentos,
+    )
+    if disponible_en is not None:
+        nuevo.disponible_en = disponible_en
+    db.add(nuevo)
+    return nuevo
+
+
+async def programar_periodicos() -> int:
+    """
+    Encola, para dentro de `cada_s`, cada trabajo periódico registrado que no
+    tenga uno pendiente o en curso. Retorna cuántos encoló.
+    """
+    encolados = 0
+    for definicion in REGISTRO.values():
+        if definicion.cada_s is None:
+            continue
+        async with get_sessionmaker()() as db:
+            # Serializa a los workers que revisan el mismo tipo; se libera con el commit
+            await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(definicion.nombre))))
+            existente = (await db.execute(
+                select(Trabajo.id)
+                .where(Trabajo.tipo == definicion.nombre, Trabajo.estado.in_([PENDIENTE, EN_CURSO]))
+                .limit(1)
+            )).scalar()
+            if existente is None:
+                encolar(db, definicion.nombre, prioridad=200,
+                        disponible_en=func.now() + timedelta(seconds=definicion.cada_s))
+                encolados += 1
+            await db.commit()
+    return encolados
+
+
+# -----------------------------------------------------------------------------
+#                                 SENTENCIAS
+# -----------------------------------------------------------------------------
+def sentencia_reclamo(worker: str, limite_org: int = TRABAJOS_POR_ORG):
+    """UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING trabajos."""
+    candidato = aliased(Trabajo, name="candidato")
+    otro = aliased(Trabajo, name="otro")
+    en_curso_org = (
+        select(func.count())
+        .select_from(otro)
+        .where(otro.estado == EN_CURSO, otro.organizacion_id == candidato.organizacion_id)
+        .correlate(candidato)
+        .scalar_subquery()
+    )
+    siguiente = (
+        select(candidato.id)
+        .where(
+            candidato.estado == PENDIENTE,
+            candidato.disponible_en <= func.now(),
+            or_(candidato.organizacion_id.is_(None), en_curso_org < limite_org),
+        )
+        .order_by(candidato.prioridad, candidato.disponible_en, candidato.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(Trabajo)
+        .where(Trabajo.id == siguiente)
+        .values(
+            estado=EN_CURSO,
+            intentos=Trabajo.intentos + 1,
+            bloqueado_por=worker,
+            bloqueado_en=func.now(),
+            fecha_inicio=func.coalesce(Trabajo.fecha_inicio, func.now()),
+        )
+        .returning(Trabajo)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _mio(trabajo_id: int, worker: str):
+    return and_(Trabajo.id == trabajo_id, Trabajo.estado == EN_CURSO, Trabajo.bloqueado_por == worker)
+
+
+def backoff(intento: int) -> float:
+    """Segundos hasta el reintento número `intento` + 1."""
+    espera = min(TRABAJOS_BACKOFF_BASE_S * 2 ** max(intento - 1, 0), TRABAJOS_BACKOFF_MAX_S)
+    return espera * random.uniform(0.8, 1.2)
+
+
+async def _ejecutar_sql(sentencia) -> int:
+    async with get_sessionmaker()() as db:
+        result = await db.execute(sentencia)
+        await db.commit()
+        return result.rowcount
+
+
+async def reclamar(worker: str) -> Optional[Trabajo]:
+    async with get_sessionmaker()() as db:
+        trabajo_ = (await db.execute(sentencia_reclamo(worker))).scalars().first()
+        await db.commit()
+        return trabajo_
+
+
+async def completar(trabajo_: Trabajo, worker: str, resultado: Any) -> None:
+    await _ejecutar_sql(
+        update(Trabajo).where(_mio(trabajo_.id, worker)).values(
+            estado=EstadoTrabajo.completado.value,
+            resultado=resultado,
+            error=None,
+            progreso=100,
+            bloqueado_por=None,
+            bloqueado_en=None,
+            fecha_fin=func.now(),
+        )
+    )
+
+
+async def fallar(trabajo_: Trabajo, worker: str, error: str) -> None:
+    """Reintento con backoff o, si se agotaron los intentos, 'fallido'."""
+    if trabajo_.intentos >= trabajo_.max_intentos:
+        valores = {"estado": EstadoTrabajo.fallido.value, "fecha_fin": func.now()}
+    else:
+        valores = {
+            "estado": PENDIENTE,
+            "disponible_en": func.now() + timedelta(seconds=backoff(trabajo_.intentos)),
+        }
+    await _ejecutar_sql(
+        update(Trabajo).where(_mio(trabajo_.id, worker)).values(
+            error=error[:4000], bloqueado_por=None, bloqueado_en=None, **valores
+        )
+    )
+
+
+async def liberar(trabajo_: Trabajo, worker: str) -> None:
+    """Devuelve a la cola un trabajo interrumpido por el apagado (no cuenta el intento)."""
+    await _ejecutar_sql(
+        update(Trabajo).where(_mio(trabajo_.id, worker)).values(
+            estado=PENDIENTE,
+            intentos=Trabajo.intentos - 1,
+            bloqueado_por=None,
+            bloqueado_en=None,
+        )
+    )
+
+
+async def renovar_arriendos(worker: str, ids: list[int]) -> None:
+    if ids:
+        await _ejecutar_sql(
+            update(Trabajo)
+            .where(
+                Trabajo.id == any_(literal(ids, ARRAY(Integer))),
+                Trabajo.estado == EN_CURSO,
+                Trabajo.bloqueado_por == worker,
+            )
+            .values(bloqueado_en=func.now())
+        )
+
+
+async def recuperar_vencidos() -> int:
+    """Trabajos en curso sin latido (worker caído): a la cola o, sin intentos, 'fallido'."""
+    vencido = and_(
+        Trabajo.estado == EN_CURSO,
+        Trabajo.bloqueado_en < func.now() - timedelta(seconds=TRABAJOS_ARRIENDO_S),
+    )
+    comunes = {"bloqueado_por": None, "bloqueado_en": None, "error": "Arriendo vencido (worker caído)"}
+    fallidos = await _ejecutar_sql(
+        update(Trabajo)
+        .where(vencido, Trabajo.intentos >= Trabajo.max_intentos)
+        .values(estado=EstadoTrabajo.fallido.value, fecha_fin=func.now(), **comunes)
+    )
+    devueltos = await _ejecutar_sql(
+        update(Trabajo)
+        .where(vencido, Trabajo.intentos < Trabajo.max_intentos)
+        .values(estado=PENDIENTE, disponible_en=func.now(), **comunes)
+    )
+    if fallidos or devueltos:
+        logger.warning("Arriendos vencidos: %s a la cola, %s fallidos", devueltos, fallidos)
+    return fallidos + devueltos
+
+
+# -----------------------------------------------------------------------------
+#                                 EJECUCIÓN
+# -----------------------------------------------------------------------------
+class ArriendoPerdido(Exception):
+    """El trabajo ya no es de este worker (arriendo vencido, cancelado o retomado por otro)."""
+
+
+class ContextoTrabajo:
+    """Lo que recibe el handler: el trabajo, su payload y el reporte de progreso."""
+
+    def __init__(self, trabajo_: Trabajo, worker: str):
+        self.trabajo = trabajo_
+        self.id = trabajo_.id
+        self.payload = trabajo_.payload or {}
+        self.organizacion_id = trabajo_.organizacion_id
+        self.intento = trabajo_.intentos
+        self._worker = worker
+
+    def sesion(self):
+        """Sesión nueva (`async with ctx.sesion() as db:`); cada handler confirma lo suyo."""
+        return get_sessionmaker()()
+
+    async def progreso(self, porcentaje: float, mensaje: Optional[str] = None) -> None:
+        """
+        Guarda el avance (0 a 100); también renueva el arriendo. Lanza
+        ArriendoPerdido si el trabajo ya no es de este worker: el handler
+        debe dejar de trabajar (otro puede estar haciéndolo).
+        """
+        actualizados = await _ejecutar_sql(
+            update(Trabajo).where(_mio(self.id, self._worker)).values(
+                progreso=max(0.0, min(float(porcentaje), 100.0)),
+                mensaje_progreso=mensaje[:255] if mensaje else None,
+                bloqueado_en=func.now(),
+            )
+        )
+        if not actualizados:
+            raise ArriendoPerdido(f"El trabajo {self.id} ya no pertenece a {self._worker}")
+
+
+class PoolTrabajos:
+    def __init__(self, concurrencia: int, intervalo_s: float = TRABAJOS_INTERVALO_S):
+        self.concurrencia = concurrencia
+        self.intervalo = intervalo_s
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._cupos = asyncio.Semaphore(concurrencia)
+        self._en_curso: dict[int, asyncio.Task] = {}
+        self._tareas: list[asyncio.Task] = []
+
+    async def _esperar_aviso(self) -> None:
+        try:
+            await asyncio.wait_for(_aviso.wait(), self.intervalo)
+        except asyncio.TimeoutError:
+            pass
+        _aviso.clear()
+
+    async def _sondear(self) -> None:
+        while True:
+            await self._cupos.acquire()
+            try:
+                trabajo_ = await reclamar(self.worker)
+            except Exception:
+                self._cupos.release()
+                logger.exception("No se pudo reclamar un trabajo")
+                await asyncio.sleep(self.intervalo)
+                continue
+            if trabajo_ is None:
+                self._cupos.release()
+                await self._esperar_aviso()
+                continue
+            self._en_curso[trabajo_.id] = asyncio.create_task(self._ejecutar(trabajo_))
+
+    async def _ejecutar(self, trabajo_: Trabajo) -> None:
+        try:
+            definicion = REGISTRO.get(trabajo_.tipo)
+            try:
+                if definicion is None:
+                    raise LookupError(f"Tipo de trabajo no registrado en este worker: '{trabajo_.tipo}'")
+                resultado = await asyncio.wait_for(
+                    definicion.funcion(ContextoTrabajo(trabajo_, self.worker)), definicion.timeout_s
+                )
+            except asyncio.CancelledError:
+                await asyncio.shield(liberar(trabajo_, self.worker))
+                raise
+            except ArriendoPerdido:
+                # Ya no es nuestro: completar/fallar no aplicarían
+                logger.warning("Trabajo %s (%s): arriendo perdido, se abandona", trabajo_.id, trabajo_.tipo)
+            except asyncio.TimeoutError:
+                logger.warning("Trabajo %s (%s) excedió su tiempo", trabajo_.id, trabajo_.tipo)
+                await fallar(trabajo_, self.worker, f"Tiempo agotado ({definicion.timeout_s:.0f} s)")
+            except Exception as e:
+                logger.exception("Trabajo %s (%s) falló (intento %s/%s)",
+                                 trabajo_.id, trabajo_.tipo, trabajo_.intentos, trabajo_.max_intentos)
+                await fallar(trabajo_, self.worker, f"{type(e).__name__}: {e}")
+            else:
+                await completar(trabajo_, self.worker, resultado)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Sin BD para registrar el resultado: el arriendo vence y otro lo retoma
+            logger.exception("No se pudo registrar el resultado del trabajo %s", trabajo_.id)
+        finally:
+            self._en_curso.pop(trabajo_.id, None)
+            self._cupos.release()
+
+    async def _mantener(self) -> None:
+        """Latido de los trabajos propios, arriendos vencidos y trabajos periódicos."""
+        while True:
+            await asyncio.sleep(TRABAJOS_ARRIENDO_S / 3)
+            try:
+                await renovar_arriendos(self.worker, list(self._en_curso))
+                await recuperar_vencidos()
+                await programar_periodicos()
+            except Exception:
+                logger.exception("Falló el mantenimiento de la cola de trabajos")
+
+    def iniciar(self) -> None:
+        global _aviso
+        if self._tareas:
+            return
+        _aviso = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tareas = [loop.create_task(self._sondear()), loop.create_task(self._mantener())]
+        logger.info("Pool de trabajos %s activo (concurrencia %s, %s por organización)",
+                    self.worker, self.concurrencia, TRABAJOS_POR_ORG)
+
+    async def detener(self, gracia_s: float = 10) -> None:
+        """Deja de reclamar, espera `gracia_s` a los trabajos en curso y devuelve el resto a la cola."""
+        for tarea in self._tareas:
+            tarea.cancel()
+        self._tareas = []
+        en_curso = list(self._en_curso.values())
+        if en_curso:
+            _, pendientes = await asyncio.wait(en_curso, timeout=gracia_s)
+            for tarea in pendientes:
+                tarea.cancel()
+            await asyncio.gather(*pendientes, return_exceptions=True)
+
+
+# -----------------------------------------------------------------------------
+#                     PROCESO APARTE: python -m core.trabajos
+# -----------------------------------------------------------------------------
+async def _correr(concurrencia: int) -> None:
+    import services.tareas_service  # noqa: F401  (registra los handlers)
+
+    pool = PoolTrabajos(concurrencia)
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(senal, parar.set)
+    pool.iniciar()
+    await parar.wait()
+    logger.info("Deteniendo el pool de trabajos %s", pool.worker)
+    await pool.detener()
+
+
+def main_cli() -> None:
+    from core.logs import configurar_logging, detener_logging
+
+    configurar_logging()
+    try:
+        asyncio.run(_correr(TRABAJOS_CONCURRENCIA))
+    finally:
+        detener_logging()
+
+
+if __name__ == "__main__":
+    # Con -m este archivo es __main__: se usa el módulo importado, que es el
+    # mismo en el que los handlers se registran
+    from core.trabajos import main_cli as _main_cli
+    _main_cli()
@@ -1,9 +1,15 @@
+import asyncio
+import logging
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
 from dotenv import load_dotenv
 
+from core import consultas_lentas, sql_stats
+
+logger = logging.getLogger(__name__)
+
 # Solo cargamos .env si NO estamos en Cloud (ejemplo local)
 if os.getenv("GOOGLE_CLOUD_PROJECT") is None:
     load_dotenv()
@@ -21,7 +27,6 @@ if cloud_sql_connection_name:
         f"postgresql+asyncpg://{db_user}:{db_password}@/{db_name}"
         f"?host=/cloudsql/{cloud_sql_connection_name}"
     )
-    print("DEBUG => Cloud Run database_url:", database_url)
 else:
     # Modo local (o fallback)
     db_host = os.getenv("DB_HOST", "localhost")
@@ -30,19 +35,85 @@ else:
         f"postgresql+asyncpg://{db_user}:{db_password}"
         f"@{db_host}:{db_port}/{db_name}"
     )
-    print("DEBUG => Local database_url:", database_url)
 
-# Creamos el engine asíncrono
-engine = create_async_engine(database_url)
+# El engine (y con él el import de asyncpg) se crea en el primer uso, no al
+# importar el módulo: acorta el arranque en frío. `from database import
+# engine` sigue funcionando (ver __getattr__).
+_engine = None
+_sesiones = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(database_url, poolclass=sql_stats.PoolMedido)
+        sql_stats.instalar(_engine)
+        consultas_lentas.instalar(_engine)
+        logger.info(
+            "Engine creado: %s",
+            make_url(database_url).render_as_string(hide_password=True)
+        )
+    return _engine
+
+
+def get_sessionmaker():
+    global _sesiones
+    if _sesiones is None:
+        _sesiones = sessionmaker(
+            bind=get_engine(),
+            expire_on_commit=False,
+            class_=AsyncSession
+        )
+    return _sesiones
+
+
+def __getattr__(nombre):
+    if nombre == "engine":
+        return get_engine()
+    if nombre == "AsyncSessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def estado_pool():
+    """Tamaño y uso del pool (None si el engine aún no se creó)."""
+    if _engine is None:
+        return None
+    pool = _engine.pool
+    return {
+        "tamano": pool.size(),
+        "en_uso": pool.checkedout(),
+        "desborde": pool.overflow(),
+    }
+
+
+async def precalentar_conexiones(cantidad: int) -> None:
+    """
+    Abre `cantidad` conexiones en paralelo y las deja en el pool, para que
+    las primeras peticiones no paguen la conexión (socket, auth, TLS).
+    """
+    if cantidad <= 0:
+        return
+    motor = get_engine()
+
+    async def abrir():
+        conexion = await motor.connect()
+        await conexion.exec_driver_sql("SELECT 1")
+        return conexion
+
+    resultados = await asyncio.gather(
+        *(abrir() for _ in range(cantidad)), return_exceptions=True
+    )
+    for resultado in resultados:
+        if not isinstance(resultado, BaseException):
+            await resultado.close()
+    for resultado in resultados:
+        if isinstance(resultado, BaseException):
+            raise resultado
 
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    class_=AsyncSession
-)
 
 async def get_db():
-    db = AsyncSessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
@@ -1,11 +1,12 @@
 # gestion_negocio/dependencies/auth.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from core import contexto
 from database import get_db
 from models.usuarios import Usuario
 from services.auth_service import JWT_SECRET, JWT_ALGORITHM
@@ -17,11 +18,21 @@ ROLE_SUPERADMIN = 1
 ROLE_ADMIN = 2
 ROLE_EMPLEADO = 3
 
+# Clave del scope ASGI con el usuario ya autenticado (sub-peticiones de
+# /batch). Solo se puede fijar desde el propio proceso, no desde headers.
+SCOPE_USUARIO = "usuario_autenticado"
+
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ):
+    user = request.scope.get(SCOPE_USUARIO)
+    if user is not None:
+        contexto.fijar_usuario(user)
+        return user
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id_str = payload.get("sub")  # Este viene como string
@@ -59,6 +70,8 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado"
         )
+    # Ruta + organización para el registro de consultas lentas y los logs
+    contexto.fijar_usuario(user)
     return user
 
 
@@ -0,0 +1,135 @@
+# gestion_negocio/dependencies/condicional.py
+
+"""
+GET condicional (ETag / Last-Modified) para lecturas de una sola entidad.
+
+Uso en un handler:
+
+    @router.get("/{cliente_id}", response_model=ClienteResponseSchema)
+    async def obtener_cliente(
+        cliente_id: int,
+        db: AsyncSession = Depends(get_db),
+        condicional: GetCondicional = Depends(get_condicional(Cliente, "cliente_id", referencias=True)),
+    ):
+        ...
+        condicional.marcar(cliente_db)
+        return cliente_db
+
+- Si la petición trae If-None-Match / If-Modified-Since, se consulta SOLO
+  `fecha_actualizacion` de la fila. Si coincide se responde 304 sin cargar
+  la entidad ni serializar nada.
+- Si no coincide (o no hay validadores), el handler sigue normal y
+  `marcar()` agrega ETag y Last-Modified a partir de la fila ya cargada,
+  sin consultas extra.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from services.referencias_service import obtener_referencias
+
+
+def _comparar_etags(if_none_match: str, etag: str) -> bool:
+    """Comparación débil (RFC 9110): se ignora el prefijo W/."""
+    if if_none_match.strip() == "*":
+        return True
+    objetivo = etag.removeprefix("W/")
+    return any(
+        candidato.strip().removeprefix("W/") == objetivo
+        for candidato in if_none_match.split(",")
+    )
+
+
+class GetCondicional:
+    def __init__(self, request: Request, response: Response, referencias: bool):
+        self.request = request
+        self.response = response
+        self.referencias = referencias
+
+    def etag(self, fecha_actualizacion: datetime) -> str:
+        version = f"{int(fecha_actualizacion.timestamp() * 1_000_000):x}"
+        if self.referencias:
+            # La respuesta incluye nombres del registro de referencias:
+            # si el registro cambia, la representación también.
+            version += f"-r{obtener_referencias().version}"
+        return f'W/"{version}"'
+
+    def no_modificado(self, fecha_actualizacion: datetime) -> bool:
+        headers = self.request.headers
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            # Si viene If-None-Match, If-Modified-Since se ignora
+            return _comparar_etags(if_none_match, self.etag(fecha_actualizacion))
+
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                desde = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if desde.tzinfo is None:
+                desde = desde.replace(tzinfo=timezone.utc)
+            # Last-Modified tiene resolución de segundos
+            return fecha_actualizacion.replace(microsecond=0) <= desde
+        return False
+
+    def headers(self, fecha_actualizacion: datetime) -> dict:
+        return {
+            "ETag": self.etag(fecha_actualizacion),
+            "Last-Modified": format_datetime(
+                fecha_actualizacion.astimezone(timezone.utc), usegmt=True
+            ),
+            "Cache-Control": "private, no-cache",
+        }
+
+    def marcar(self, obj) -> None:
+        """Agrega ETag / Last-Modified a la respuesta según la fila cargada."""
+        fecha = getattr(obj, "fecha_actualizacion", None)
+        if fecha is not None:
+            self.response.headers.update(self.headers(_con_zona(fecha)))
+
+
+def _con_zona(fecha: datetime) -> datetime:
+    return fecha if fecha.tzinfo else fecha.replace(tzinfo=timezone.utc)
+
+
+def get_condicional(modelo, param_id: str, referencias: bool = False):
+    """
+    Dependencia de GET condicional para `modelo` identificado por el
+    path param `param_id`. `referencias=True` si la respuesta se hidrata
+    con el registro de referencias (la versión del registro entra al ETag).
+    """
+    async def dependencia(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+    ) -> GetCondicional:
+        condicional = GetCondicional(request, response, referencias)
+        headers = request.headers
+        if "if-none-match" not in headers and "if-modified-since" not in headers:
+            return condicional
+
+        id_ = request.path_params.get(param_id)
+        try:
+            id_ = int(id_)
+        except (TypeError, ValueError):
+            return condicional
+
+        stmt = select(modelo.fecha_actualizacion).where(modelo.id == id_)
+        fecha: Optional[datetime] = (await db.execute(stmt)).scalar()
+        if fecha is None:
+            # No existe (el handler responde 404) o aún sin versión
+            return condicional
+
+        fecha = _con_zona(fecha)
+        if condicional.no_modificado(fecha):
+            raise HTTPException(status_code=304, headers=condicional.headers(fecha))
+        return condicional
+
+    return dependencia
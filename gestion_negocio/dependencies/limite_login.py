@@ -0,0 +1,31 @@
+# gestion_negocio/dependencies/limite_login.py
+
+import math
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from services.limite_service import limitador_login
+
+
+async def limitar_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> None:
+    """
+    Rechaza con 429 los intentos que exceden el límite por IP o por email,
+    ANTES de consultar la BD, verificar bcrypt o escribir auditoría.
+    Debe declararse antes de `get_db` en el endpoint.
+
+    La IP es `request.client.host`: detrás de un proxy, el servidor debe
+    resolverla desde X-Forwarded-For, confiando solo en la IP del proxy
+    (forwarded_allow_ips en gunicorn.conf.py; nunca "*").
+    """
+    ip = request.client.host if request.client else None
+    espera = await limitador_login.verificar(ip, form_data.username)
+    if espera:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de inicio de sesión. Intente más tarde.",
+            headers={"Retry-After": str(math.ceil(espera))},
+        )
@@ -0,0 +1,80 @@
+# gestion_negocio/gunicorn.conf.py
+
+"""
+Perfil de Gunicorn para producción (Cloud Run). Se carga con:
+
+    gunicorn main:app -c gunicorn.conf.py
+
+- Workers: uno por CPU disponible según la cuota del contenedor (cgroup v2
+  o v1; si no hay cuota, la afinidad del proceso). Los workers de Uvicorn
+  son asíncronos: más procesos que CPUs solo agregan cambios de contexto
+  y pools de conexiones a la BD (cada worker tiene el suyo).
+- preload_app: la app se importa una vez en el master y los workers la
+  heredan por fork (arranque más rápido, memoria compartida). El engine
+  no abre conexiones al importarse, así que no se comparten sockets.
+- Uvicorn con loop/http "auto" usa uvloop y httptools (en requirements).
+- keepalive mayor que el idle timeout del proxy de Cloud Run, para que no
+  cierre el servidor una conexión que el proxy va a reutilizar.
+- graceful_timeout por debajo de los 10 s que Cloud Run espera entre
+  SIGTERM y SIGKILL.
+
+Todo se puede ajustar por variables de entorno sin reconstruir la imagen.
+"""
+
+import math
+import os
+from pathlib import Path
+
+
+def _cpus_disponibles() -> float:
+    # cgroup v2: "max 100000" o "<cuota> <periodo>"
+    try:
+        cuota, periodo = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if cuota != "max":
+            return int(cuota) / int(periodo)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        cuota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        periodo = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if cuota > 0:
+            return cuota / periodo
+    except (OSError, ValueError):
+        pass
+    try:
+        return float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return float(os.cpu_count() or 1)
+
+
+CPUS = _cpus_disponibles()
+
+bind = os.getenv("WEB_BIND", f"0.0.0.0:{os.getenv('PORT', '8080')}")
+workers = int(os.getenv("WEB_WORKERS", 0)) or max(1, math.ceil(CPUS))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("WEB_PRELOAD", "1") == "1"
+
+keepalive = int(os.getenv("WEB_KEEPALIVE", 75))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", 8))
+# Vigilancia del event loop: un worker que no responde en este tiempo está
+# bloqueado y se reinicia. El timeout por request lo pone Cloud Run.
+timeout = int(os.getenv("WEB_TIMEOUT", 60))
+
+# Heartbeat de los workers en memoria (no en el overlay del contenedor)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# X-Forwarded-For solo se acepta de estas IPs (las del proxy/balanceador,
+# separadas por coma). De un par de confianza se toma la entrada más a la
+# derecha que no sea de confianza; con "*" se tomaría la primera, que la
+# escribe el cliente y permitiría evadir el límite por IP de /auth/login.
+# Detrás del proxy de Cloud Run: FORWARDED_ALLOW_IPS=<IP que el proxy usa
+# para conectar> (la que llega en request.client.host sin esta opción).
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    server.log.info(
+        "Perfil: %s workers (CPUs=%.2f), preload=%s, keepalive=%ss, graceful_timeout=%ss",
+        workers, CPUS, preload_app, keepalive, graceful_timeout,
+    )
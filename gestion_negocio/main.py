@@ -1,9 +1,19 @@
 # gestion_negocio/main.py
 
+import asyncio
+import importlib
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import IntegrityError
+
+from core.logs import configurar_logging, detener_logging
+configurar_logging()  # antes de los imports que loguean al cargarse
 
-from database import engine, get_db
+from database import precalentar_conexiones
 import models
  
 from routes import (
@@ -14,20 +24,86 @@ from routes import (
     clientes,
     empleados,
     proveedores,
-    productos,
-    ventas,
-    tesoreria,
-    cuentas_wallet,
-    chats,
     catalogos,
     ubicaciones,
-    planes,
-    permissions,
-    test_db
-    
+    bootstrap,
+    batch,
+    sync,
 )
+from core.routers_perezosos import RoutersPerezosos
+from core.metricas import MetricasHTTP
+from core.compresion import COMPRESION, CompresionRespuestas
+from core.contexto import ContextoPeticion
+from core.perfilador import PerfiladorPeticion
+from core.monitor_loop import LOOP_MONITOR, monitor as monitor_loop
+from core.trabajos import TRABAJOS_EN_PROCESO, PoolTrabajos
+import services.tareas_service  # registra los handlers de la cola de trabajos
+from services.referencias_service import recargar_referencias, refrescar_periodicamente
+from services.integridad_service import (
+    ViolacionUnicidad,
+    manejar_violacion_unicidad,
+    manejar_integrity_error
+)
+from services.common_validations import ReferenciasInvalidas, manejar_referencias_invalidas
+
+
+# Routers poco usados: se importan en su primera petición (prefijo => módulo).
+# ROUTERS_PEREZOSOS=0 los carga todos al arrancar.
+ROUTERS_DIFERIDOS = {
+    "/productos": "routes.productos",
+    "/ventas": "routes.ventas",
+    "/tesoreria": "routes.tesoreria",
+    "/cuentas-wallet": "routes.cuentas_wallet",
+    "/chats": "routes.chats",
+    "/planes": "routes.planes",
+    "/permissions": "routes.permissions",
+    "/test-db": "routes.test_db",
+    "/diagnostico": "routes.diagnostico",
+    "/trabajos": "routes.trabajos",
+}
+ROUTERS_PEREZOSOS = os.getenv("ROUTERS_PEREZOSOS", "1") == "1"
+# Conexiones a abrir al arrancar (0 = ninguna; la primera petición conecta)
+DB_PRECALENTAR = int(os.getenv("DB_PRECALENTAR", "0"))
+# Latencias, SQL por petición, Server-Timing y /metrics (METRICAS=0 los apaga)
+METRICAS = os.getenv("METRICAS", "1") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El apagado de un ciclo anterior detuvo el listener de logs
+    configurar_logging()
+    try:
+        await precalentar_conexiones(DB_PRECALENTAR)
+    except Exception:
+        logging.getLogger(__name__).exception("No se pudieron precalentar las conexiones")
+    # Registro en memoria de catálogos y ubicaciones (services/referencias_service.py)
+    try:
+        await recargar_referencias()
+    except Exception:
+        logging.getLogger(__name__).exception("No se pudo cargar el registro de referencias")
+    tarea_refresco = asyncio.create_task(refrescar_periodicamente())
+    # Retraso del event loop y pilas de los bloqueos (core/monitor_loop.py)
+    if LOOP_MONITOR:
+        monitor_loop.iniciar()
+    # Cola de trabajos en este worker (core/trabajos.py); si no, `python -m core.trabajos`
+    pool_trabajos = PoolTrabajos(TRABAJOS_EN_PROCESO) if TRABAJOS_EN_PROCESO > 0 else None
+    if pool_trabajos is not None:
+        pool_trabajos.iniciar()
+    yield
+    if pool_trabajos is not None:
+        await pool_trabajos.detener()
+    tarea_refresco.cancel()
+    await monitor_loop.detener()
+    detener_logging()
 
-app = FastAPI(title="API de Gestión Empresarial", version="1.0")
+
+app = FastAPI(title="API de Gestión Empresarial", version="1.0", lifespan=lifespan)
+
+# Unicidad garantizada por la BD => 400 con el mensaje de negocio
+app.add_exception_handler(ViolacionUnicidad, manejar_violacion_unicidad)
+app.add_exception_handler(IntegrityError, manejar_integrity_error)
+# FKs inexistentes o de otra organización => 422 con todas las violaciones
+app.add_exception_handler(ReferenciasInvalidas, manejar_referencias_invalidas)
 
 # Aquí limitamos CORS a y-sistem.web.app y y-sistem.firebaseapp.com
 app.add_middleware(
@@ -50,16 +126,34 @@ app.include_router(roles.router)
 app.include_router(clientes.router)
 app.include_router(proveedores.router)
 app.include_router(empleados.router)
-app.include_router(productos.router)
-app.include_router(ventas.router)
-app.include_router(tesoreria.router)
-app.include_router(cuentas_wallet.router)
-app.include_router(chats.router)
 app.include_router(catalogos.router)
 app.include_router(ubicaciones.router)
-app.include_router(planes.router)
-app.include_router(permissions.router)
-app.include_router(test_db.router)
+app.include_router(bootstrap.router)
+app.include_router(batch.router)
+app.include_router(sync.router)
+
+if ROUTERS_PEREZOSOS:
+    app.add_middleware(RoutersPerezosos, fastapi_app=app, routers=ROUTERS_DIFERIDOS)
+else:
+    for modulo in ROUTERS_DIFERIDOS.values():
+        app.include_router(importlib.import_module(modulo).router)
+
+# Ruta y usuario de la petición para código sin acceso al request (core/contexto.py)
+app.add_middleware(ContextoPeticion)
+
+# X-Perfilar + token de superadmin => perfil cProfile de esa petición
+app.add_middleware(PerfiladorPeticion)
+
+# gzip/br según Accept-Encoding y tamaño (core/compresion.py); dentro de
+# MetricasHTTP para que la latencia medida incluya la compresión
+if COMPRESION:
+    app.add_middleware(CompresionRespuestas)
+
+# El último middleware agregado es el más externo: mide la petición completa
+if METRICAS:
+    from routes import metricas
+    app.include_router(metricas.router)
+    app.add_middleware(MetricasHTTP)
 
 @app.get("/")
 def home():
@@ -27,5 +27,7 @@ from .organizaciones import Organizacion, EstadoOrganizacion, NumeracionTransacc
 from .planes import Plan
 from .roles import Rol
 from .permissions import Permission
+from .sincronizacion import Eliminacion
+from .trabajos import Trabajo, EstadoTrabajo
 
 # No hay que hacer nada más aquí; con esto, Base.metadata incluye todos tus modelos.
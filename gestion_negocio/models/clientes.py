@@ -1,6 +1,6 @@
 # models/clientes.py
 
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, UniqueConstraint, Index, DateTime, func
 from sqlalchemy.orm import relationship, validates
 from . import Base
 from services.dv_calculator import calc_dv_if_nit
@@ -83,9 +83,28 @@ class Cliente(Base):
 
     observacion = Column(String(255), nullable=True)
 
+    # Se actualiza en cada UPDATE; sirve de versión de la fila (ETag / Last-Modified)
+    fecha_actualizacion = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
     # Unicidad => un cliente con numero_documento X no se repite dentro de la misma organizacion
     __table_args__ = (
         UniqueConstraint("organizacion_id", "numero_documento", name="uq_cliente_org_doc"),
+        # Listado con organizacion_id y orden por id
+        Index("ix_clientes_org_id", "organizacion_id", "id"),
+        # Sincronización: keyset por (fecha_actualizacion, id) dentro de la org
+        Index("ix_clientes_org_sync", "organizacion_id", "fecha_actualizacion", "id"),
+        # Búsqueda: lower(nombre_razon_social) ILIKE '%term%' (pg_trgm)
+        Index(
+            "ix_clientes_nombre_trgm",
+            func.lower(nombre_razon_social).label("nombre_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"nombre_lower": "gin_trgm_ops"},
+        ),
     )
 
     @validates("numero_documento")
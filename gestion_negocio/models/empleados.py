@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, Float, Date, ForeignKey, UniqueConstraint
+    Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, UniqueConstraint, Index, func, text
 )
 from sqlalchemy.orm import relationship, validates
 from . import Base
@@ -75,9 +75,35 @@ class Empleado(Base):
 
     observacion = Column(String(255), nullable=True)
 
+    # Se actualiza en cada UPDATE; sirve de versión de la fila (ETag / Last-Modified)
+    fecha_actualizacion = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
     # Unicidad => un empleado con el mismo numero_documento no se repite en la misma org
     __table_args__ = (
         UniqueConstraint("organizacion_id", "numero_documento", name="uq_empleado_org_doc"),
+        # Listado con organizacion_id y orden por id
+        Index("ix_empleados_org_id", "organizacion_id", "id"),
+        # Sincronización: keyset por (fecha_actualizacion, id) dentro de la org
+        Index("ix_empleados_org_sync", "organizacion_id", "fecha_actualizacion", "id"),
+        # Búsqueda: lower(nombre_razon_social) ILIKE '%term%' (pg_trgm)
+        Index(
+            "ix_empleados_nombre_trgm",
+            func.lower(nombre_razon_social).label("nombre_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"nombre_lower": "gin_trgm_ops"},
+        ),
+        # Selector de vendedores (es_vendedor = true)
+        Index(
+            "ix_empleados_org_vendedor",
+            "organizacion_id",
+            "id",
+            postgresql_where=text("es_vendedor"),
+        ),
     )
 
     @validates("numero_documento")
@@ -8,7 +8,9 @@ from sqlalchemy import (
     DateTime,
     func,
     ForeignKey,
-    UniqueConstraint
+    UniqueConstraint,
+    Index,
+    text
 )
 from sqlalchemy.orm import relationship, validates
 import enum
@@ -53,7 +55,7 @@ class Organizacion(Base):
     politica_garantias = Column(String, nullable=True)
 
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
-    fecha_actualizacion = Column(DateTime(timezone=True), onupdate=func.now())
+    fecha_actualizacion = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relaciones con Numeraciones, Sucursales, etc.
     numeraciones = relationship("NumeracionTransaccion", back_populates="organizacion", cascade="all, delete-orphan")
@@ -137,6 +139,11 @@ class NumeracionTransaccion(Base):
 
     organizacion = relationship("Organizacion", back_populates="numeraciones")
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_numeraciones_transaccion_org_id", "organizacion_id", "id"),
+    )
+
     # Podrías agregar fecha_creacion, etc., si deseas
 
 class Sucursal(Base):
@@ -160,8 +167,21 @@ class Sucursal(Base):
     organizacion = relationship("Organizacion", back_populates="sucursales")
     bodegas = relationship("Bodega", back_populates="sucursal")
     cajas = relationship("Caja", back_populates="sucursal")
-    departamento = relationship("Departamento", lazy="joined")
-    ciudad = relationship("Ciudad", lazy="joined")
+    # Sin eager load: SucursalRead las completa desde el registro de referencias
+    departamento = relationship("Departamento")
+    ciudad = relationship("Ciudad")
+
+    __table_args__ = (
+        # Una sola sucursal principal por organización
+        Index(
+            "uq_sucursal_principal_org",
+            "organizacion_id",
+            unique=True,
+            postgresql_where=text("sucursal_principal"),
+        ),
+        # Listado por organización, ordenado por id
+        Index("ix_sucursales_org_id", "organizacion_id", "id"),
+    )
 
     def __repr__(self):
         return f"<Sucursal id={self.id} nombre={self.nombre}>"
@@ -183,6 +203,11 @@ class TiendaVirtual(Base):
     organizacion = relationship("Organizacion", back_populates="tiendas_virtuales")
     centro_costo = relationship("CentroCosto", back_populates="tiendas_virtuales", lazy="joined")
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_tiendas_virtuales_org_id", "organizacion_id", "id"),
+    )
+
 class Bodega(Base):
     __tablename__ = "bodegas"
 
@@ -197,6 +222,11 @@ class Bodega(Base):
     organizacion = relationship("Organizacion", back_populates="bodegas")
     sucursal = relationship("Sucursal", lazy="joined")
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_bodegas_org_id", "organizacion_id", "id"),
+    )
+
 class CentroCosto(Base):
     __tablename__ = "centros_costos"
 
@@ -220,6 +250,8 @@ class CentroCosto(Base):
     __table_args__ = (
         # Crear la restricción única combinada
         UniqueConstraint("organizacion_id", "codigo", name="uq_cc_org_codigo"),
+        # Listado por organización, ordenado por id
+        Index("ix_centros_costos_org_id", "organizacion_id", "id"),
     )
 
 class Caja(Base):
@@ -244,6 +276,11 @@ class Caja(Base):
     organizacion = relationship("Organizacion", back_populates="cajas")
     sucursal = relationship("Sucursal", lazy="joined")
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_cajas_org_id", "organizacion_id", "id"),
+    )
+
 class CuentaBancaria(Base):
     __tablename__ = "cuentas_bancarias"
 
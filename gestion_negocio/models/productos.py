@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Index, func
 from . import Base
 
 class Producto(Base):
@@ -12,3 +12,15 @@ class Producto(Base):
     stock = Column(Integer, nullable=False)
     unidad_medida = Column(String, nullable=False)
     datos_adicionales = Column(String, nullable=True)
+
+    # Se actualiza en cada UPDATE; cursor de GET /sync/productos
+    fecha_actualizacion = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_productos_sync", "fecha_actualizacion", "id"),
+    )
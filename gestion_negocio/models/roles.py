@@ -1,6 +1,6 @@
 # gestion_negocio/models/roles.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from . import Base
 from .permissions import Permission, role_permissions  # <--- Importa tu pivot y modelo Permission
@@ -30,5 +30,10 @@ class Rol(Base):
         back_populates="roles"
     )
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_roles_org_id", "organizacion_id", "id"),
+    )
+
     def __repr__(self):
         return f"<Rol id={self.id} nombre={self.nombre} nivel={self.nivel} org_id={self.organizacion_id}>"
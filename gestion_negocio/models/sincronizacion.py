@@ -0,0 +1,26 @@
+# gestion_negocio/models/sincronizacion.py
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, func
+from . import Base
+
+
+class Eliminacion(Base):
+    """
+    Lápida de un registro eliminado, para que GET /sync/{entidad} informe
+    la baja a los clientes con copia local (ver services/sync_service.py).
+    Sin FK a organizaciones: la lápida sobrevive a lo que apunta.
+    """
+    __tablename__ = "eliminaciones"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    tabla = Column(String(50), nullable=False)
+    registro_id = Column(Integer, nullable=False)
+    organizacion_id = Column(Integer, nullable=True)
+    fecha_eliminacion = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_eliminaciones_sync", "tabla", "organizacion_id", "fecha_eliminacion", "id"),
+    )
+
+    def __repr__(self):
+        return f"<Eliminacion {self.tabla}#{self.registro_id} org={self.organizacion_id}>"
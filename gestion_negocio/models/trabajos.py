@@ -0,0 +1,72 @@
+# gestion_negocio/models/trabajos.py
+
+import enum
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, SmallInteger, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from . import Base
+
+
+class EstadoTrabajo(str, enum.Enum):
+    pendiente = "pendiente"
+    en_curso = "en_curso"
+    completado = "completado"
+    fallido = "fallido"
+    cancelado = "cancelado"
+
+
+class Trabajo(Base):
+    """
+    Trabajo en segundo plano (importaciones, exportaciones, purgas, ...).
+    La cola y los workers están en core/trabajos.py.
+    """
+    __tablename__ = "trabajos"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    tipo = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    # Texto (no ENUM de PostgreSQL): agregar un estado no requiere ALTER TYPE
+    estado = Column(String(20), nullable=False, default=EstadoTrabajo.pendiente.value)
+    # A menor número => se atiende antes
+    prioridad = Column(SmallInteger, nullable=False, default=100)
+
+    organizacion_id = Column(Integer, nullable=True)
+    creado_por = Column(Integer, nullable=True)
+
+    intentos = Column(Integer, nullable=False, default=0)
+    max_intentos = Column(Integer, nullable=False, default=5)
+    # No se reclama antes de esta fecha (reintentos con backoff, programados)
+    disponible_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Arriendo: worker que lo tiene y su último latido
+    bloqueado_por = Column(String(100), nullable=True)
+    bloqueado_en = Column(DateTime(timezone=True), nullable=True)
+
+    progreso = Column(Float, nullable=True)           # 0 a 100
+    mensaje_progreso = Column(String(255), nullable=True)
+    resultado = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+
+    fecha_creacion = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    fecha_inicio = Column(DateTime(timezone=True), nullable=True)
+    fecha_fin = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Reclamo: solo los pendientes, en el orden en que se atienden
+        Index(
+            "ix_trabajos_pendientes",
+            "prioridad", "disponible_en", "id",
+            postgresql_where=text("estado = 'pendiente'"),
+        ),
+        # Límite por organización y arriendos vencidos
+        Index(
+            "ix_trabajos_en_curso",
+            "organizacion_id",
+            postgresql_where=text("estado = 'en_curso'"),
+        ),
+        # Listado de la organización, más recientes primero
+        Index("ix_trabajos_org_id", "organizacion_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<Trabajo id={self.id} tipo={self.tipo} estado={self.estado}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from . import Base
 import enum
@@ -37,6 +37,11 @@ class Usuario(Base):
     organizacion = relationship("Organizacion", back_populates="usuarios")
     logs = relationship("AuditLog", back_populates="usuario")
 
+    # Listados por organización, ordenados por id
+    __table_args__ = (
+        Index("ix_usuarios_org_id", "organizacion_id", "id"),
+    )
+
     @property
     def user_level(self) -> int:
             """
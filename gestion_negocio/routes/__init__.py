@@ -1,14 +1,4 @@
-from .auth import router as auth_router
-from .clientes import router as clientes_router
-from .proveedores import router as clientes_router
-from .empleados import router as empleados_router
-from .productos import router as productos_router
-from .ventas import router as ventas_router
-from .tesoreria import router as tesoreria_router
-from .cuentas_wallet import router as cuentas_wallet_router
-from .chats import router as chats_router
-from .organizations import router as organizations_router
-from .roles import router as roles_router
-from .users import router as users_router
-from .planes import router as planes_router
-from .test_db import router as test_db_router
\ No newline at end of file
+# gestion_negocio/routes/__init__.py
+
+# Sin imports aquí: main.py importa cada router desde su módulo y los poco
+# usados se cargan en la primera petición (core/routers_perezosos.py).
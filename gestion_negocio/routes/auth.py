@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
@@ -8,6 +9,7 @@ from schemas.auth_schemas import LoginSchema, LoginResponse
 from services.auth_service import authenticate_user, create_access_token, get_password_hash
 from services.audit_service import log_event
 from database import get_db
+from dependencies.limite_login import limitar_login
 
 # Modelos
 from models.usuarios import Usuario, EstadoUsuario
@@ -21,11 +23,13 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 @router.post("/login", response_model=LoginResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
+    _limite: None = Depends(limitar_login),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Login usando la password flow. 
     'form_data.username' = email, 'form_data.password' = password
+    Limitado por IP y por email (429 + Retry-After, sin tocar BD ni bcrypt).
     """
     # Invocas tu servicio asíncrono
     user = await authenticate_user(db, form_data.username, form_data.password)
@@ -80,7 +84,7 @@ async def register_user_auto(
         await db.refresh(rol_admin)
 
     # 3) Crear el usuario
-    hashed = get_password_hash(password)
+    hashed = await run_in_threadpool(get_password_hash, password)
     nuevo_user = Usuario(
         nombre=nombre,
         email=email,
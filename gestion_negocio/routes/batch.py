@@ -0,0 +1,183 @@
+# gestion_negocio/routes/batch.py
+
+"""
+POST /batch: varias peticiones a la API en una sola.
+
+    POST /batch
+    [
+      {"method": "GET", "path": "/clientes?page=1"},
+      {"method": "GET", "path": "/organizations/12/sucursales"},
+      {"method": "PATCH", "path": "/clientes/5", "body": {"telefono1": "3000000000"}}
+    ]
+    =>
+    [{"status": 200, "headers": {...}, "body": {...}}, ...]   (mismo orden)
+
+El token se valida una vez: cada sub-petición recibe el usuario ya
+cargado en el scope ASGI (dependencies.auth.SCOPE_USUARIO) y no lo vuelve
+a consultar. Las sub-peticiones pasan por la app completa (middlewares,
+dependencias, validación, permisos), en proceso, como máximo
+BATCH_CONCURRENCIA a la vez. Son independientes: no comparten transacción
+y el fallo de una no afecta a las demás.
+
+La conexión de la petición principal se devuelve al pool antes de
+despachar; cada sub-petición toma la suya.
+
+/batch no se anida: se rechaza la ruta ya normalizada (decodificada, sin
+barras repetidas ni final, como la enruta la app: "/%62atch" es /batch) y,
+además, cualquier /batch cuyo scope traiga la marca de sub-petición.
+
+Variables: BATCH_MAX (20), BATCH_CONCURRENCIA (4).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import List
+from urllib.parse import unquote
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import contexto
+from database import get_db
+from dependencies.auth import SCOPE_USUARIO, get_current_user
+from models.usuarios import Usuario
+from schemas.batch_schemas import SubPeticion
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX = int(os.getenv("BATCH_MAX", "20"))
+BATCH_CONCURRENCIA = int(os.getenv("BATCH_CONCURRENCIA", "4"))
+
+# Headers de la petición principal que se propagan a cada sub-petición
+_HEADERS_PROPAGADOS = {b"authorization", b"accept-language", b"user-agent"}
+# Headers de la sub-respuesta que no aplican dentro del arreglo
+_HEADERS_OMITIDOS = {"content-length", "content-encoding", "vary"}
+# Clave del scope ASGI que marca una sub-petición (índice dentro del batch)
+SCOPE_SUB_PETICION = "sub_peticion_batch"
+
+router = APIRouter(tags=["Batch"])
+
+
+def _ruta_normalizada(path: str) -> str:
+    ruta = re.sub(r"/+", "/", unquote(path.split("?", 1)[0]))
+    return ruta.rstrip("/") or "/"
+
+
+def _scope(padre: dict, sub: SubPeticion, indice: int, cuerpo: bytes, usuario: Usuario) -> dict:
+    ruta, _, query = sub.path.partition("?")
+    headers = [(k, v) for k, v in padre["headers"] if k in _HEADERS_PROPAGADOS]
+    request_id = f"{contexto.request_id_actual()}-{indice}"
+    headers.append((b"x-request-id", request_id.encode("latin-1")))
+    if cuerpo:
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(cuerpo)).encode()),
+        ]
+    return {
+        "type": "http",
+        "asgi": padre["asgi"],
+        "http_version": padre["http_version"],
+        "method": sub.method,
+        "scheme": padre["scheme"],
+        "server": padre.get("server"),
+        "client": padre.get("client"),
+        "root_path": padre.get("root_path", ""),
+        "path": unquote(ruta),
+        "raw_path": ruta.encode("latin-1", "replace"),
+        "query_string": query.encode("latin-1", "replace"),
+        "headers": headers,
+        "state": dict(padre.get("state") or {}),
+        SCOPE_USUARIO: usuario,
+        SCOPE_SUB_PETICION: indice,
+    }
+
+
+async def _despachar(app, scope: dict, cuerpo: bytes) -> tuple:
+    """Ejecuta la sub-petición en la app. Retorna (estado, headers, cuerpo)."""
+    estado, headers, partes = 500, [], []
+    pedido_enviado = False
+    terminada = asyncio.Event()
+
+    async def recibir():
+        nonlocal pedido_enviado
+        if not pedido_enviado:
+            pedido_enviado = True
+            return {"type": "http.request", "body": cuerpo, "more_body": False}
+        # Como un cliente que sigue conectado hasta recibir la respuesta
+        await terminada.wait()
+        return {"type": "http.disconnect"}
+
+    async def enviar(mensaje):
+        nonlocal estado, headers
+        if mensaje["type"] == "http.response.start":
+            estado = mensaje["status"]
+            headers = mensaje.get("headers", [])
+        elif mensaje["type"] == "http.response.body":
+            partes.append(mensaje.get("body", b""))
+
+    try:
+        await app(scope, recibir, enviar)
+    except Exception:
+        logger.exception("Error en la sub-petición %s %s", scope["method"], scope["path"])
+        estado, headers, partes = 500, [], [b'{"detail":"Error interno"}']
+        headers = [(b"content-type", b"application/json")]
+    finally:
+        terminada.set()
+    return estado, headers, b"".join(partes)
+
+
+def _item(estado: int, headers: list, cuerpo: bytes) -> bytes:
+    """Un elemento del arreglo de respuesta; el JSON de la sub-respuesta se inserta tal cual."""
+    datos = {
+        clave.decode("latin-1"): valor.decode("latin-1")
+        for clave, valor in headers
+        if clave.decode("latin-1").lower() not in _HEADERS_OMITIDOS
+    }
+    tipo = datos.get("content-type", "")
+    if not cuerpo:
+        cuerpo_json = b"null"
+    elif tipo.startswith("application/json"):
+        cuerpo_json = cuerpo
+    else:
+        cuerpo_json = json.dumps(cuerpo.decode("utf-8", "replace"), ensure_ascii=False).encode("utf-8")
+    cabecera = json.dumps({"status": estado, "headers": datos}, ensure_ascii=False, separators=(",", ":"))
+    return cabecera[:-1].encode("utf-8") + b',"body":' + cuerpo_json + b"}"
+
+
+@router.post("/batch")
+async def batch(
+    peticiones: List[SubPeticion],
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Ejecuta hasta BATCH_MAX peticiones a la API y retorna sus respuestas en
+    el mismo orden. No se permite anidar /batch.
+    """
+    if not peticiones:
+        raise HTTPException(status_code=400, detail="El batch está vacío.")
+    if len(peticiones) > BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Máximo {BATCH_MAX} peticiones por batch.")
+    if SCOPE_SUB_PETICION in request.scope or any(
+        _ruta_normalizada(sub.path) == "/batch" for sub in peticiones
+    ):
+        raise HTTPException(status_code=400, detail="No se permite /batch dentro de un batch.")
+
+    # El usuario ya está cargado: la conexión vuelve al pool mientras
+    # las sub-peticiones usan las suyas
+    await db.close()
+
+    semaforo = asyncio.Semaphore(BATCH_CONCURRENCIA)
+
+    async def ejecutar(indice: int, sub: SubPeticion) -> bytes:
+        cuerpo = b"" if sub.body is None else json.dumps(sub.body, ensure_ascii=False).encode("utf-8")
+        scope = _scope(request.scope, sub, indice, cuerpo, current_user)
+        async with semaforo:
+            return _item(*await _despachar(request.app, scope, cuerpo))
+
+    items = await asyncio.gather(*(ejecutar(i, sub) for i, sub in enumerate(peticiones)))
+    return Response(b"[" + b",".join(items) + b"]", media_type="application/json")
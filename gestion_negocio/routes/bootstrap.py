@@ -0,0 +1,105 @@
+# gestion_negocio/routes/bootstrap.py
+
+"""
+GET /bootstrap: todo lo que el frontend necesita al iniciar sesión en una
+sola respuesta (usuario, organización con su plan, rol y permisos, y las
+huellas de catálogos y ubicaciones).
+
+Las consultas se ejecutan en paralelo (asyncio.gather), cada una en su
+propia conexión del pool: la organización en la sesión de la petición
+(ya tiene conexión, la usó get_current_user) y rol y permisos en sesiones
+propias. Las huellas salen del registro en memoria, sin consultas.
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from core.fast_json import FastJSONRoute
+from database import get_db, get_sessionmaker
+from dependencies.auth import get_current_user
+from models.organizaciones import Organizacion
+from models.permissions import Permission, role_permissions
+from models.roles import Rol
+from models.usuarios import Usuario
+from schemas.bootstrap_schemas import BootstrapResponse
+from services.referencias_service import obtener_referencias
+
+router = APIRouter(tags=["Bootstrap"], route_class=FastJSONRoute)
+
+TABLAS_UBICACIONES = ("departamentos", "ciudades")
+
+
+async def _organizacion(db: AsyncSession, org_id: Optional[int]):
+    if org_id is None:
+        return None
+    stmt = (
+        select(Organizacion)
+        .options(joinedload(Organizacion.plan))
+        .where(Organizacion.id == org_id)
+    )
+    return (await db.execute(stmt)).scalars().first()
+
+
+async def _rol(rol_id: Optional[int]):
+    if rol_id is None:
+        return None
+    async with get_sessionmaker()() as db:
+        return await db.get(Rol, rol_id)
+
+
+async def _permisos(rol_id: Optional[int]) -> list:
+    if rol_id is None:
+        return []
+    stmt = (
+        select(Permission.nombre)
+        .join(role_permissions, role_permissions.c.permission_id == Permission.id)
+        .where(role_permissions.c.role_id == rol_id)
+        .order_by(Permission.nombre)
+    )
+    async with get_sessionmaker()() as db:
+        return list((await db.execute(stmt)).scalars().all())
+
+
+def _versiones_referencias() -> dict:
+    snapshot = obtener_referencias()
+    return {
+        "version": snapshot.version,
+        "cargado_en": snapshot.cargado_en,
+        "catalogos": {
+            tabla: huella for tabla, huella in snapshot.huellas.items()
+            if tabla not in TABLAS_UBICACIONES
+        },
+        "ubicaciones": {
+            tabla: huella for tabla, huella in snapshot.huellas.items()
+            if tabla in TABLAS_UBICACIONES
+        },
+    }
+
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def bootstrap(
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Datos de arranque del frontend. Reemplaza /users/me, /organizations/{id},
+    /roles/{id}/permissions y la carga de catálogos y departamentos al
+    iniciar: estos últimos se piden solo si su huella cambió.
+    """
+    organizacion, rol, permisos = await asyncio.gather(
+        _organizacion(db, current_user.organizacion_id),
+        _rol(current_user.rol_id),
+        _permisos(current_user.rol_id),
+    )
+    return {
+        "usuario": current_user,
+        "organizacion": organizacion,
+        "rol": rol,
+        "permisos": permisos,
+        "referencias": _versiones_referencias(),
+    }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from database import get_db
@@ -14,77 +14,121 @@ from models.catalogos import (
     TipoMarketing,
     RutaLogistica
 )
-# (Opcional) Importas si requieres validación de usuario
-# from dependencies.auth import get_current_user
+from dependencies.auth import role_required_at_most, ROLE_SUPERADMIN
+from services.referencias_service import recargar_referencias, respuesta_referencias
 
 router = APIRouter(prefix="/catalogos", tags=["Catálogos"])
 
 
 @router.get("/tipos-documento")
-async def obtener_tipos_documento(db: AsyncSession = Depends(get_db)):
+async def obtener_tipos_documento(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "tipos_documento")
+    if respuesta is not None:
+        return respuesta
     stmt = select(TipoDocumento)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/regimenes-tributarios")
-async def obtener_regimenes_tributarios(db: AsyncSession = Depends(get_db)):
+async def obtener_regimenes_tributarios(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "regimenes_tributarios")
+    if respuesta is not None:
+        return respuesta
     stmt = select(RegimenTributario)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/tipos-persona")
-async def obtener_tipos_persona(db: AsyncSession = Depends(get_db)):
+async def obtener_tipos_persona(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "tipos_persona")
+    if respuesta is not None:
+        return respuesta
     stmt = select(TipoPersona)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/monedas")
-async def obtener_monedas(db: AsyncSession = Depends(get_db)):
+async def obtener_monedas(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "monedas")
+    if respuesta is not None:
+        return respuesta
     stmt = select(Moneda)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/tarifas-precios")
-async def obtener_tarifas_precios(db: AsyncSession = Depends(get_db)):
+async def obtener_tarifas_precios(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "tarifas_precios")
+    if respuesta is not None:
+        return respuesta
     stmt = select(TarifaPrecios)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/actividades-economicas")
-async def obtener_actividades_economicas(db: AsyncSession = Depends(get_db)):
+async def obtener_actividades_economicas(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "actividades_economicas")
+    if respuesta is not None:
+        return respuesta
     stmt = select(ActividadEconomica)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/formas-pago")
-async def obtener_formas_pago(db: AsyncSession = Depends(get_db)):
+async def obtener_formas_pago(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "formas_pago")
+    if respuesta is not None:
+        return respuesta
     stmt = select(FormaPago)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/retenciones")
-async def obtener_retenciones(db: AsyncSession = Depends(get_db)):
+async def obtener_retenciones(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "retenciones")
+    if respuesta is not None:
+        return respuesta
     stmt = select(Retencion)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/tipos-marketing")
-async def obtener_tipos_marketing(db: AsyncSession = Depends(get_db)):
+async def obtener_tipos_marketing(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "tipos_marketing")
+    if respuesta is not None:
+        return respuesta
     stmt = select(TipoMarketing)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 @router.get("/rutas-logisticas")
-async def obtener_rutas_logisticas(db: AsyncSession = Depends(get_db)):
+async def obtener_rutas_logisticas(request: Request, db: AsyncSession = Depends(get_db)):
+    respuesta = await respuesta_referencias(request, "rutas_logisticas")
+    if respuesta is not None:
+        return respuesta
     stmt = select(RutaLogistica)
     result = await db.execute(stmt)
     return result.scalars().all()
+
+
+@router.post(
+    "/recargar-referencias",
+    dependencies=[Depends(role_required_at_most(ROLE_SUPERADMIN))]
+)
+async def recargar_registro_referencias(db: AsyncSession = Depends(get_db)):
+    """
+    Vuelve a leer catálogos y ubicaciones al registro en memoria.
+    Solo afecta al worker que atiende la petición; los demás se
+    actualizan en su siguiente refresco periódico.
+    """
+    snapshot = await recargar_referencias(db)
+    return snapshot.resumen()
@@ -1,8 +1,7 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
 from datetime import datetime
 
 from database import get_db
@@ -10,16 +9,34 @@ from schemas.clientes import (
     ClienteSchema,
     ClienteResponseSchema,
     PaginatedClientes,
+    PaginatedClientesParcial,
     ClienteUpdateSchema,
 )
 from models.clientes import Cliente
+from models.catalogos import TipoDocumento
+from models.ubicaciones import Departamento, Ciudad
 from dependencies.auth import get_current_user
+from dependencies.condicional import GetCondicional, get_condicional
 from services.dv_calculator import calc_dv_if_nit
+from services.proyeccion_service import Proyeccion, RelacionProyectable
+from services.escritura_service import insertar_returning, actualizar_returning
+from services.integridad_service import traducir_integridad
+from services.common_validations import validar_referencias, validar_referencias_parcial
+from services.sync_service import registrar_cambio_organizacion
+from services.ids_service import (
+    filtro_organizacion,
+    filtros_ids,
+    ordenar_por_ids,
+    pagina_unica,
+    parsear_ids,
+)
+from core.fast_json import FastJSONRoute, serializar_json
 
 router = APIRouter(
     prefix="/clientes",
     tags=["Clientes"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 def normalize_text(text: str) -> str:
@@ -29,6 +46,35 @@ def normalize_text(text: str) -> str:
                .replace("ó", "o")
                .replace("ú", "u"))
 
+# Campos que se pueden pedir con fields= / view= en el listado
+PROYECCION_CLIENTES = Proyeccion(
+    Cliente,
+    relaciones={
+        "tipo_documento": RelacionProyectable(
+            TipoDocumento, Cliente.tipo_documento_id, ("id", "nombre", "abreviatura")
+        ),
+        "departamento": RelacionProyectable(
+            Departamento, Cliente.departamento_id, ("id", "nombre")
+        ),
+        "ciudad": RelacionProyectable(Ciudad, Cliente.ciudad_id, ("id", "nombre")),
+    },
+    vistas={
+        # Columnas que muestra la grilla de clientes
+        "summary": [
+            "nombre_razon_social",
+            "tipo_documento",
+            "numero_documento",
+            "ciudad",
+            "direccion",
+            "email",
+            "telefono1",
+            "telefono2",
+            "celular",
+            "whatsapp",
+        ],
+    },
+)
+
 @router.post("/", response_model=dict)
 async def crear_cliente(
     cliente: ClienteSchema,
@@ -42,57 +88,47 @@ async def crear_cliente(
     cliente.nombre_razon_social = cliente.nombre_razon_social.upper()
     cliente.numero_documento = normalize_text(cliente.numero_documento).strip()
 
-    # Verificar duplicado (misma organización)
-    stmt_duplicado = select(Cliente).where(
-        Cliente.organizacion_id == cliente.organizacion_id,
-        Cliente.numero_documento == cliente.numero_documento
-    )
-    result = await db.execute(stmt_duplicado)
-    existe = result.scalars().first()
-    if existe:
-        raise HTTPException(
-            status_code=400,
-            detail="El número de identificación ya existe para esta organización."
-        )
+    # Todas las FKs (catálogos, sucursal y vendedor de la misma org) de una vez
+    await validar_referencias(db, Cliente, cliente.dict(), cliente.organizacion_id)
 
     # Calcular dígito de verificación si es NIT
     dv_calculado = calc_dv_if_nit(cliente.tipo_documento_id, cliente.numero_documento)
 
-    # Crear instancia
-    nuevo_cliente = Cliente(
-        tipo_documento_id=cliente.tipo_documento_id,
-        organizacion_id=cliente.organizacion_id,
-        dv=dv_calculado,
-        numero_documento=cliente.numero_documento,
-        nombre_razon_social=cliente.nombre_razon_social,
-        email=cliente.email,
-        pagina_web=cliente.pagina_web,
-        departamento_id=cliente.departamento_id,
-        ciudad_id=cliente.ciudad_id,
-        direccion=cliente.direccion,
-        telefono1=cliente.telefono1,
-        telefono2=cliente.telefono2,
-        celular=cliente.celular,
-        whatsapp=cliente.whatsapp,
-        tipos_persona_id=cliente.tipos_persona_id,
-        regimen_tributario_id=cliente.regimen_tributario_id,
-        moneda_principal_id=cliente.moneda_principal_id,
-        tarifa_precios_id=cliente.tarifa_precios_id,
-        actividad_economica_id=cliente.actividad_economica_id,
-        forma_pago_id=cliente.forma_pago_id,
-        retencion_id=cliente.retencion_id,
-        permitir_venta=cliente.permitir_venta,
-        descuento=cliente.descuento,
-        cupo_credito=cliente.cupo_credito,
-        tipo_marketing_id=cliente.tipo_marketing_id,
-        sucursal_id=cliente.sucursal_id,
-        ruta_logistica_id=cliente.ruta_logistica_id,
-        vendedor_id=cliente.vendedor_id,
-        observacion=cliente.observacion,
-    )
-    db.add(nuevo_cliente)
-    await db.commit()
-    await db.refresh(nuevo_cliente)
+    # Crear (INSERT ... RETURNING). Un documento duplicado en la organización
+    # lo rechaza uq_cliente_org_doc => 400.
+    async with traducir_integridad(db):
+        nuevo_cliente = await insertar_returning(db, Cliente, dict(
+            tipo_documento_id=cliente.tipo_documento_id,
+            organizacion_id=cliente.organizacion_id,
+            dv=dv_calculado,
+            numero_documento=cliente.numero_documento,
+            nombre_razon_social=cliente.nombre_razon_social,
+            email=cliente.email,
+            pagina_web=cliente.pagina_web,
+            departamento_id=cliente.departamento_id,
+            ciudad_id=cliente.ciudad_id,
+            direccion=cliente.direccion,
+            telefono1=cliente.telefono1,
+            telefono2=cliente.telefono2,
+            celular=cliente.celular,
+            whatsapp=cliente.whatsapp,
+            tipos_persona_id=cliente.tipos_persona_id,
+            regimen_tributario_id=cliente.regimen_tributario_id,
+            moneda_principal_id=cliente.moneda_principal_id,
+            tarifa_precios_id=cliente.tarifa_precios_id,
+            actividad_economica_id=cliente.actividad_economica_id,
+            forma_pago_id=cliente.forma_pago_id,
+            retencion_id=cliente.retencion_id,
+            permitir_venta=cliente.permitir_venta,
+            descuento=cliente.descuento,
+            cupo_credito=cliente.cupo_credito,
+            tipo_marketing_id=cliente.tipo_marketing_id,
+            sucursal_id=cliente.sucursal_id,
+            ruta_logistica_id=cliente.ruta_logistica_id,
+            vendedor_id=cliente.vendedor_id,
+            observacion=cliente.observacion,
+        ))
+        await db.commit()
 
     return {
         "message": "Cliente creado con éxito",
@@ -105,32 +141,63 @@ async def obtener_clientes(
     db: AsyncSession = Depends(get_db),
     search: Optional[str] = Query(None),
     page: int = 1,
-    page_size: int = 10
+    page_size: int = 10,
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a devolver separados por coma (ej. 'nombre_razon_social,ciudad')"
+    ),
+    view: Optional[str] = Query(None, description="Vista predefinida: 'summary'"),
+    ids: Optional[str] = Query(
+        None,
+        description="IDs separados por coma (ej. '3,1,2'): esos clientes, en ese orden"
+    ),
+    current_user=Depends(get_current_user)
 ):
     """
-    Paginar clientes con filtrado por 'search' (sobre nombre_razon_social).
+    Paginar los clientes de la organización del usuario (superadmin: todos),
+    con filtrado por 'search' (sobre nombre_razon_social).
+
+    Con 'fields' o 'view' se consulta solo esas columnas (select por columnas
+    y joins únicamente de las relaciones pedidas) y cada item de 'data' trae
+    solo esos campos, con la estructura de PaginatedClientesParcial.
+
+    Con 'ids' se devuelven esos clientes de la organización del usuario, en
+    el orden pedido y en una sola página ('search' y la paginación no aplican).
     """
-    # Si 'ClienteResponseSchema' accede a 'tipo_documento', debemos cargarlo aquí.
-    base_stmt = (
-        select(Cliente)
-        .options(
-            selectinload(Cliente.departamento),
-            selectinload(Cliente.ciudad),
-            selectinload(Cliente.tipo_documento),  # <-- Se incluye para evitar MissingGreenlet
-            # Si tu modelo tiene relación con 'organizacion', 'regimen_tributario', etc.
-            # y lo usas en el esquema, agrégalo también:
-            # selectinload(Cliente.organizacion),
-            # selectinload(Cliente.regimen_tributario),
-        )
-    )
+    try:
+        campos = PROYECCION_CLIENTES.resolver_campos(fields, view)
+        lista_ids = parsear_ids(ids) if ids is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    if lista_ids is not None:
+        filtros_por_ids = filtros_ids(Cliente, lista_ids, current_user)
+        if campos is not None:
+            result_proyeccion = await db.execute(
+                PROYECCION_CLIENTES.construir_select(campos).where(*filtros_por_ids)
+            )
+            filas = PROYECCION_CLIENTES.armar_filas(result_proyeccion.all(), campos)
+            return Response(
+                serializar_json(PaginatedClientesParcial, pagina_unica(ordenar_por_ids(filas, lista_ids))),
+                media_type="application/json"
+            )
+        result_ids = await db.execute(select(Cliente).where(*filtros_por_ids))
+        return pagina_unica(ordenar_por_ids(result_ids.scalars().all(), lista_ids))
+
+    # tipo_documento / departamento / ciudad se completan desde el registro
+    # de referencias al serializar (ver ReferenciasMixin), sin joins.
+    base_stmt = select(Cliente)
+
+    # Solo la organización del usuario (índice ix_clientes_org_id)
+    filtros = filtro_organizacion(Cliente, current_user)
     if search:
         normalized_search = normalize_text(search).strip().lower()
         terms = normalized_search.split()
         for term in terms:
-            base_stmt = base_stmt.where(
+            filtros.append(
                 func.lower(Cliente.nombre_razon_social).ilike(f"%{term}%")
             )
+    base_stmt = base_stmt.where(*filtros)
 
     # Contar total de registros con la misma query base
     count_stmt = base_stmt.with_only_columns(func.count(Cliente.id))
@@ -143,16 +210,35 @@ async def obtener_clientes(
         page = total_paginas
 
     offset = (page - 1) * page_size
-    stmt_paginado = base_stmt.offset(offset).limit(page_size)
+
+    if campos is not None:
+        stmt_proyeccion = (
+            PROYECCION_CLIENTES.construir_select(campos)
+            .where(*filtros)
+            .order_by(Cliente.id)
+            .offset(offset)
+            .limit(page_size)
+        )
+        result_proyeccion = await db.execute(stmt_proyeccion)
+        contenido = {
+            "data": PROYECCION_CLIENTES.armar_filas(result_proyeccion.all(), campos),
+            "page": page,
+            "total_paginas": total_paginas,
+            "total_registros": total_registros,
+        }
+        return Response(
+            serializar_json(PaginatedClientesParcial, contenido),
+            media_type="application/json"
+        )
+
+    stmt_paginado = base_stmt.order_by(Cliente.id).offset(offset).limit(page_size)
 
     result_clientes = await db.execute(stmt_paginado)
     clientes_db = result_clientes.scalars().all()
 
-    # Convertir a Pydantic (asegúrate de que el esquema tenga from_attributes = True o orm_mode)
-    data = [ClienteResponseSchema.from_orm(c) for c in clientes_db]
-
+    # FastJSONRoute valida (from_attributes) y serializa una sola vez
     return {
-        "data": data,
+        "data": clientes_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros,
@@ -162,26 +248,20 @@ async def obtener_clientes(
 async def obtener_cliente(
     cliente_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    condicional: GetCondicional = Depends(get_condicional(Cliente, "cliente_id", referencias=True))
 ):
     """
     Obtiene un cliente por su ID.
+    Soporta If-None-Match / If-Modified-Since (responde 304 si no cambió).
     """
-    # Cargar también las relaciones en la consulta detallada
-    stmt = (
-        select(Cliente)
-        .where(Cliente.id == cliente_id)
-        .options(
-            selectinload(Cliente.departamento),
-            selectinload(Cliente.ciudad),
-            selectinload(Cliente.tipo_documento),  # <-- Igualmente aquí si la necesitas
-        )
-    )
+    stmt = select(Cliente).where(Cliente.id == cliente_id)
     result = await db.execute(stmt)
     cliente_db = result.scalars().first()
     if not cliente_db:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
 
+    condicional.marcar(cliente_db)
     return cliente_db
 
 @router.patch("/{cliente_id}", response_model=ClienteResponseSchema)
@@ -203,24 +283,11 @@ async def actualizar_parcial_cliente(
 
     campos = cliente_data.dict(exclude_unset=True)
 
-    # 2) Validación si se cambia el número de documento
+    await validar_referencias_parcial(db, Cliente, campos, cliente_db)
+
+    # 2) Normalizar el número de documento (la unicidad la valida uq_cliente_org_doc)
     if "numero_documento" in campos:
-        doc_nuevo = normalize_text(campos["numero_documento"]).strip()
-        if doc_nuevo != cliente_db.numero_documento:
-            org_id = campos.get("organizacion_id", cliente_db.organizacion_id)
-            stmt_dup = select(Cliente).where(
-                Cliente.organizacion_id == org_id,
-                Cliente.numero_documento == doc_nuevo,
-                Cliente.id != cliente_db.id
-            )
-            check_dup = await db.execute(stmt_dup)
-            existe = check_dup.scalars().first()
-            if existe:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Ya existe ese documento en la organización."
-                )
-            campos["numero_documento"] = doc_nuevo
+        campos["numero_documento"] = normalize_text(campos["numero_documento"]).strip()
 
     # 3) Calcular DV si cambia tipo_doc o numero_documento
     if "tipo_documento_id" in campos or "numero_documento" in campos:
@@ -228,37 +295,24 @@ async def actualizar_parcial_cliente(
         ndoc = campos.get("numero_documento", cliente_db.numero_documento)
         dv = calc_dv_if_nit(tdoc, ndoc)
         if dv:
-            cliente_db.dv = dv
-
-    # 4) Actualizar los campos en memoria
-    for key, value in campos.items():
-        if key == "nombre_razon_social" and value:
-            value = normalize_text(value).upper()
-        setattr(cliente_db, key, value)
+            campos["dv"] = dv
 
-    await db.commit()
-
-    # 5) SEGUNDA CONSULTA (carga de relaciones con selectinload / joinedload)
-    #    para devolver el objeto fresco con todos sus campos y relaciones.
-    stmt2 = (
-        select(Cliente)
-        .where(Cliente.id == cliente_id)
-        .options(
-            # Asegúrate de cargar TODAS las relaciones que tu
-            # esquema ClienteResponseSchema requiera, por ejemplo:
-            selectinload(Cliente.departamento),
-            selectinload(Cliente.ciudad),
-            selectinload(Cliente.tipo_documento),
-        )
-    )
-    result2 = await db.execute(stmt2)
-    cliente_fresco = result2.scalars().first()
+    if campos.get("nombre_razon_social"):
+        campos["nombre_razon_social"] = normalize_text(campos["nombre_razon_social"]).upper()
 
-    if not cliente_fresco:
-        # (En teoría no debería ocurrir, pero por seguridad)
-        raise HTTPException(status_code=404, detail="Cliente no encontrado tras la actualización.")
+    # 4) UPDATE ... RETURNING: la fila actualizada vuelve en la misma sentencia
+    #    (las relaciones de referencia las completa el registro en memoria).
+    #    Si cambia de organización, la anterior la recibe como baja en /sync.
+    registrar_cambio_organizacion(db, cliente_db, campos.get("organizacion_id"))
+    async with traducir_integridad(
+        db, {"uq_cliente_org_doc": "Ya existe ese documento en la organización."}
+    ):
+        cliente_fresco = await actualizar_returning(db, Cliente, [Cliente.id == cliente_id], campos)
+        if not cliente_fresco:
+            # (En teoría no debería ocurrir, pero por seguridad)
+            raise HTTPException(status_code=404, detail="Cliente no encontrado tras la actualización.")
+        await db.commit()
 
-    # 6) Retornar el cliente con todas las relaciones ya cargadas
     return cliente_fresco
 
 @router.delete("/{cliente_id}")
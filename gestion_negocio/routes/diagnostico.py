@@ -0,0 +1,55 @@
+# gestion_negocio/routes/diagnostico.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from core import consultas_lentas
+from core.monitor_loop import monitor as monitor_loop
+from dependencies.auth import role_required_at_most, ROLE_SUPERADMIN
+
+router = APIRouter(
+    prefix="/diagnostico",
+    tags=["Diagnóstico"],
+    dependencies=[Depends(role_required_at_most(ROLE_SUPERADMIN))]
+)
+
+
+@router.get("/consultas-lentas")
+async def listar_consultas_lentas(
+    limite: Optional[int] = Query(None, ge=1, description="Cantidad máxima (las más recientes primero)")
+):
+    """
+    Últimas consultas que superaron CONSULTAS_LENTAS_MS, con la forma de sus
+    parámetros, la ruta, la organización y el plan (EXPLAIN) de cada una.
+    Solo superadmin. Las entradas son del worker que atiende la petición.
+    """
+    registro = consultas_lentas.registro
+    if registro is None:
+        return {"activo": False, "umbral_ms": None, "consultas": []}
+    return {
+        "activo": True,
+        "umbral_ms": consultas_lentas.CONSULTAS_LENTAS_MS,
+        "consultas": registro.ultimas(limite),
+    }
+
+
+@router.get("/bloqueos")
+async def listar_bloqueos(
+    limite: Optional[int] = Query(None, ge=1, description="Cantidad máxima (los más recientes primero)")
+):
+    """
+    Percentiles del retraso del event loop y los últimos bloqueos mayores a
+    LOOP_BLOQUEO_MS, con la pila de la llamada que bloqueaba. Solo superadmin.
+    """
+    return monitor_loop.resumen(limite)
+
+
+@router.delete("/consultas-lentas")
+async def limpiar_consultas_lentas():
+    """
+    Vacía el buffer de consultas lentas de este worker.
+    """
+    if consultas_lentas.registro is not None:
+        consultas_lentas.registro.limpiar()
+    return {"message": "Registro de consultas lentas vaciado"}
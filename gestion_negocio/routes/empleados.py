@@ -4,7 +4,6 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
 
 from database import get_db
 from models.empleados import Empleado
@@ -15,13 +14,27 @@ from schemas.empleados import (
     PaginatedEmpleados
 )
 from dependencies.auth import get_current_user
+from dependencies.condicional import GetCondicional, get_condicional
 from services.dv_calculator import calc_dv_if_nit
+from services.escritura_service import insertar_returning, actualizar_returning
+from services.integridad_service import traducir_integridad
+from services.common_validations import validar_referencias, validar_referencias_parcial
+from services.sync_service import registrar_cambio_organizacion
+from services.ids_service import (
+    filtro_organizacion,
+    filtros_ids,
+    ordenar_por_ids,
+    pagina_unica,
+    parsear_ids,
+)
+from core.fast_json import FastJSONRoute
 
 
 router = APIRouter(
     prefix="/empleados",
     tags=["Empleados"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 def normalize_text(text: str) -> str:
@@ -42,21 +55,9 @@ async def crear_empleado(
     """
     Crea un empleado con todos los campos obligatorios que define EmpleadoCreateUpdateSchema.
     """
-    # 1) Verificar si (org_id, numero_documento) ya existe
-    stmt_duplicado = (
-        select(Empleado)
-        .where(
-            Empleado.organizacion_id == empleado_in.organizacion_id,
-            Empleado.numero_documento == empleado_in.numero_documento
-        )
-    )
-    result_duplicado = await db.execute(stmt_duplicado)
-    duplicado = result_duplicado.scalars().first()
-    if duplicado:
-        raise HTTPException(
-            status_code=400,
-            detail="Documento duplicado en la misma organización."
-        )
+    # 1) (org_id, numero_documento) duplicado => lo rechaza uq_empleado_org_doc.
+    #    Las FKs (catálogos y sucursal de la misma org) se validan todas juntas.
+    await validar_referencias(db, Empleado, empleado_in.dict(), empleado_in.organizacion_id)
 
     # 2) Normalizar + mayúsculas
     empleado_in.nombre_razon_social = empleado_in.nombre_razon_social.upper()
@@ -68,38 +69,37 @@ async def crear_empleado(
         empleado_in.numero_documento
     )
 
-    # 4) Crear instancia
-    nuevo = Empleado(
-        organizacion_id=empleado_in.organizacion_id,
-        tipo_documento_id=empleado_in.tipo_documento_id,
-        dv=dv_calc,
-        numero_documento=empleado_in.numero_documento,
-        nombre_razon_social=empleado_in.nombre_razon_social,
-        email=empleado_in.email,
-        telefono1=empleado_in.telefono1,
-        telefono2=empleado_in.telefono2,
-        celular=empleado_in.celular,
-        whatsapp=empleado_in.whatsapp,
-        tipos_persona_id=empleado_in.tipos_persona_id,
-        regimen_tributario_id=empleado_in.regimen_tributario_id,
-        moneda_principal_id=empleado_in.moneda_principal_id,
-        actividad_economica_id=empleado_in.actividad_economica_id,
-        forma_pago_id=empleado_in.forma_pago_id,
-        retencion_id=empleado_in.retencion_id,
-        departamento_id=empleado_in.departamento_id,
-        ciudad_id=empleado_in.ciudad_id,
-        direccion=empleado_in.direccion,
-        sucursal_id=empleado_in.sucursal_id,
-        cargo=empleado_in.cargo,
-        fecha_nacimiento=empleado_in.fecha_nacimiento,
-        fecha_ingreso=empleado_in.fecha_ingreso,
-        activo=empleado_in.activo,
-        es_vendedor=empleado_in.es_vendedor,
-        observacion=empleado_in.observacion
-    )
-    db.add(nuevo)
-    await db.commit()
-    await db.refresh(nuevo)
+    # 4) Crear (INSERT ... RETURNING)
+    async with traducir_integridad(db):
+        nuevo = await insertar_returning(db, Empleado, dict(
+            organizacion_id=empleado_in.organizacion_id,
+            tipo_documento_id=empleado_in.tipo_documento_id,
+            dv=dv_calc,
+            numero_documento=empleado_in.numero_documento,
+            nombre_razon_social=empleado_in.nombre_razon_social,
+            email=empleado_in.email,
+            telefono1=empleado_in.telefono1,
+            telefono2=empleado_in.telefono2,
+            celular=empleado_in.celular,
+            whatsapp=empleado_in.whatsapp,
+            tipos_persona_id=empleado_in.tipos_persona_id,
+            regimen_tributario_id=empleado_in.regimen_tributario_id,
+            moneda_principal_id=empleado_in.moneda_principal_id,
+            actividad_economica_id=empleado_in.actividad_economica_id,
+            forma_pago_id=empleado_in.forma_pago_id,
+            retencion_id=empleado_in.retencion_id,
+            departamento_id=empleado_in.departamento_id,
+            ciudad_id=empleado_in.ciudad_id,
+            direccion=empleado_in.direccion,
+            sucursal_id=empleado_in.sucursal_id,
+            cargo=empleado_in.cargo,
+            fecha_nacimiento=empleado_in.fecha_nacimiento,
+            fecha_ingreso=empleado_in.fecha_ingreso,
+            activo=empleado_in.activo,
+            es_vendedor=empleado_in.es_vendedor,
+            observacion=empleado_in.observacion
+        ))
+        await db.commit()
 
     return {
         "message": "Empleado creado con éxito",
@@ -116,19 +116,31 @@ async def obtener_empleados(
     search: Optional[str] = None,
     es_vendedor: Optional[bool] = None,
     page: int = 1,
-    page_size: int = 10
+    page_size: int = 10,
+    ids: Optional[str] = Query(
+        None,
+        description="IDs separados por coma (ej. '3,1,2'): esos empleados, en ese orden"
+    ),
+    current_user=Depends(get_current_user)
 ):
     """
-    Lista paginada de empleados, con filtro por 'search' y 'es_vendedor'.
+    Lista paginada de los empleados de la organización del usuario
+    (superadmin: todos), con filtro por 'search' y 'es_vendedor'.
+    Con 'ids' se devuelven esos empleados de la organización del usuario,
+    en el orden pedido y en una sola página.
     """
-    stmt_base = (
-        select(Empleado)
-        .options(
-            selectinload(Empleado.tipo_documento),
-            selectinload(Empleado.departamento),
-            selectinload(Empleado.ciudad),
+    if ids is not None:
+        try:
+            lista_ids = parsear_ids(ids)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        result_ids = await db.execute(
+            select(Empleado).where(*filtros_ids(Empleado, lista_ids, current_user))
         )
-    )
+        return pagina_unica(ordenar_por_ids(result_ids.scalars().all(), lista_ids))
+
+    # Solo la organización del usuario (índice ix_empleados_org_id)
+    stmt_base = select(Empleado).where(*filtro_organizacion(Empleado, current_user))
 
     # Filtro por es_vendedor
     if es_vendedor is not None:
@@ -153,15 +165,13 @@ async def obtener_empleados(
         page = total_paginas
 
     offset = (page - 1) * page_size
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Empleado.id).offset(offset).limit(page_size)
 
     result_empleados = await db.execute(stmt_paginado)
     empleados_db = result_empleados.scalars().all()
 
-    data = [EmpleadoResponseSchema.from_orm(e) for e in empleados_db]
-
     return {
-        "data": data,
+        "data": empleados_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -173,24 +183,19 @@ async def obtener_empleados(
 @router.get("/{empleado_id}", response_model=EmpleadoResponseSchema)
 async def obtener_empleado(
     empleado_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    condicional: GetCondicional = Depends(get_condicional(Empleado, "empleado_id", referencias=True))
 ):
     """
     Obtiene un empleado por su ID
+    Soporta If-None-Match / If-Modified-Since (responde 304 si no cambió).
     """
-    stmt = (
-        select(Empleado)
-        .where(Empleado.id == empleado_id)
-        .options(
-            selectinload(Empleado.tipo_documento),
-            selectinload(Empleado.departamento),
-            selectinload(Empleado.ciudad),
-        )
-    )
+    stmt = select(Empleado).where(Empleado.id == empleado_id)
     result = await db.execute(stmt)
     emp = result.scalars().first()
     if not emp:
         raise HTTPException(status_code=404, detail="Empleado no encontrado")
+    condicional.marcar(emp)
     return emp
 
 # ------------------------------------------------------------------------------
@@ -212,72 +217,50 @@ async def actualizar_empleado_completo(
     if not emp_db:
         raise HTTPException(status_code=404, detail="Empleado no encontrado")
 
-    # 2) Validar duplicado de documento (si lo cambian)
-    if emp_in.numero_documento != emp_db.numero_documento:
-        stmt_dup = select(Empleado).where(
-            Empleado.organizacion_id == emp_in.organizacion_id,
-            Empleado.numero_documento == emp_in.numero_documento,
-            Empleado.id != empleado_id
-        )
-        result_dup = await db.execute(stmt_dup)
-        duplicado = result_dup.scalars().first()
-        if duplicado:
-            raise HTTPException(
-                status_code=400,
-                detail="Documento duplicado en la misma organización."
-            )
+    # 2) Documento duplicado => lo rechaza uq_empleado_org_doc al actualizar.
+    #    Las FKs se validan todas juntas.
+    await validar_referencias(db, Empleado, emp_in.dict(), emp_in.organizacion_id)
 
     # 3) Normalizar + DV
     emp_in.nombre_razon_social = emp_in.nombre_razon_social.upper()
     emp_in.numero_documento = normalize_text(emp_in.numero_documento).strip()
     dv_calc = calc_dv_if_nit(emp_in.tipo_documento_id, emp_in.numero_documento)
 
-    # 4) Asignar
-    emp_db.organizacion_id = emp_in.organizacion_id
-    emp_db.tipo_documento_id = emp_in.tipo_documento_id
-    emp_db.dv = dv_calc
-    emp_db.numero_documento = emp_in.numero_documento
-    emp_db.nombre_razon_social = emp_in.nombre_razon_social
-    emp_db.email = emp_in.email
-    emp_db.telefono1 = emp_in.telefono1
-    emp_db.telefono2 = emp_in.telefono2
-    emp_db.celular = emp_in.celular
-    emp_db.whatsapp = emp_in.whatsapp
-    emp_db.tipos_persona_id = emp_in.tipos_persona_id
-    emp_db.regimen_tributario_id = emp_in.regimen_tributario_id
-    emp_db.moneda_principal_id = emp_in.moneda_principal_id
-    emp_db.actividad_economica_id = emp_in.actividad_economica_id
-    emp_db.forma_pago_id = emp_in.forma_pago_id
-    emp_db.retencion_id = emp_in.retencion_id
-    emp_db.departamento_id = emp_in.departamento_id
-    emp_db.ciudad_id = emp_in.ciudad_id
-    emp_db.direccion = emp_in.direccion
-    emp_db.sucursal_id = emp_in.sucursal_id
-    emp_db.cargo = emp_in.cargo
-    emp_db.fecha_nacimiento = emp_in.fecha_nacimiento
-    emp_db.fecha_ingreso = emp_in.fecha_ingreso
-    emp_db.activo = emp_in.activo
-    emp_db.es_vendedor = emp_in.es_vendedor
-    emp_db.observacion = emp_in.observacion
-
-    # 5) Guardar
-    await db.commit()
-
-    # 6) Realizar segunda consulta para recargar con relaciones
-    stmt2 = (
-        select(Empleado)
-        .where(Empleado.id == empleado_id)
-        .options(
-            selectinload(Empleado.tipo_documento),
-            selectinload(Empleado.departamento),
-            selectinload(Empleado.ciudad),
-        )
-    )
-    result2 = await db.execute(stmt2)
-    emp_recargado = result2.scalars().first()
-
-    if not emp_recargado:
-        raise HTTPException(status_code=404, detail="Empleado no encontrado tras actualizar.")
+    # 4) Asignar y guardar (UPDATE ... RETURNING, sin segunda consulta).
+    #    Si cambia de organización, la anterior la recibe como baja en /sync.
+    registrar_cambio_organizacion(db, emp_db, emp_in.organizacion_id)
+    async with traducir_integridad(db):
+        emp_recargado = await actualizar_returning(db, Empleado, [Empleado.id == empleado_id], dict(
+            organizacion_id=emp_in.organizacion_id,
+            tipo_documento_id=emp_in.tipo_documento_id,
+            dv=dv_calc,
+            numero_documento=emp_in.numero_documento,
+            nombre_razon_social=emp_in.nombre_razon_social,
+            email=emp_in.email,
+            telefono1=emp_in.telefono1,
+            telefono2=emp_in.telefono2,
+            celular=emp_in.celular,
+            whatsapp=emp_in.whatsapp,
+            tipos_persona_id=emp_in.tipos_persona_id,
+            regimen_tributario_id=emp_in.regimen_tributario_id,
+            moneda_principal_id=emp_in.moneda_principal_id,
+            actividad_economica_id=emp_in.actividad_economica_id,
+            forma_pago_id=emp_in.forma_pago_id,
+            retencion_id=emp_in.retencion_id,
+            departamento_id=emp_in.departamento_id,
+            ciudad_id=emp_in.ciudad_id,
+            direccion=emp_in.direccion,
+            sucursal_id=emp_in.sucursal_id,
+            cargo=emp_in.cargo,
+            fecha_nacimiento=emp_in.fecha_nacimiento,
+            fecha_ingreso=emp_in.fecha_ingreso,
+            activo=emp_in.activo,
+            es_vendedor=emp_in.es_vendedor,
+            observacion=emp_in.observacion
+        ))
+        if not emp_recargado:
+            raise HTTPException(status_code=404, detail="Empleado no encontrado tras actualizar.")
+        await db.commit()
 
     return emp_recargado
 
@@ -302,24 +285,11 @@ async def actualizar_empleado_parcial(
 
     campos = emp_patch.dict(exclude_unset=True)
 
-    # 2) Validar si cambia numero_documento
+    await validar_referencias_parcial(db, Empleado, campos, emp_db)
+
+    # 2) Normalizar numero_documento (la unicidad la valida uq_empleado_org_doc)
     if "numero_documento" in campos:
-        numero_nuevo = normalize_text(campos["numero_documento"]).strip()
-        if numero_nuevo != emp_db.numero_documento:
-            org_id = campos.get("organizacion_id", emp_db.organizacion_id)
-            stmt_dup = select(Empleado).where(
-                Empleado.organizacion_id == org_id,
-                Empleado.numero_documento == numero_nuevo,
-                Empleado.id != emp_db.id
-            )
-            dup_result = await db.execute(stmt_dup)
-            duplicado = dup_result.scalars().first()
-            if duplicado:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Documento duplicado en la misma organización."
-                )
-            campos["numero_documento"] = numero_nuevo
+        campos["numero_documento"] = normalize_text(campos["numero_documento"]).strip()
 
     # 3) Si cambia nombre_razon_social => convertir a mayúsculas
     if "nombre_razon_social" in campos and campos["nombre_razon_social"]:
@@ -331,33 +301,19 @@ async def actualizar_empleado_parcial(
         ndoc = campos.get("numero_documento", emp_db.numero_documento)
         dv_calc = calc_dv_if_nit(tdoc, ndoc)
         if dv_calc:
-            emp_db.dv = dv_calc
-
-    # 5) Asignar campos en el objeto
-    for key, value in campos.items():
-        setattr(emp_db, key, value)
-
-    await db.commit()
-
-    # 6) Hacemos UNA SEGUNDA CONSULTA para recargar con relaciones (evitando lazy-load)
-    stmt2 = (
-        select(Empleado)
-        .where(Empleado.id == empleado_id)
-        .options(
-            selectinload(Empleado.tipo_documento),
-            # Si tu EmpleadoResponseSchema también incluye otros:
-            selectinload(Empleado.departamento),
-            selectinload(Empleado.ciudad),
-        )
-    )
-    result2 = await db.execute(stmt2)
-    emp_recargado = result2.scalars().first()
-
-    if not emp_recargado:
-        # Muy poco probable, pero por seguridad
-        raise HTTPException(status_code=404, detail="Empleado no encontrado tras actualizar.")
-
-    # 7) Retornamos el objeto fresco con sus relaciones ya cargadas
+            campos["dv"] = dv_calc
+
+    # 5) UPDATE ... RETURNING: la fila fresca vuelve en la misma sentencia.
+    #    Si cambia de organización, la anterior la recibe como baja en /sync.
+    registrar_cambio_organizacion(db, emp_db, campos.get("organizacion_id"))
+    async with traducir_integridad(db):
+        emp_recargado = await actualizar_returning(db, Empleado, [Empleado.id == empleado_id], campos)
+        if not emp_recargado:
+            # Muy poco probable, pero por seguridad
+            raise HTTPException(status_code=404, detail="Empleado no encontrado tras actualizar.")
+        await db.commit()
+
+    # 6) Retornamos el objeto fresco (referencias desde el registro en memoria)
     return emp_recargado
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,50 @@
+# gestion_negocio/routes/metricas.py
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import logs
+from core.metricas import registro
+from core.monitor_loop import monitor as monitor_loop
+from database import estado_pool, get_db
+from dependencies.auth import ROLE_SUPERADMIN, get_current_user
+
+# Token del scraper de Prometheus ("Authorization: Bearer <token>"). Sin él,
+# /metrics solo responde a un superadmin autenticado con su JWT.
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN", "")
+
+router = APIRouter(tags=["Métricas"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def exportar_metricas(
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Métricas del proceso en formato de exposición de Prometheus.
+    Exige el token de METRICAS_TOKEN o un superadmin autenticado.
+    """
+    # En bytes: compare_digest con str no acepta caracteres fuera de ASCII
+    if not (METRICAS_TOKEN and secrets.compare_digest(
+        (authorization or "").encode("utf-8"), f"Bearer {METRICAS_TOKEN}".encode("utf-8")
+    )):
+        esquema, _, token = (authorization or "").partition(" ")
+        if esquema.lower() != "bearer" or not token:
+            raise HTTPException(status_code=401, detail="No autorizado")
+        usuario = await get_current_user(request, token, db)
+        if usuario.rol_id != ROLE_SUPERADMIN:
+            raise HTTPException(status_code=403, detail="No autorizado")
+    return PlainTextResponse(
+        registro.exportar(estado_pool()) + monitor_loop.exportar()
+        + "# HELP logs_descartados_total Registros de log descartados con la cola llena.\n"
+        + "# TYPE logs_descartados_total counter\n"
+        + f"logs_descartados_total {logs.descartados()}\n",
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -28,7 +28,8 @@ from schemas.org_schemas import (
     CentroCostoCreate, CentroCostoRead, PaginatedCentrosCostos,
     PaginatedSucursales, SucursalUpdate, PaginatedBodegas,
     NumeracionTransaccionBase, NumeracionTransaccionCreate,
-    NumeracionTransaccionRead, PaginatedNumeraciones
+    NumeracionTransaccionRead, PaginatedNumeraciones,
+    OrganizacionOverview
 )
 from dependencies.auth import (
     get_current_user,
@@ -36,13 +37,19 @@ from dependencies.auth import (
     ROLE_SUPERADMIN,
     ROLE_ADMIN
 )
+from dependencies.condicional import GetCondicional, get_condicional
 from services.audit_service import log_event
 from services.dv_calculator import calc_dv_if_nit  # si necesitas DV
+from services.organizacion_service import obtener_overview
+from services.escritura_service import insertar_returning, actualizar_returning
+from services.integridad_service import traducir_integridad
+from core.fast_json import FastJSONRoute
 
 router = APIRouter(
     prefix="/organizations",
     tags=["Organizations"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # -----------------------------------------------------------------------------
@@ -80,7 +87,7 @@ async def create_organization(
     fecha_inicio = datetime.utcnow()
     fecha_fin = fecha_inicio + timedelta(days=15)
 
-    org = Organizacion(
+    org = await insertar_returning(db, Organizacion, dict(
         tipo_documento_id=data.tipo_documento_id,
         numero_documento=data.numero_documento,
         dv=dv_calculado,
@@ -101,10 +108,8 @@ async def create_organization(
         fecha_inicio_plan=fecha_inicio,
         fecha_fin_plan=fecha_fin,
         trial_activo=True
-    )
-    db.add(org)
+    ))
     await db.commit()
-    await db.refresh(org)
 
     await log_event(db, current_user.id, "ORG_CREATED",
                     f"Organización {org.nombre_fiscal} creada con plan Lite")
@@ -115,19 +120,40 @@ async def create_organization(
 async def get_organization(
     org_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    condicional: GetCondicional = Depends(get_condicional(Organizacion, "org_id"))
 ):
     """
     Obtiene la organización por ID (cualquier usuario logueado).
+    Soporta If-None-Match / If-Modified-Since (responde 304 si no cambió).
     """
     stmt_org = select(Organizacion).where(Organizacion.id == org_id)
     res_org = await db.execute(stmt_org)
     org = res_org.scalars().first()
     if not org:
         raise HTTPException(404, "Organización no encontrada")
+    condicional.marcar(org)
     return org
 
 
+@router.get("/{org_id}/overview", response_model=OrganizacionOverview)
+async def get_organization_overview(
+    org_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Resumen de la organización para el home del admin: conteos de sucursales,
+    bodegas, cajas, centros de costo, tiendas, numeraciones y usuarios, más el
+    estado del plan / trial. Una sola consulta SQL, cacheada por organización
+    (se invalida al escribir en esas tablas).
+    """
+    overview = await obtener_overview(db, org_id)
+    if not overview:
+        raise HTTPException(404, "Organización no encontrada")
+    return overview
+
+
 @router.put("/{org_id}",
     response_model=OrganizacionRead,
     dependencies=[Depends(role_required_at_most(ROLE_ADMIN))])
@@ -140,24 +166,18 @@ async def update_organization(
     """
     Actualiza una Organización existente. Acceso: rol_id <= 2 => Admin o Superadmin
     """
-    stmt = select(Organizacion).where(Organizacion.id == org_id)
-    res = await db.execute(stmt)
-    org = res.scalars().first()
-    if not org:
-        raise HTTPException(404, "Organización no encontrada")
-
     fields = data.dict(exclude_unset=True)
 
-    # Recalcular DV si cambian tipo_documento y número
+    # Recalcular DV si cambian tipo_documento y número (un dv explícito manda)
     if "tipo_documento_id" in fields and "numero_documento" in fields:
-        org.dv = calc_dv_if_nit(fields["tipo_documento_id"], fields["numero_documento"])
-
-    # Asignar campos
-    for key, value in fields.items():
-        setattr(org, key, value)
+        fields.setdefault(
+            "dv", calc_dv_if_nit(fields["tipo_documento_id"], fields["numero_documento"])
+        )
 
+    org = await actualizar_returning(db, Organizacion, [Organizacion.id == org_id], fields)
+    if not org:
+        raise HTTPException(404, "Organización no encontrada")
     await db.commit()
-    await db.refresh(org)
 
     await log_event(db, current_user.id, "ORG_UPDATED", f"Organización {org.id} actualizada")
     return org
@@ -213,7 +233,6 @@ async def set_organization_plan(
     # Aquí podrías cambiar fechas trial etc.
 
     await db.commit()
-    await db.refresh(org)
 
     await log_event(db, current_user.id, "ORG_PLAN_UPDATED",
                     f"Plan {plan.nombre_plan} asignado a org {org_id}")
@@ -246,7 +265,6 @@ async def list_sucursales(
     stmt_base = (
         select(Sucursal)
         .where(Sucursal.organizacion_id == org_id)
-        .options(joinedload(Sucursal.departamento), joinedload(Sucursal.ciudad))
     )
     if search:
         stmt_base = stmt_base.where(Sucursal.nombre.ilike(f"%{search}%"))
@@ -262,13 +280,12 @@ async def list_sucursales(
     offset = (page - 1)*page_size
 
     # Paginado
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Sucursal.id).offset(offset).limit(page_size)
     res_suc = await db.execute(stmt_paginado)
     sucursales_db = res_suc.scalars().all()
 
-    data = [SucursalRead.from_orm(s) for s in sucursales_db]
     return {
-        "data": data,
+        "data": sucursales_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -296,35 +313,21 @@ async def create_sucursal(
     if data.organizacion_id != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    # Validar si es sucursal principal
-    if data.sucursal_principal:
-        stmt_princ = select(Sucursal).where(
-            Sucursal.organizacion_id == org_id,
-            Sucursal.sucursal_principal == True
-        )
-        res_princ = await db.execute(stmt_princ)
-        existing_princ = res_princ.scalars().first()
-        if existing_princ:
-            raise HTTPException(
-                status_code=400,
-                detail="Ya existe una sucursal principal en esta organización."
-            )
-
-    nueva_sucursal = Sucursal(
-        organizacion_id=org_id,
-        nombre=data.nombre,
-        pais=data.pais,
-        departamento_id=data.departamento_id,
-        ciudad_id=data.ciudad_id,
-        direccion=data.direccion,
-        telefonos=data.telefonos,
-        prefijo_transacciones=data.prefijo_transacciones,
-        sucursal_principal=data.sucursal_principal,
-        activa=data.activa
-    )
-    db.add(nueva_sucursal)
-    await db.commit()
-    await db.refresh(nueva_sucursal)
+    # Una segunda sucursal principal la rechaza uq_sucursal_principal_org
+    async with traducir_integridad(db):
+        nueva_sucursal = await insertar_returning(db, Sucursal, dict(
+            organizacion_id=org_id,
+            nombre=data.nombre,
+            pais=data.pais,
+            departamento_id=data.departamento_id,
+            ciudad_id=data.ciudad_id,
+            direccion=data.direccion,
+            telefonos=data.telefonos,
+            prefijo_transacciones=data.prefijo_transacciones,
+            sucursal_principal=data.sucursal_principal,
+            activa=data.activa
+        ))
+        await db.commit()
 
     await log_event(db, current_user.id, "SUCURSAL_CREATED",
                     f"Sucursal {nueva_sucursal.nombre} creada en Org {org_id}")
@@ -365,41 +368,24 @@ async def patch_sucursal(
     """
     Actualiza parcialmente la sucursal {sucursal_id} de la org {org_id}.
     """
-    stmt = select(Sucursal).where(
-        Sucursal.id == sucursal_id,
-        Sucursal.organizacion_id == org_id
-    )
-    res_suc = await db.execute(stmt)
-    suc = res_suc.scalars().first()
-    if not suc:
-        raise HTTPException(404, "Sucursal no encontrada o no pertenece a la org.")
-
     campos = data.dict(exclude_unset=True)
 
     if "organizacion_id" in campos and campos["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    # Si pasa a principal => validar que no exista otra
-    if "sucursal_principal" in campos and campos["sucursal_principal"] is True:
-        stmt_princ = select(Sucursal).where(
-            Sucursal.organizacion_id == org_id,
-            Sucursal.sucursal_principal == True,
-            Sucursal.id != suc.id
+    # Si pasa a principal y ya hay otra => uq_sucursal_principal_org
+    async with traducir_integridad(
+        db, {"uq_sucursal_principal_org": "Ya existe otra sucursal principal en esta org."}
+    ):
+        suc = await actualizar_returning(
+            db,
+            Sucursal,
+            [Sucursal.id == sucursal_id, Sucursal.organizacion_id == org_id],
+            campos
         )
-        res_princ = await db.execute(stmt_princ)
-        existing_princ = res_princ.scalars().first()
-        if existing_princ:
-            raise HTTPException(
-                400,
-                "Ya existe otra sucursal principal en esta org."
-            )
-
-    # Asignar
-    for key, value in campos.items():
-        setattr(suc, key, value)
-
-    await db.commit()
-    await db.refresh(suc)
+        if not suc:
+            raise HTTPException(404, "Sucursal no encontrada o no pertenece a la org.")
+        await db.commit()
 
     await log_event(db, current_user.id, "SUCURSAL_UPDATED",
                     f"Sucursal {suc.id} actualizada (PATCH)")
@@ -477,13 +463,12 @@ async def list_centros_costos(
         page = total_paginas
     offset = (page - 1)*page_size
 
-    stmt_pag = stmt_base.offset(offset).limit(page_size)
+    stmt_pag = stmt_base.order_by(CentroCosto.id).offset(offset).limit(page_size)
     res_cc = await db.execute(stmt_pag)
     centros_db = res_cc.scalars().all()
 
-    data = [CentroCostoRead.from_orm(cc) for cc in centros_db]
     return {
-        "data": data,
+        "data": centros_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -507,18 +492,17 @@ async def create_centro_costo(
     if data.organizacion_id != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    nuevo_centro = CentroCosto(
-        organizacion_id=org_id,
-        codigo=data.codigo,
-        nombre=data.nombre,
-        nivel=data.nivel,
-        padre_id=data.padre_id,
-        permite_ingresos=data.permite_ingresos,
-        estado=data.estado
-    )
-    db.add(nuevo_centro)
-    await db.commit()
-    await db.refresh(nuevo_centro)
+    async with traducir_integridad(db):
+        nuevo_centro = await insertar_returning(db, CentroCosto, dict(
+            organizacion_id=org_id,
+            codigo=data.codigo,
+            nombre=data.nombre,
+            nivel=data.nivel,
+            padre_id=data.padre_id,
+            permite_ingresos=data.permite_ingresos,
+            estado=data.estado
+        ))
+        await db.commit()
 
     await log_event(db, current_user.id, "CC_CREATED",
                     f"Centro de costo {nuevo_centro.codigo} creado en Org {org_id}")
@@ -553,24 +537,20 @@ async def update_centro_costo(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    stmt = select(CentroCosto).where(
-        CentroCosto.id == centro_id,
-        CentroCosto.organizacion_id == org_id
-    )
-    res_cc = await db.execute(stmt)
-    cc = res_cc.scalars().first()
-    if not cc:
-        raise HTTPException(404, "Centro de costo no encontrado.")
-
     fields = data.dict(exclude_unset=True)
     if "organizacion_id" in fields and fields["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    for key, value in fields.items():
-        setattr(cc, key, value)
-
-    await db.commit()
-    await db.refresh(cc)
+    async with traducir_integridad(db):
+        cc = await actualizar_returning(
+            db,
+            CentroCosto,
+            [CentroCosto.id == centro_id, CentroCosto.organizacion_id == org_id],
+            fields
+        )
+        if not cc:
+            raise HTTPException(404, "Centro de costo no encontrado.")
+        await db.commit()
     await log_event(db, current_user.id, "CC_UPDATED",
                     f"Centro de costo {cc.id} actualizado")
     return cc
@@ -620,16 +600,14 @@ async def create_bodega(
     if data.organizacion_id != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    nueva_bodega = Bodega(
+    nueva_bodega = await insertar_returning(db, Bodega, dict(
         organizacion_id=org_id,
         sucursal_id=data.sucursal_id,
         nombre=data.nombre,
         bodega_por_defecto=data.bodega_por_defecto,
         estado=data.estado
-    )
-    db.add(nueva_bodega)
+    ), anidados={"sucursal": ("nombre",)})
     await db.commit()
-    await db.refresh(nueva_bodega)
 
     await log_event(db, current_user.id, "BODEGA_CREATED",
                     f"Bodega {nueva_bodega.nombre} creada en Org {org_id}")
@@ -686,13 +664,12 @@ async def list_bodegas(
         page = total_paginas
 
     offset = (page - 1)*page_size
-    stmt_pag = stmt_base.offset(offset).limit(page_size)
+    stmt_pag = stmt_base.order_by(Bodega.id).offset(offset).limit(page_size)
     res_bod = await db.execute(stmt_pag)
     bodegas_db = res_bod.scalars().all()
 
-    data = [BodegaRead.from_orm(b) for b in bodegas_db]
     return {
-        "data": data,
+        "data": bodegas_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -709,15 +686,6 @@ async def update_bodega(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    stmt = select(Bodega).where(
-        Bodega.id == bodega_id,
-        Bodega.organizacion_id == org_id
-    )
-    res_bod = await db.execute(stmt)
-    bod = res_bod.scalars().first()
-    if not bod:
-        raise HTTPException(404, "Bodega no encontrada.")
-
     fields = data.dict(exclude_unset=True)
     if "organizacion_id" in fields and fields["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
@@ -730,13 +698,18 @@ async def update_bodega(
             .values(bodega_por_defecto=False)
         )
         await db.execute(stmt_update_others)
-        await db.commit()
-
-    for key, value in fields.items():
-        setattr(bod, key, value)
 
+    bod = await actualizar_returning(
+        db,
+        Bodega,
+        [Bodega.id == bodega_id, Bodega.organizacion_id == org_id],
+        fields,
+        anidados={"sucursal": ("nombre",)}
+    )
+    if not bod:
+        await db.rollback()
+        raise HTTPException(404, "Bodega no encontrada.")
     await db.commit()
-    await db.refresh(bod)
 
     await log_event(db, current_user.id, "BODEGA_UPDATED",
                     f"Bodega {bod.id} actualizada")
@@ -788,16 +761,14 @@ async def create_caja(
     if data.organizacion_id != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    nueva_caja = Caja(
+    nueva_caja = await insertar_returning(db, Caja, dict(
         organizacion_id=org_id,
         nombre=data.nombre,
         sucursal_id=data.sucursal_id,
         estado=data.estado,
         vigencia=data.vigencia
-    )
-    db.add(nueva_caja)
+    ), anidados={"sucursal": ("nombre",)})
     await db.commit()
-    await db.refresh(nueva_caja)
 
     await log_event(db, current_user.id, "CAJA_CREATED",
                     f"Caja {nueva_caja.nombre} creada en Org {org_id}")
@@ -835,13 +806,12 @@ async def list_cajas(
         page = total_paginas
     offset = (page - 1)*page_size
 
-    stmt_pag = stmt_base.offset(offset).limit(page_size)
+    stmt_pag = stmt_base.order_by(Caja.id).offset(offset).limit(page_size)
     res_cajas = await db.execute(stmt_pag)
     cajas_db = res_cajas.scalars().all()
 
-    data = [CajaRead.from_orm(caja) for caja in cajas_db]
     return {
-        "data": data,
+        "data": cajas_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -857,24 +827,20 @@ async def update_caja(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    stmt = select(Caja).where(
-        Caja.id == caja_id,
-        Caja.organizacion_id == org_id
-    )
-    res_caja = await db.execute(stmt)
-    caja = res_caja.scalars().first()
-    if not caja:
-        raise HTTPException(404, "Caja no encontrada o no pertenece a la organización.")
-
     fields = data.dict(exclude_unset=True)
     if "organizacion_id" in fields and fields["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    for key, value in fields.items():
-        setattr(caja, key, value)
-
+    caja = await actualizar_returning(
+        db,
+        Caja,
+        [Caja.id == caja_id, Caja.organizacion_id == org_id],
+        fields,
+        anidados={"sucursal": ("nombre",)}
+    )
+    if not caja:
+        raise HTTPException(404, "Caja no encontrada o no pertenece a la organización.")
     await db.commit()
-    await db.refresh(caja)
     await log_event(db, current_user.id, "CAJA_UPDATED", f"Caja {caja.id} actualizada")
     return caja
 
@@ -923,17 +889,15 @@ async def create_tienda_virtual(
     if data.organizacion_id != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    nueva_tienda = TiendaVirtual(
+    nueva_tienda = await insertar_returning(db, TiendaVirtual, dict(
         organizacion_id=org_id,
         plataforma=data.plataforma,
         nombre=data.nombre,
         url=data.url,
         centro_costo_id=data.centro_costo_id,
         estado=data.estado
-    )
-    db.add(nueva_tienda)
+    ))
     await db.commit()
-    await db.refresh(nueva_tienda)
 
     await log_event(db, current_user.id, "TIENDA_CREATED",
                     f"Tienda Virtual {nueva_tienda.nombre} en Org {org_id}")
@@ -972,13 +936,12 @@ async def list_tiendas_virtuales(
         page = total_paginas
     offset = (page - 1)*page_size
 
-    stmt_pag = stmt_base.offset(offset).limit(page_size)
+    stmt_pag = stmt_base.order_by(TiendaVirtual.id).offset(offset).limit(page_size)
     res_tv = await db.execute(stmt_pag)
     tv_db = res_tv.scalars().all()
 
-    data = [TiendaVirtualRead.from_orm(t) for t in tv_db]
     return {
-        "data": data,
+        "data": tv_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -1013,24 +976,19 @@ async def update_tienda_virtual(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    stmt = select(TiendaVirtual).where(
-        TiendaVirtual.id == tienda_id,
-        TiendaVirtual.organizacion_id == org_id
-    )
-    res_tv = await db.execute(stmt)
-    tv = res_tv.scalars().first()
-    if not tv:
-        raise HTTPException(404, "Tienda Virtual no encontrada.")
-
     fields = data.dict(exclude_unset=True)
     if "organizacion_id" in fields and fields["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
 
-    for key, value in fields.items():
-        setattr(tv, key, value)
-
+    tv = await actualizar_returning(
+        db,
+        TiendaVirtual,
+        [TiendaVirtual.id == tienda_id, TiendaVirtual.organizacion_id == org_id],
+        fields
+    )
+    if not tv:
+        raise HTTPException(404, "Tienda Virtual no encontrada.")
     await db.commit()
-    await db.refresh(tv)
     await log_event(db, current_user.id, "TIENDA_UPDATED",
                     f"Tienda Virtual {tv.id} actualizada")
     return tv
@@ -1089,9 +1047,8 @@ async def create_numeracion_transaccion(
             .values(numeracion_por_defecto=False)
         )
         await db.execute(stmt_update_others)
-        await db.commit()
 
-    nueva_num = NumeracionTransaccion(
+    nueva_num = await insertar_returning(db, NumeracionTransaccion, dict(
         organizacion_id=org_id,
         tipo_transaccion=data.tipo_transaccion,
         nombre_personalizado=data.nombre_personalizado,
@@ -1110,10 +1067,8 @@ async def create_numeracion_transaccion(
         numeracion_siguiente=data.numeracion_siguiente,
         total_maximo_por_transaccion=data.total_maximo_por_transaccion,
         transaccion_electronica=data.transaccion_electronica
-    )
-    db.add(nueva_num)
+    ))
     await db.commit()
-    await db.refresh(nueva_num)
     return nueva_num
 
 
@@ -1148,13 +1103,12 @@ async def list_numeraciones_transaccion(
         page = total_paginas
     offset = (page - 1)*page_size
 
-    stmt_pag = stmt_base.offset(offset).limit(page_size)
+    stmt_pag = stmt_base.order_by(NumeracionTransaccion.id).offset(offset).limit(page_size)
     res_nums = await db.execute(stmt_pag)
     nums_db = res_nums.scalars().all()
 
-    data = [NumeracionTransaccionRead.from_orm(n) for n in nums_db]
     return {
-        "data": data,
+        "data": nums_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -1189,15 +1143,6 @@ async def update_numeracion_transaccion(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    stmt = select(NumeracionTransaccion).where(
-        NumeracionTransaccion.id == num_id,
-        NumeracionTransaccion.organizacion_id == org_id
-    )
-    res_num = await db.execute(stmt)
-    num = res_num.scalars().first()
-    if not num:
-        raise HTTPException(404, "Numeración no encontrada.")
-
     fields = data.dict(exclude_unset=True)
     if "organizacion_id" in fields and fields["organizacion_id"] != org_id:
         raise HTTPException(400, "El organizacion_id no coincide con la URL")
@@ -1213,13 +1158,17 @@ async def update_numeracion_transaccion(
             .values(numeracion_por_defecto=False)
         )
         await db.execute(stmt_update_others)
-        await db.commit()
-
-    for key, value in fields.items():
-        setattr(num, key, value)
 
+    num = await actualizar_returning(
+        db,
+        NumeracionTransaccion,
+        [NumeracionTransaccion.id == num_id, NumeracionTransaccion.organizacion_id == org_id],
+        fields
+    )
+    if not num:
+        await db.rollback()
+        raise HTTPException(404, "Numeración no encontrada.")
     await db.commit()
-    await db.refresh(num)
     return num
 
 
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import or_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
+from services.integridad_service import traducir_integridad
 from models.permissions import Permission
 from schemas.permission_schemas import (
     PermissionCreate,
@@ -52,7 +53,7 @@ async def list_permissions(
 
     offset = (page - 1) * page_size
 
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Permission.id).offset(offset).limit(page_size)
     result_perms = await db.execute(stmt_paginado)
     perms_db = result_perms.scalars().all()
 
@@ -78,19 +79,14 @@ async def create_permission(
       "descripcion": "Puede crear usuarios"
     }
     """
-    # Validar duplicado
-    stmt_exist = select(Permission).where(Permission.nombre == perm_data.nombre)
-    result_exist = await db.execute(stmt_exist)
-    existing = result_exist.scalars().first()
-    if existing:
-        raise HTTPException(status_code=400, detail="El nombre de permiso ya existe.")
-
     perm = Permission(
         nombre=perm_data.nombre,
         descripcion=perm_data.descripcion
     )
     db.add(perm)
-    await db.commit()
+    # Nombre duplicado => permissions_nombre_key
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(perm)
     return perm
 
@@ -130,17 +126,11 @@ async def update_permission(
     if not perm:
         raise HTTPException(status_code=404, detail="Permiso no encontrado.")
 
-    # Validar que no se duplique 'nombre'
-    if perm.nombre != perm_data.nombre:
-        stmt_dup = select(Permission).where(Permission.nombre == perm_data.nombre)
-        dup_result = await db.execute(stmt_dup)
-        existing = dup_result.scalars().first()
-        if existing:
-            raise HTTPException(status_code=400, detail="El nombre de permiso ya existe.")
-
     perm.nombre = perm_data.nombre
     perm.descripcion = perm_data.descripcion
-    await db.commit()
+    # Nombre duplicado => permissions_nombre_key
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(perm)
     return perm
 
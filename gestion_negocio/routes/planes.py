@@ -7,6 +7,7 @@ from database import get_db
 from models.planes import Plan
 from schemas.plan_schemas import PlanCreate, PlanRead
 from dependencies.auth import get_current_user, role_required, ROLE_SUPERADMIN
+from services.escritura_service import insertar_returning, actualizar_returning
 
 router = APIRouter(
     prefix="/planes",
@@ -20,7 +21,7 @@ router = APIRouter(
 
 @router.post("/", response_model=PlanRead)
 async def create_plan(data: PlanCreate, db: AsyncSession = Depends(get_db)):
-    plan = Plan(
+    plan = await insertar_returning(db, Plan, dict(
         nombre_plan=data.nombre_plan,
         max_usuarios=data.max_usuarios,
         max_empleados=data.max_empleados,
@@ -29,10 +30,8 @@ async def create_plan(data: PlanCreate, db: AsyncSession = Depends(get_db)):
         soporte_prioritario=data.soporte_prioritario,
         uso_ilimitado_funciones=data.uso_ilimitado_funciones,
         duracion_dias=data.duracion_dias
-    )
-    db.add(plan)
+    ))
     await db.commit()
-    await db.refresh(plan)
     return plan
 
 
@@ -56,23 +55,19 @@ async def get_plan(plan_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.put("/{plan_id}", response_model=PlanRead)
 async def update_plan(plan_id: int, data: PlanCreate, db: AsyncSession = Depends(get_db)):
-    stmt = select(Plan).where(Plan.id == plan_id)
-    result = await db.execute(stmt)
-    plan = result.scalars().first()
+    plan = await actualizar_returning(db, Plan, [Plan.id == plan_id], dict(
+        nombre_plan=data.nombre_plan,
+        max_usuarios=data.max_usuarios,
+        max_empleados=data.max_empleados,
+        max_sucursales=data.max_sucursales,
+        precio=data.precio,
+        soporte_prioritario=data.soporte_prioritario,
+        uso_ilimitado_funciones=data.uso_ilimitado_funciones,
+        duracion_dias=data.duracion_dias
+    ))
     if not plan:
         raise HTTPException(status_code=404, detail="Plan no encontrado")
-
-    plan.nombre_plan = data.nombre_plan
-    plan.max_usuarios = data.max_usuarios
-    plan.max_empleados = data.max_empleados
-    plan.max_sucursales = data.max_sucursales
-    plan.precio = data.precio
-    plan.soporte_prioritario = data.soporte_prioritario
-    plan.uso_ilimitado_funciones = data.uso_ilimitado_funciones
-    plan.duracion_dias = data.duracion_dias
-
     await db.commit()
-    await db.refresh(plan)
     return plan
 
 
@@ -4,7 +4,6 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from database import get_db
 from schemas.proveedores import (
     ProveedorSchema,
@@ -14,13 +13,27 @@ from schemas.proveedores import (
 )
 from models.proveedores import Proveedor
 from dependencies.auth import get_current_user
+from dependencies.condicional import GetCondicional, get_condicional
 from services.dv_calculator import calc_dv_if_nit
+from services.escritura_service import insertar_returning, actualizar_returning
+from services.integridad_service import traducir_integridad
+from services.common_validations import validar_referencias, validar_referencias_parcial
+from services.sync_service import registrar_cambio_organizacion
+from services.ids_service import (
+    filtro_organizacion,
+    filtros_ids,
+    ordenar_por_ids,
+    pagina_unica,
+    parsear_ids,
+)
+from core.fast_json import FastJSONRoute
 
 
 router = APIRouter(
     prefix="/proveedores",
     tags=["Proveedores"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 
@@ -49,54 +62,44 @@ async def crear_proveedor(
     proveedor.nombre_razon_social = proveedor.nombre_razon_social.upper()
     proveedor.numero_documento = normalize_text(proveedor.numero_documento).strip()
 
-    # 2) Verificar duplicado en la misma organización
-    stmt_duplicado = select(Proveedor).where(
-        Proveedor.organizacion_id == proveedor.organizacion_id,
-        Proveedor.numero_documento == proveedor.numero_documento
-    )
-    result_dup = await db.execute(stmt_duplicado)
-    existe_prov = result_dup.scalars().first()
-    if existe_prov:
-        raise HTTPException(
-            status_code=400,
-            detail="El número de identificación ya está registrado en esta organización."
-        )
+    # 2) Duplicado en la misma organización => lo rechaza uq_proveedor_org_doc.
+    #    Las FKs (catálogos y sucursal de la misma org) se validan todas juntas.
+    await validar_referencias(db, Proveedor, proveedor.dict(), proveedor.organizacion_id)
 
     # 3) Calcular DV si es NIT
     dv_calculado = calc_dv_if_nit(proveedor.tipo_documento_id, proveedor.numero_documento)
 
-    # 4) Crear y guardar
-    nuevo_proveedor = Proveedor(
-        organizacion_id=proveedor.organizacion_id,
-        tipo_documento_id=proveedor.tipo_documento_id,
-        dv=dv_calculado,
-        numero_documento=proveedor.numero_documento,
-        nombre_razon_social=proveedor.nombre_razon_social,
-        email=proveedor.email,
-        pagina_web=proveedor.pagina_web,
-        departamento_id=proveedor.departamento_id,
-        ciudad_id=proveedor.ciudad_id,
-        direccion=proveedor.direccion,
-        telefono1=proveedor.telefono1,
-        telefono2=proveedor.telefono2,
-        celular=proveedor.celular,
-        whatsapp=proveedor.whatsapp,
-        tipos_persona_id=proveedor.tipos_persona_id,
-        regimen_tributario_id=proveedor.regimen_tributario_id,
-        moneda_principal_id=proveedor.moneda_principal_id,
-        tarifa_precios_id=proveedor.tarifa_precios_id,
-        actividad_economica_id=proveedor.actividad_economica_id,
-        forma_pago_id=proveedor.forma_pago_id,
-        retencion_id=proveedor.retencion_id,
-        permitir_venta=proveedor.permitir_venta,
-        descuento=proveedor.descuento,
-        cupo_credito=proveedor.cupo_credito,
-        sucursal_id=proveedor.sucursal_id,
-        observacion=proveedor.observacion
-    )
-    db.add(nuevo_proveedor)
-    await db.commit()
-    await db.refresh(nuevo_proveedor)
+    # 4) Crear y guardar (INSERT ... RETURNING)
+    async with traducir_integridad(db):
+        nuevo_proveedor = await insertar_returning(db, Proveedor, dict(
+            organizacion_id=proveedor.organizacion_id,
+            tipo_documento_id=proveedor.tipo_documento_id,
+            dv=dv_calculado,
+            numero_documento=proveedor.numero_documento,
+            nombre_razon_social=proveedor.nombre_razon_social,
+            email=proveedor.email,
+            pagina_web=proveedor.pagina_web,
+            departamento_id=proveedor.departamento_id,
+            ciudad_id=proveedor.ciudad_id,
+            direccion=proveedor.direccion,
+            telefono1=proveedor.telefono1,
+            telefono2=proveedor.telefono2,
+            celular=proveedor.celular,
+            whatsapp=proveedor.whatsapp,
+            tipos_persona_id=proveedor.tipos_persona_id,
+            regimen_tributario_id=proveedor.regimen_tributario_id,
+            moneda_principal_id=proveedor.moneda_principal_id,
+            tarifa_precios_id=proveedor.tarifa_precios_id,
+            actividad_economica_id=proveedor.actividad_economica_id,
+            forma_pago_id=proveedor.forma_pago_id,
+            retencion_id=proveedor.retencion_id,
+            permitir_venta=proveedor.permitir_venta,
+            descuento=proveedor.descuento,
+            cupo_credito=proveedor.cupo_credito,
+            sucursal_id=proveedor.sucursal_id,
+            observacion=proveedor.observacion
+        ))
+        await db.commit()
 
     return {
         "message": "Proveedor creado con éxito",
@@ -110,23 +113,33 @@ async def obtener_proveedores(
     db: AsyncSession = Depends(get_db),
     search: Optional[str] = Query(None, description="Texto de búsqueda"),
     page: int = Query(1, ge=1, description="Número de página"),
-    page_size: int = 10
+    page_size: int = 10,
+    ids: Optional[str] = Query(
+        None,
+        description="IDs separados por coma (ej. '3,1,2'): esos proveedores, en ese orden"
+    ),
+    current_user=Depends(get_current_user)
 ):
     """
-    Retorna una lista paginada de proveedores, permitiendo búsqueda parcial en 'nombre_razon_social'.
+    Retorna una lista paginada de los proveedores de la organización del usuario
+    (superadmin: todos), permitiendo búsqueda parcial en 'nombre_razon_social'.
+    Con 'ids' se devuelven esos proveedores de la organización del usuario,
+    en el orden pedido y en una sola página.
     """
-    # IMPORTANTE: si tu 'ProveedorResponseSchema' (o ProveedorSchema) incluye 'tipo_documento'
-    # (y tu modelo Proveedor también la define como relationship),
-    # debes agregar: joinedload(Proveedor.tipo_documento).
-    stmt_base = (
-        select(Proveedor)
-        .options(
-            joinedload(Proveedor.departamento),
-            joinedload(Proveedor.ciudad),
-            # Si tu esquema también usa 'tipo_documento', cárgalo:
-            joinedload(Proveedor.tipo_documento)
+    if ids is not None:
+        try:
+            lista_ids = parsear_ids(ids)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        result_ids = await db.execute(
+            select(Proveedor).where(*filtros_ids(Proveedor, lista_ids, current_user))
         )
-    )
+        return pagina_unica(ordenar_por_ids(result_ids.scalars().all(), lista_ids))
+
+    # tipo_documento / departamento / ciudad se completan desde el registro
+    # de referencias al serializar (ver ReferenciasMixin), sin joins.
+    # Solo la organización del usuario (índice ix_proveedores_org_id)
+    stmt_base = select(Proveedor).where(*filtro_organizacion(Proveedor, current_user))
 
     # Búsqueda parcial
     if search:
@@ -147,16 +160,14 @@ async def obtener_proveedores(
         page = total_paginas
 
     offset = (page - 1) * page_size
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Proveedor.id).offset(offset).limit(page_size)
 
     result_proveedores = await db.execute(stmt_paginado)
     proveedores_db = result_proveedores.scalars().all()
 
-    # Convertir a Pydantic (asegúrate de tener from_attributes = True en ProveedorResponseSchema)
-    data = [ProveedorResponseSchema.from_orm(p) for p in proveedores_db]
-
+    # FastJSONRoute valida (from_attributes) y serializa una sola vez
     return {
-        "data": data,
+        "data": proveedores_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -166,26 +177,19 @@ async def obtener_proveedores(
 @router.get("/{proveedor_id}", response_model=ProveedorResponseSchema)
 async def obtener_proveedor(
     proveedor_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    condicional: GetCondicional = Depends(get_condicional(Proveedor, "proveedor_id", referencias=True))
 ):
     """
     Obtiene un proveedor por su ID.
+    Soporta If-None-Match / If-Modified-Since (responde 304 si no cambió).
     """
-    # Si tu esquema incluye relaciones como 'departamento', 'ciudad', 'tipo_documento', etc.,
-    # cárgalas aquí también:
-    stmt = (
-        select(Proveedor)
-        .where(Proveedor.id == proveedor_id)
-        .options(
-            joinedload(Proveedor.departamento),
-            joinedload(Proveedor.ciudad),
-            joinedload(Proveedor.tipo_documento),
-        )
-    )
+    stmt = select(Proveedor).where(Proveedor.id == proveedor_id)
     result = await db.execute(stmt)
     prov = result.scalars().first()
     if not prov:
         raise HTTPException(status_code=404, detail="Proveedor no encontrado")
+    condicional.marcar(prov)
     return prov
 
 
@@ -199,16 +203,7 @@ async def actualizar_proveedor_parcial(
     Actualiza de manera parcial los campos del proveedor (solo los enviados).
     Retorna el proveedor actualizado.
     """
-    # Carga anticipada de relaciones.
-    stmt = (
-        select(Proveedor)
-        .where(Proveedor.id == proveedor_id)
-        .options(
-            joinedload(Proveedor.departamento),
-            joinedload(Proveedor.ciudad),
-            joinedload(Proveedor.tipo_documento),
-        )
-    )
+    stmt = select(Proveedor).where(Proveedor.id == proveedor_id)
     result = await db.execute(stmt)
     prov_db = result.scalars().first()
     if not prov_db:
@@ -217,25 +212,11 @@ async def actualizar_proveedor_parcial(
     # Convierte a dict, excluyendo campos no enviados
     campos = proveedor_data.dict(exclude_unset=True)
 
-    # Si cambia 'numero_documento'
+    await validar_referencias_parcial(db, Proveedor, campos, prov_db)
+
+    # Si cambia 'numero_documento', normalizar (el duplicado lo rechaza uq_proveedor_org_doc)
     if "numero_documento" in campos:
-        doc_nuevo = normalize_text(campos["numero_documento"]).strip()
-        if doc_nuevo != prov_db.numero_documento:
-            # Verificar duplicado en la misma org
-            org_id = campos.get("organizacion_id", prov_db.organizacion_id)
-            stmt_dup = select(Proveedor).where(
-                Proveedor.organizacion_id == org_id,
-                Proveedor.numero_documento == doc_nuevo,
-                Proveedor.id != prov_db.id
-            )
-            result_dup = await db.execute(stmt_dup)
-            existe = result_dup.scalars().first()
-            if existe:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Este documento ya está registrado en la organización."
-                )
-            campos["numero_documento"] = doc_nuevo
+        campos["numero_documento"] = normalize_text(campos["numero_documento"]).strip()
 
     # Si cambia 'nombre_razon_social', normalizar
     if "nombre_razon_social" in campos and campos["nombre_razon_social"]:
@@ -247,29 +228,18 @@ async def actualizar_proveedor_parcial(
         ndoc = campos.get("numero_documento", prov_db.numero_documento)
         dv_calc = calc_dv_if_nit(tdoc, ndoc)
         if dv_calc:
-            prov_db.dv = dv_calc
-
-    # Asignar campos
-    for key, value in campos.items():
-        setattr(prov_db, key, value)
-
-    await db.commit()
-    await db.refresh(prov_db)
-
-    # OPCIONAL: si quieres devolver el objeto con todas las relaciones
-    # cargadas tras la actualización, haz una segunda consulta:
-    # stmt_updated = (
-    #     select(Proveedor)
-    #     .where(Proveedor.id == proveedor_id)
-    #     .options(
-    #         joinedload(Proveedor.departamento),
-    #         joinedload(Proveedor.ciudad),
-    #         joinedload(Proveedor.tipo_documento),
-    #     )
-    # )
-    # result_updated = await db.execute(stmt_updated)
-    # prov_updated = result_updated.scalars().first()
-    # return prov_updated
+            campos["dv"] = dv_calc
+
+    # Asignar campos (UPDATE ... RETURNING). Si cambia de organización, la
+    # anterior la recibe como baja en /sync.
+    registrar_cambio_organizacion(db, prov_db, campos.get("organizacion_id"))
+    async with traducir_integridad(
+        db, {"uq_proveedor_org_doc": "Este documento ya está registrado en la organización."}
+    ):
+        prov_db = await actualizar_returning(db, Proveedor, [Proveedor.id == proveedor_id], campos)
+        if not prov_db:
+            raise HTTPException(status_code=404, detail="Proveedor no encontrado")
+        await db.commit()
 
     return prov_db
 
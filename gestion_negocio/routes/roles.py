@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from database import get_db
 from models.roles import Rol
@@ -99,7 +100,7 @@ async def list_roles(
     offset = (page - 1) * page_size
 
     # 2) Paginado
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Rol.id).offset(offset).limit(page_size)
     res_paginado = await db.execute(stmt_paginado)
     roles_db = res_paginado.scalars().all()
 
@@ -223,7 +224,8 @@ async def get_role_permissions(
     """
     Lista los permisos que tiene un rol.
     """
-    stmt = select(Rol).where(Rol.id == role_id)
+    # Los permisos se cargan con el rol (selectin): en async no hay lazy load
+    stmt = select(Rol).where(Rol.id == role_id).options(selectinload(Rol.permissions))
     res = await db.execute(stmt)
     rol = res.scalars().first()
     if not rol:
@@ -233,9 +235,6 @@ async def get_role_permissions(
         if rol.organizacion_id != current_user.organizacion_id:
             raise HTTPException(403, "No tienes acceso a este rol.")
 
-    # si la relación 'permissions' es lazy='selectin' (o similar), podrías acceder sin refrescar
-    # De otro modo, podrías hacer:
-    # await db.refresh(rol, ["permissions"])
     return rol.permissions
 
 
@@ -249,7 +248,7 @@ async def add_permission_to_role(
     """
     Asigna un permiso (perm_id) a un rol (role_id).
     """
-    stmt_rol = select(Rol).where(Rol.id == role_id)
+    stmt_rol = select(Rol).where(Rol.id == role_id).options(selectinload(Rol.permissions))
     res_rol = await db.execute(stmt_rol)
     rol = res_rol.scalars().first()
     if not rol:
@@ -286,7 +285,7 @@ async def remove_permission_from_role(
     """
     Quita un permiso (perm_id) del rol (role_id).
     """
-    stmt_rol = select(Rol).where(Rol.id == role_id)
+    stmt_rol = select(Rol).where(Rol.id == role_id).options(selectinload(Rol.permissions))
     res_rol = await db.execute(stmt_rol)
     rol = res_rol.scalars().first()
     if not rol:
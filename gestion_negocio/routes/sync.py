@@ -0,0 +1,57 @@
+# gestion_negocio/routes/sync.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.fast_json import serializar_json
+from database import get_db
+from dependencies.auth import get_current_user
+from services.sync_service import (
+    ENTIDADES,
+    SYNC_LIMITE,
+    SYNC_LIMITE_MAX,
+    CursorInvalido,
+    CursorVencido,
+    cambios_desde,
+)
+
+router = APIRouter(prefix="/sync", tags=["Sincronización"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/{entidad}")
+async def sincronizar(
+    entidad: str,
+    since: Optional[str] = Query(None, description="Cursor de la respuesta anterior (vacío = carga completa)"),
+    limit: int = Query(SYNC_LIMITE, ge=1, le=SYNC_LIMITE_MAX),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Cambios de `entidad` (clientes, empleados, proveedores, productos) desde
+    el cursor `since`: filas nuevas o modificadas en 'cambios', ids borrados
+    en 'eliminados' y el cursor para la siguiente llamada. Con 'hay_mas'
+    se repite de inmediato con el nuevo cursor.
+    Ver services/sync_service.py.
+    """
+    config = ENTIDADES.get(entidad)
+    if config is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Entidad '{entidad}' no sincronizable. Opciones: {', '.join(ENTIDADES)}"
+        )
+    if config.por_organizacion and not current_user.organizacion_id:
+        raise HTTPException(status_code=403, detail="No tienes organizacion asignada.")
+
+    try:
+        contenido = await cambios_desde(db, config, current_user.organizacion_id, since, limit)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CursorVencido:
+        raise HTTPException(
+            status_code=410,
+            detail="El cursor es demasiado antiguo: hay que volver a cargar todo (sin 'since')."
+        )
+
+    return Response(serializar_json(config.respuesta, contenido), media_type="application/json")
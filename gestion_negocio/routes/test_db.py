@@ -4,9 +4,7 @@ from sqlalchemy import text, exc  # Importa text y exc
 from database import get_db   # Asegúrate de la ruta correcta
 import logging
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG) # Usa DEBUG para desarrollo
-# No necesitas el handler si usas Cloud Run, ya lo gestiona.
+logger = logging.getLogger(__name__)  # nivel y salida: core/logs.py
 
 router = APIRouter()
 
@@ -21,12 +19,12 @@ async def test_db(db: AsyncSession = Depends(get_db)):  # Usa AsyncSession
         if row == 1:
            return {"db_test": "Conexión exitosa", "value": row}
         else:
-            logger.warning(f"Resultado inesperado de la DB: {row}")
+            logger.warning("Resultado inesperado de la DB: %s", row)
             raise HTTPException(status_code=500, detail=f"Resultado inesperado: {row}")
 
     except exc.SQLAlchemyError as e:
-      logger.error(f"Error de SQLAlchemy: {e}")
+      logger.error("Error de SQLAlchemy: %s", e)
       raise HTTPException(status_code=500, detail=f"Error de base de datos: {e}") from e
     except Exception as e:
-        logger.exception(f"Error inesperado en /test-db: {e}") #Captura TODO el traceback.
+        logger.exception("Error inesperado en /test-db: %s", e) #Captura TODO el traceback.
         raise HTTPException(status_code=500, detail=f"Error interno: {e}") from e
\ No newline at end of file
@@ -0,0 +1,118 @@
+# gestion_negocio/routes/trabajos.py
+
+"""
+Cola de trabajos en segundo plano (core/trabajos.py): encolar, listar,
+consultar el progreso y cancelar los que aún no empezaron.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.trabajos import REGISTRO, despertar, encolar
+from database import get_db
+from dependencies.auth import ROLE_ADMIN, get_current_user, role_required_at_most
+from models.trabajos import EstadoTrabajo, Trabajo
+from models.usuarios import TipoUsuario
+from schemas.trabajo_schemas import TrabajoCreate, TrabajoRead
+
+router = APIRouter(prefix="/trabajos", tags=["Trabajos"], dependencies=[Depends(get_current_user)])
+
+
+def _es_superadmin(usuario) -> bool:
+    return usuario.tipo_usuario == TipoUsuario.superadmin
+
+
+def _de_su_organizacion(usuario) -> list:
+    if _es_superadmin(usuario):
+        return []
+    return [Trabajo.organizacion_id == usuario.organizacion_id]
+
+
+async def _obtener(db: AsyncSession, trabajo_id: int, usuario) -> Trabajo:
+    trabajo = (await db.execute(
+        select(Trabajo).where(Trabajo.id == trabajo_id, *_de_su_organizacion(usuario))
+    )).scalar_one_or_none()
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado.")
+    return trabajo
+
+
+@router.post("/", response_model=TrabajoRead, status_code=202)
+async def crear_trabajo(
+    datos: TrabajoCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(role_required_at_most(ROLE_ADMIN))
+):
+    """
+    Encola un trabajo para la organización del usuario. Los admin solo
+    pueden encolar los tipos expuestos; superadmin, cualquiera registrado.
+    """
+    definicion = REGISTRO.get(datos.tipo)
+    if definicion is None or not (definicion.expuesto or _es_superadmin(current_user)):
+        raise HTTPException(status_code=400, detail=f"Tipo de trabajo no permitido: '{datos.tipo}'")
+
+    trabajo = encolar(
+        db,
+        datos.tipo,
+        datos.payload,
+        organizacion_id=current_user.organizacion_id,
+        prioridad=datos.prioridad,
+        creado_por=current_user.id,
+    )
+    await db.commit()
+    await db.refresh(trabajo)
+    despertar()
+    return trabajo
+
+
+@router.get("/", response_model=list[TrabajoRead])
+async def listar_trabajos(
+    estado: Optional[EstadoTrabajo] = Query(None),
+    limite: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Trabajos de la organización, los más recientes primero (superadmin: todos)."""
+    filtros = _de_su_organizacion(current_user)
+    if estado is not None:
+        filtros.append(Trabajo.estado == estado.value)
+    result = await db.execute(
+        select(Trabajo).where(*filtros).order_by(Trabajo.id.desc()).limit(limite)
+    )
+    return result.scalars().all()
+
+
+@router.get("/{trabajo_id}", response_model=TrabajoRead)
+async def obtener_trabajo(
+    trabajo_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Estado, progreso y resultado (o error) de un trabajo."""
+    return await _obtener(db, trabajo_id, current_user)
+
+
+@router.post("/{trabajo_id}/cancelar", response_model=TrabajoRead)
+async def cancelar_trabajo(
+    trabajo_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(role_required_at_most(ROLE_ADMIN))
+):
+    """Cancela un trabajo que todavía no empezó (409 si ya está en curso o terminó)."""
+    trabajo = await _obtener(db, trabajo_id, current_user)
+    # Condicionado al estado: si un worker lo reclamó entretanto, no se toca
+    result = await db.execute(
+        update(Trabajo)
+        .where(Trabajo.id == trabajo_id, Trabajo.estado == EstadoTrabajo.pendiente.value)
+        .values(estado=EstadoTrabajo.cancelado.value, fecha_fin=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="El trabajo ya empezó o terminó; no se puede cancelar.")
+    await db.commit()
+    await db.refresh(trabajo)
+    return trabajo
@@ -1,21 +1,25 @@
 # gestion_negocio/routes/ubicaciones.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from models.ubicaciones import Departamento, Ciudad
 from dependencies.auth import get_current_user
+from services.referencias_service import respuesta_referencias
 
 router = APIRouter(prefix="/ubicaciones", tags=["Ubicaciones"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("/departamentos")
-async def obtener_departamentos(db: AsyncSession = Depends(get_db)):
+async def obtener_departamentos(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Retorna la lista de departamentos.
     """
+    respuesta = await respuesta_referencias(request, "departamentos")
+    if respuesta is not None:
+        return respuesta
     stmt = select(Departamento)
     result = await db.execute(stmt)
     departamentos = result.scalars().all()
@@ -23,11 +27,15 @@ async def obtener_departamentos(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/ciudades")
-async def obtener_ciudades(departamento_id: int = Query(None), db: AsyncSession = Depends(get_db)):
+async def obtener_ciudades(request: Request, departamento_id: int = Query(None), db: AsyncSession = Depends(get_db)):
     """
     Retorna la lista de ciudades de un departamento (si se especifica),
     o todas las ciudades si no se envía 'departamento_id'.
     """
+    filtros = {} if departamento_id is None else {"departamento_id": departamento_id}
+    respuesta = await respuesta_referencias(request, "ciudades", **filtros)
+    if respuesta is not None:
+        return respuesta
     if departamento_id is not None:
         stmt = select(Ciudad).where(Ciudad.departamento_id == departamento_id)
     else:
@@ -2,6 +2,7 @@
 
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, func
 from sqlalchemy.orm import joinedload
@@ -12,13 +13,20 @@ from schemas.user_schemas import (
 )
 from services.auth_service import get_password_hash
 from services.audit_service import log_event
+from services.integridad_service import traducir_integridad
 from models.usuarios import Usuario, EstadoUsuario, TipoUsuario
 from models.roles import Rol
 from models.organizaciones import Organizacion
 from dependencies.auth import get_current_user
+from core.fast_json import FastJSONRoute
 
 
-router = APIRouter(prefix="/users", tags=["Users"], dependencies=[Depends(get_current_user)])
+router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
 
 
 @router.post("/", response_model=UserRead)
@@ -44,13 +52,6 @@ async def create_user(
         if rol_obj and rol_obj.nombre.lower() == "superadmin":
             raise HTTPException(403, "Un admin no puede asignar rol 'superadmin'.")
 
-    # Validar email duplicado
-    stmt_exist = select(Usuario).where(Usuario.email == user_data.email)
-    res_exist = await db.execute(stmt_exist)
-    existing = res_exist.scalars().first()
-    if existing:
-        raise HTTPException(400, "El email ya existe")
-
     # Validar rol_id
     if user_data.rol_id is not None:
         stmt_rol_check = select(Rol).where(Rol.id == user_data.rol_id)
@@ -71,7 +72,7 @@ async def create_user(
             if org.id != current_user.organizacion_id:
                 raise HTTPException(403, "Admin no puede crear usuarios en otra organización.")
 
-    hashed_pass = get_password_hash(user_data.password)
+    hashed_pass = await run_in_threadpool(get_password_hash, user_data.password)
 
     nuevo_usuario = Usuario(
         nombre=user_data.nombre,
@@ -82,7 +83,9 @@ async def create_user(
         estado=EstadoUsuario.activo
     )
     db.add(nuevo_usuario)
-    await db.commit()
+    # Email duplicado => usuarios_email_key
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(nuevo_usuario)
 
     log_event(db, current_user.id, "USER_CREATED", f"Creación de usuario {nuevo_usuario.email}")
@@ -194,7 +197,9 @@ async def update_user_partial(
     if "nombre" in fields:
         usuario.nombre = fields["nombre"]
     if "password" in fields:
-        usuario.hashed_password = get_password_hash(fields["password"])
+        usuario.hashed_password = await run_in_threadpool(
+            get_password_hash, fields["password"]
+        )
     if "estado" in fields:
         usuario.estado = fields["estado"]
 
@@ -277,13 +282,12 @@ async def list_users(
         page = total_paginas
     offset = (page - 1) * page_size
 
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Usuario.id).offset(offset).limit(page_size)
     res_users = await db.execute(stmt_paginado)
     users_db = res_users.scalars().all()
 
-    data = [UserRead.from_orm(u) for u in users_db]
     return {
-        "data": data,
+        "data": users_db,
         "page": page,
         "total_paginas": total_paginas,
         "total_registros": total_registros
@@ -343,13 +347,13 @@ async def list_users_by_org(
         page = total_paginas
     offset = (page - 1)*page_size
 
-    stmt_paginado = stmt_base.offset(offset).limit(page_size)
+    stmt_paginado = stmt_base.order_by(Usuario.id).offset(offset).limit(page_size)
     res_usuarios = await db.execute(stmt_paginado)
     usuarios_db = res_usuarios.scalars().all()
 
     data = []
     for u in usuarios_db:
-        user_obj = UserReadExtended.from_orm(u)
+        user_obj = UserReadExtended.model_validate(u)
         if u.rol:
             user_obj.rol_nombre = u.rol.nombre
         data.append(user_obj)
@@ -1,15 +1,104 @@
-from .clientes import ClienteSchema, ClienteResponseSchema, PaginatedClientes, ClienteUpdateSchema
-from .proveedores import ProveedorSchema, ProveedorResponseSchema, PaginatedProveedores, ProveedorUpdateSchema
-from .empleados import EmpleadoBase, EmpleadoResponseSchema, EmpleadoCreateUpdateSchema, PaginatedEmpleados, EmpleadoPatchSchema
-from .cuentas_wallet import CuentaWalletSchema, CuentaWalletResponseSchema
-from .chats import ChatSchema, ChatResponseSchema
-from .productos import ProductoSchema, ProductoResponseSchema
-from .ventas import PedidoCreateSchema, PedidoResponseSchema
-from .tesoreria import TransaccionSchema, TransaccionResponseSchema
-from .common_schemas import TipoDocumentoSchema, DepartamentoSchema, CiudadSchema
-from .auth_schemas import LoginSchema, LoginResponse
-from .role_schemas import RoleBase, RoleCreate, RoleRead, PaginatedRoles
-from. org_schemas import OrganizacionBase, PaginatedTiendasVirtuales, PaginatedNumeraciones,OrganizacionCreate, PaginatedCentrosCostos,PaginatedCajas, OrganizacionRead, SucursalNested, PaginatedBodegas, NumeracionTransaccionBase, NumeracionTransaccionCreate, NumeracionTransaccionRead, SucursalBase, SucursalCreate, SucursalRead, TiendaVirtualBase, TiendaVirtualCreate, TiendaVirtualRead, BodegaBase, BodegaCreate, BodegaRead, CentroCostoBase, CentroCostoCreate, CentroCostoRead, CajaBase, CajaCreate, CajaRead, CuentaBancariaBase, CuentaBancariaCreate, CuentaBancariaRead, SucursalUpdate, PaginatedSucursales
-from .plan_schemas import PlanBase, PlanCreate, PlanRead
-from .user_schemas import UserBase, UserCreate, UserRead, EstadoUsuario, UserUpdate, PaginatedUsers, UserReadExtended
-from .permission_schemas import PermissionBase, PermissionCreate, PermissionRead, PaginatedPermissions
\ No newline at end of file
+# gestion_negocio/schemas/__init__.py
+
+"""
+Los esquemas se importan desde su módulo (schemas.clientes, ...).
+
+`from schemas import X` sigue funcionando, pero importa solo el módulo de X
+cuando se pide (PEP 562): importar un submódulo ya no arrastra todos los
+esquemas de la app al arranque.
+"""
+
+import importlib
+
+_MODULOS = {
+    "ClienteSchema": "clientes",
+    "ClienteResponseSchema": "clientes",
+    "PaginatedClientes": "clientes",
+    "ClienteUpdateSchema": "clientes",
+    "ProveedorSchema": "proveedores",
+    "ProveedorResponseSchema": "proveedores",
+    "PaginatedProveedores": "proveedores",
+    "ProveedorUpdateSchema": "proveedores",
+    "EmpleadoBase": "empleados",
+    "EmpleadoResponseSchema": "empleados",
+    "EmpleadoCreateUpdateSchema": "empleados",
+    "PaginatedEmpleados": "empleados",
+    "EmpleadoPatchSchema": "empleados",
+    "CuentaWalletSchema": "cuentas_wallet",
+    "CuentaWalletResponseSchema": "cuentas_wallet",
+    "ChatSchema": "chats",
+    "ChatResponseSchema": "chats",
+    "ProductoSchema": "productos",
+    "ProductoResponseSchema": "productos",
+    "PedidoCreateSchema": "ventas",
+    "PedidoResponseSchema": "ventas",
+    "TransaccionSchema": "tesoreria",
+    "TransaccionResponseSchema": "tesoreria",
+    "TipoDocumentoSchema": "common_schemas",
+    "DepartamentoSchema": "common_schemas",
+    "CiudadSchema": "common_schemas",
+    "LoginSchema": "auth_schemas",
+    "LoginResponse": "auth_schemas",
+    "RoleBase": "role_schemas",
+    "RoleCreate": "role_schemas",
+    "RoleRead": "role_schemas",
+    "PaginatedRoles": "role_schemas",
+    "OrganizacionBase": "org_schemas",
+    "PaginatedTiendasVirtuales": "org_schemas",
+    "PaginatedNumeraciones": "org_schemas",
+    "OrganizacionCreate": "org_schemas",
+    "PaginatedCentrosCostos": "org_schemas",
+    "PaginatedCajas": "org_schemas",
+    "OrganizacionRead": "org_schemas",
+    "SucursalNested": "org_schemas",
+    "PaginatedBodegas": "org_schemas",
+    "NumeracionTransaccionBase": "org_schemas",
+    "NumeracionTransaccionCreate": "org_schemas",
+    "NumeracionTransaccionRead": "org_schemas",
+    "SucursalBase": "org_schemas",
+    "SucursalCreate": "org_schemas",
+    "SucursalRead": "org_schemas",
+    "TiendaVirtualBase": "org_schemas",
+    "TiendaVirtualCreate": "org_schemas",
+    "TiendaVirtualRead": "org_schemas",
+    "BodegaBase": "org_schemas",
+    "BodegaCreate": "org_schemas",
+    "BodegaRead": "org_schemas",
+    "CentroCostoBase": "org_schemas",
+    "CentroCostoCreate": "org_schemas",
+    "CentroCostoRead": "org_schemas",
+    "CajaBase": "org_schemas",
+    "CajaCreate": "org_schemas",
+    "CajaRead": "org_schemas",
+    "CuentaBancariaBase": "org_schemas",
+    "CuentaBancariaCreate": "org_schemas",
+    "CuentaBancariaRead": "org_schemas",
+    "SucursalUpdate": "org_schemas",
+    "PaginatedSucursales": "org_schemas",
+    "OrganizacionOverview": "org_schemas",
+    "PlanBase": "plan_schemas",
+    "PlanCreate": "plan_schemas",
+    "PlanRead": "plan_schemas",
+    "UserBase": "user_schemas",
+    "UserCreate": "user_schemas",
+    "UserRead": "user_schemas",
+    "EstadoUsuario": "user_schemas",
+    "UserUpdate": "user_schemas",
+    "PaginatedUsers": "user_schemas",
+    "UserReadExtended": "user_schemas",
+    "PermissionBase": "permission_schemas",
+    "PermissionCreate": "permission_schemas",
+    "PermissionRead": "permission_schemas",
+    "PaginatedPermissions": "permission_schemas",
+}
+
+
+def __getattr__(nombre):
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    return getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULOS))
@@ -0,0 +1,23 @@
+# gestion_negocio/schemas/batch_schemas.py
+
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, field_validator
+
+
+class SubPeticion(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str               # con query string si hace falta: "/clientes?page=2"
+    body: Optional[Any] = None
+
+    @field_validator("method", mode="before")
+    @classmethod
+    def mayusculas(cls, valor):
+        return valor.upper() if isinstance(valor, str) else valor
+
+    @field_validator("path")
+    @classmethod
+    def ruta_absoluta(cls, valor: str) -> str:
+        if not valor.startswith("/"):
+            raise ValueError("La ruta debe empezar con '/'")
+        return valor
@@ -0,0 +1,37 @@
+# gestion_negocio/schemas/bootstrap_schemas.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .org_schemas import OrganizacionRead
+from .plan_schemas import PlanRead
+from .role_schemas import RoleRead
+from .user_schemas import UserRead
+
+
+class OrganizacionConPlan(OrganizacionRead):
+    plan: Optional[PlanRead] = None
+
+    class Config:
+        from_attributes = True
+
+
+class VersionesReferencias(BaseModel):
+    """
+    Huella del contenido de cada tabla de referencia (cambia solo si la
+    tabla cambió). Vacío si el registro aún no se cargó.
+    """
+    version: int
+    cargado_en: Optional[datetime] = None
+    catalogos: Dict[str, str]
+    ubicaciones: Dict[str, str]
+
+
+class BootstrapResponse(BaseModel):
+    usuario: UserRead
+    organizacion: Optional[OrganizacionConPlan] = None
+    rol: Optional[RoleRead] = None
+    permisos: List[str]
+    referencias: VersionesReferencias
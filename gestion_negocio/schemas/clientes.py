@@ -1,20 +1,21 @@
 # gestion_negocio/schemas/clientes.py
 
 from pydantic import BaseModel, EmailStr, Field, model_validator, field_validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 # Si deseas reutilizar esquemas para datos relacionados
 # (ej. tipo_documento, departamento, ciudad), los importas desde tus common_schemas:
 from .common_schemas import (
     TipoDocumentoSchema,
     DepartamentoSchema,
-    CiudadSchema
+    CiudadSchema,
+    ReferenciasMixin
 )
 
 # ───────────────────────────────────────────────────────────
 # 🔹 ESQUEMA BÁSICO DEL CLIENTE (Para crear / actualizar)
 # ───────────────────────────────────────────────────────────
-class ClienteSchema(BaseModel):
+class ClienteSchema(ReferenciasMixin):
     """
     Esquema base para crear/actualizar un Cliente.
     NO realiza consultas a la BD (toda lógica avanzada va a services/).
@@ -75,6 +76,13 @@ class ClienteSchema(BaseModel):
     departamento: Optional[DepartamentoSchema] = None
     ciudad: Optional[CiudadSchema] = None
 
+    # Relaciones que se completan desde el registro de referencias (sin joins)
+    _referencias = {
+        "tipo_documento": ("tipos_documento", "tipo_documento_id"),
+        "departamento": ("departamentos", "departamento_id"),
+        "ciudad": ("ciudades", "ciudad_id"),
+    }
+
     # Validación que exige al menos un número de contacto
     @model_validator(mode="after")
     def validar_contacto(self):
@@ -169,3 +177,18 @@ class PaginatedClientes(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ───────────────────────────────────────────────────────────
+# 🔹 RESPUESTA PAGINADA PARCIAL (fields= / view=)
+#    Cada item trae solo los campos pedidos (id siempre incluido).
+# ───────────────────────────────────────────────────────────
+class PaginatedClientesParcial(BaseModel):
+    """
+    Misma estructura que PaginatedClientes, pero 'data' es una lista de
+    dicts con únicamente los campos proyectados.
+    """
+    data: List[Dict[str, Any]]
+    page: int
+    total_paginas: int
+    total_registros: int
@@ -1,5 +1,9 @@
 # common_schemas.py
-from pydantic import BaseModel
+from typing import Any, ClassVar
+
+from pydantic import BaseModel, model_validator
+
+from services.referencias_service import obtener_referencias
 
 class TipoDocumentoSchema(BaseModel):
     id: int
@@ -22,3 +26,37 @@ class CiudadSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ReferenciasMixin(BaseModel):
+    """
+    Completa relaciones a tablas de referencia (tipo_documento, departamento,
+    ciudad, ...) desde el registro en memoria en vez de cargarlas de la BD.
+
+    Cada esquema declara en `_referencias` el campo anidado => (tabla del
+    registro, campo con el id). Solo actúa al validar objetos ORM: si la
+    relación ya venía cargada se usa tal cual; si no, se busca por id sin
+    disparar lazy loads.
+    """
+    _referencias: ClassVar[dict] = {}
+
+    @model_validator(mode="before")
+    @classmethod
+    def _hidratar_referencias(cls, data: Any) -> Any:
+        if isinstance(data, dict) or not cls._referencias or not hasattr(data, "__dict__"):
+            return data
+
+        referencias = obtener_referencias()
+        cargado = data.__dict__
+        valores = {}
+        for nombre in cls.model_fields:
+            if nombre in cls._referencias:
+                if nombre in cargado:
+                    valores[nombre] = cargado[nombre]
+                else:
+                    tabla, campo_id = cls._referencias[nombre]
+                    fila = referencias.get(tabla, getattr(data, campo_id, None))
+                    valores[nombre] = dict(fila) if fila is not None else None
+            elif hasattr(data, nombre):
+                valores[nombre] = getattr(data, nombre)
+        return valores
@@ -6,10 +6,11 @@ from datetime import date
 from .common_schemas import (
     TipoDocumentoSchema,
     DepartamentoSchema,
-    CiudadSchema
+    CiudadSchema,
+    ReferenciasMixin
 )
 
-class EmpleadoBase(BaseModel):
+class EmpleadoBase(ReferenciasMixin):
     """
     Esquema base para crear / actualizar un Empleado,
     sin consultas a la BD (toda lógica de unicidad y DV en la capa de servicios).
@@ -56,6 +57,11 @@ class EmpleadoBase(BaseModel):
 
     observacion: Optional[str] = None
 
+    # Relación que se completa desde el registro de referencias (sin joins)
+    _referencias = {
+        "tipo_documento": ("tipos_documento", "tipo_documento_id"),
+    }
+
     @model_validator(mode="after")
     def validar_contacto(self):
         """
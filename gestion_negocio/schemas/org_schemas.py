@@ -5,7 +5,8 @@ from datetime import datetime
 from .common_schemas import (
     TipoDocumentoSchema,
     DepartamentoSchema,
-    CiudadSchema
+    CiudadSchema,
+    ReferenciasMixin
 )
 
 class OrganizacionBase(BaseModel):
@@ -95,7 +96,7 @@ class SucursalBase(BaseModel):
 class SucursalCreate(SucursalBase):
     organizacion_id: int
 
-class SucursalRead(SucursalBase):
+class SucursalRead(ReferenciasMixin, SucursalBase):
     id: int
     organizacion_id: int
     nombre: str
@@ -108,10 +109,15 @@ class SucursalRead(SucursalBase):
     sucursal_principal: bool
     activa: bool
 
-    # 🔹 Relación:
+    # 🔹 Relación (se completa desde el registro de referencias, sin joins):
     departamento: Optional[DepartamentoSchema] = None
     ciudad: Optional[CiudadSchema] = None
 
+    _referencias = {
+        "departamento": ("departamentos", "departamento_id"),
+        "ciudad": ("ciudades", "ciudad_id"),
+    }
+
     class Config:
         from_attributes = True
 
@@ -284,3 +290,35 @@ class CuentaBancariaRead(CuentaBancariaBase):
     
     class Config:
         from_attributes = True
+
+class OrganizacionPlanEstado(BaseModel):
+    plan_id: Optional[int] = None
+    nombre_plan: Optional[str] = None
+    max_usuarios: Optional[int] = None
+    max_empleados: Optional[int] = None
+    max_sucursales: Optional[int] = None
+    fecha_inicio_plan: Optional[datetime] = None
+    fecha_fin_plan: Optional[datetime] = None
+    trial_activo: bool = False
+    plan_vigente: bool = False
+    dias_restantes: Optional[int] = None
+
+class OrganizacionConteos(BaseModel):
+    sucursales: int = 0
+    bodegas: int = 0
+    cajas: int = 0
+    centros_costos: int = 0
+    tiendas_virtuales: int = 0
+    numeraciones: int = 0
+    usuarios: int = 0
+
+class OrganizacionOverview(BaseModel):
+    """
+    Resumen para la pantalla de inicio del admin:
+    conteos de sub-entidades + estado del plan / trial.
+    """
+    organizacion_id: int
+    nombre_fiscal: str
+    estado: str
+    plan: OrganizacionPlanEstado
+    conteos: OrganizacionConteos
@@ -16,3 +16,17 @@ class ProductoResponseSchema(ProductoSchema):
 
     class Config:
         from_attributes = True
+
+class ProductoSyncSchema(BaseModel):
+    """Fila de productos tal como está en la tabla (GET /sync/productos)."""
+    id: int
+    nombre: str
+    codigo_barras: Optional[str] = None
+    categoria_id: Optional[int] = None
+    precio: Decimal
+    stock: int
+    unidad_medida: str
+    datos_adicionales: Optional[str] = None
+
+    class Config:
+        from_attributes = True
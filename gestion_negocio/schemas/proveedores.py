@@ -7,10 +7,11 @@ from typing import Optional, List
 from .common_schemas import (
     TipoDocumentoSchema,
     DepartamentoSchema,
-    CiudadSchema
+    CiudadSchema,
+    ReferenciasMixin
 )
 
-class ProveedorSchema(BaseModel):
+class ProveedorSchema(ReferenciasMixin):
     """
     Esquema base para crear/actualizar un Proveedor
     (sin llamadas directas a la BD).
@@ -62,6 +63,13 @@ class ProveedorSchema(BaseModel):
     departamento: Optional[DepartamentoSchema] = None
     ciudad: Optional[CiudadSchema] = None
 
+    # Relaciones que se completan desde el registro de referencias (sin joins)
+    _referencias = {
+        "tipo_documento": ("tipos_documento", "tipo_documento_id"),
+        "departamento": ("departamentos", "departamento_id"),
+        "ciudad": ("ciudades", "ciudad_id"),
+    }
+
     @model_validator(mode="after")
     def validar_contacto(self):
         """
@@ -0,0 +1,35 @@
+# gestion_negocio/schemas/trabajo_schemas.py
+
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TrabajoCreate(BaseModel):
+    tipo: str
+    payload: dict = Field(default_factory=dict)
+    # A menor número => se atiende antes
+    prioridad: int = Field(100, ge=0, le=1000)
+
+
+class TrabajoRead(BaseModel):
+    id: int
+    tipo: str
+    estado: str
+    prioridad: int
+    organizacion_id: Optional[int] = None
+    creado_por: Optional[int] = None
+    intentos: int
+    max_intentos: int
+    progreso: Optional[float] = None
+    mensaje_progreso: Optional[str] = None
+    resultado: Optional[Any] = None
+    error: Optional[str] = None
+    disponible_en: datetime
+    fecha_creacion: datetime
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -2,6 +2,7 @@
 
 from models.auditoria import AuditLog
 from sqlalchemy.ext.asyncio import AsyncSession
+from services.escritura_service import insertar_returning
 
 async def log_event(
     db: AsyncSession,
@@ -20,14 +21,12 @@ async def log_event(
     :param ip_origen: (Opcional) IP origen del evento, si se desea registrar.
     :return: El registro de auditoría recién creado (objeto AuditLog).
     """
-    log_record = AuditLog(
+    # INSERT ... RETURNING: id y fecha_evento vuelven sin un SELECT extra
+    log_record = await insertar_returning(db, AuditLog, dict(
         usuario_id=usuario_id,
         tipo_evento=tipo_evento,
         detalle=detalle,
         ip_origen=ip_origen
-    )
-
-    db.add(log_record)
+    ))
     await db.commit()
-    await db.refresh(log_record)
     return log_record
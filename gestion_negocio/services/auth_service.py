@@ -1,4 +1,5 @@
 import os
+import logging
 import datetime
 import jwt
 import bcrypt
@@ -6,13 +7,14 @@ import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from models.usuarios import Usuario, EstadoUsuario
 
 JWT_SECRET = os.getenv("JWT_SECRET", "secret_key")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 60))
-print("DEBUG => JWT_EXPIRE_MINUTES:", JWT_EXPIRE_MINUTES)
+logging.getLogger(__name__).debug("JWT_EXPIRE_MINUTES: %s", JWT_EXPIRE_MINUTES)
 
 def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -39,7 +41,9 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    # bcrypt tarda ~200 ms de CPU (y libera el GIL): en el threadpool no
+    # bloquea el event loop para el resto de las peticiones
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
         return None
 
     if user.estado != EstadoUsuario.activo:
@@ -0,0 +1,41 @@
+# gestion_negocio/services/cache_service.py
+
+import time
+from typing import Any, Hashable, Optional
+
+
+class CacheTTL:
+    """
+    Caché en memoria del proceso con expiración por entrada.
+
+    Cada worker de Gunicorn tiene su propia instancia: las invalidaciones
+    explícitas solo alcanzan al worker que hizo la escritura, y el TTL
+    acota cuánto puede quedar desactualizado el resto.
+    """
+
+    def __init__(self, ttl_segundos: float, max_entradas: int = 1024):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._datos: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            return None
+        expira, valor = entrada
+        if expira < time.monotonic():
+            self._datos.pop(clave, None)
+            return None
+        return valor
+
+    def set(self, clave: Hashable, valor: Any) -> None:
+        if clave not in self._datos and len(self._datos) >= self.max_entradas:
+            # Se descarta la entrada más antigua (orden de inserción del dict)
+            self._datos.pop(next(iter(self._datos)), None)
+        self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+
+    def invalidar(self, clave: Hashable) -> None:
+        self._datos.pop(clave, None)
+
+    def limpiar(self) -> None:
+        self._datos.clear()
@@ -7,13 +7,10 @@ from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
 
 from models.clientes import Cliente
-from models.organizaciones import Sucursal
 from schemas.clientes import ClienteSchema
-from services.common_validations import (
-    validate_documento_unico,
-    validate_sucursal_same_org
-)
+from services.common_validations import validar_referencias
 from services.dv_calculator import calc_dv_if_nit
+from services.integridad_service import traducir_integridad
 
 
 async def create_cliente(db: AsyncSession, data: ClienteSchema) -> Cliente:
@@ -23,22 +20,10 @@ async def create_cliente(db: AsyncSession, data: ClienteSchema) -> Cliente:
       - Verifica si sucursal_id pertenece a la misma organización (si no es None).
       - Calcula DV si es NIT.
     """
-    # 1) Verificar unicidad: (organizacion_id, numero_documento)
-    await validate_documento_unico(
-        db=db,
-        model_class=Cliente,
-        organizacion_id=data.organizacion_id,
-        numero_documento=data.numero_documento
-    )
+    # 1) Unicidad (organizacion_id, numero_documento): la valida uq_cliente_org_doc al guardar
 
-    # 2) Verificar sucursal pertenece a la misma org (si data.sucursal_id existe)
-    if data.sucursal_id is not None:
-        await validate_sucursal_same_org(
-            db=db,
-            sucursal_id=data.sucursal_id,
-            organizacion_id=data.organizacion_id,
-            SucursalModel=Sucursal
-        )
+    # 2) Referencias (catálogos, sucursal, vendedor...): todas a la vez
+    await validar_referencias(db, Cliente, data.dict(), data.organizacion_id)
 
     # 3) Calcular DV si es NIT
     dv_calculado = calc_dv_if_nit(data.tipo_documento_id, data.numero_documento)
@@ -76,7 +61,8 @@ async def create_cliente(db: AsyncSession, data: ClienteSchema) -> Cliente:
         observacion=data.observacion
     )
     db.add(nuevo_cliente)
-    await db.commit()
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(nuevo_cliente)
     return nuevo_cliente
 
@@ -100,23 +86,10 @@ async def update_cliente(db: AsyncSession, cliente_id: int, data: ClienteSchema)
         # Podrías permitirlo y volver a validar la unicidad en la nueva org
         pass
 
-    # 1) Si el numero_documento cambió => check unicidad
-    if data.numero_documento != cliente.numero_documento:
-        await validate_documento_unico(
-            db=db,
-            model_class=Cliente,
-            organizacion_id=data.organizacion_id,
-            numero_documento=data.numero_documento
-        )
-
-    # 2) Si sucursal_id cambió => validar org
-    if data.sucursal_id is not None and data.sucursal_id != cliente.sucursal_id:
-        await validate_sucursal_same_org(
-            db=db,
-            sucursal_id=data.sucursal_id,
-            organizacion_id=data.organizacion_id,
-            SucursalModel=Sucursal
-        )
+    # 1) Unicidad (organizacion_id, numero_documento): la valida uq_cliente_org_doc al guardar
+
+    # 2) Referencias (catálogos, sucursal, vendedor...): todas a la vez
+    await validar_referencias(db, Cliente, data.dict(), data.organizacion_id)
 
     # 3) Recalcular DV si es NIT
     dv_calculado = calc_dv_if_nit(data.tipo_documento_id, data.numero_documento)
@@ -151,7 +124,8 @@ async def update_cliente(db: AsyncSession, cliente_id: int, data: ClienteSchema)
     cliente.vendedor_id = data.vendedor_id
     cliente.observacion = data.observacion
 
-    await db.commit()
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(cliente)
     return cliente
 
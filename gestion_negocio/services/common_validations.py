@@ -1,55 +1,161 @@
 # gestion_negocio/services/common_validations.py
 
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Integer, inspect, literal, select, union_all
 
+from services.referencias_service import TABLAS_REFERENCIA, obtener_referencias
+
+# __tablename__ => clave en el registro de referencias
+_TABLA_A_REGISTRO = {
+    modelo.__tablename__: clave for clave, modelo in TABLAS_REFERENCIA.items()
+}
+
+# Nombres legibles para los mensajes (el resto: "el registro de <tabla>")
+_NOMBRES_TENANT = {
+    "sucursales": "la sucursal",
+    "empleados": "el empleado",
+}
+
+
+class ReferenciasInvalidas(ValueError):
+    """
+    Uno o más ids referenciados no existen o pertenecen a otra organización.
+    `errores` tiene la misma forma que los errores de validación de FastAPI.
+    """
+
+    def __init__(self, errores: list):
+        super().__init__("; ".join(error["msg"] for error in errores))
+        self.errores = errores
+
+
+@lru_cache(maxsize=None)
+def _llaves_foraneas(modelo) -> tuple:
+    """
+    (campo, tabla destino, modelo destino o None) por cada FK del modelo,
+    salvo organizacion_id (el tenant mismo).
+    """
+    mapper = inspect(modelo)
+    modelos_por_tabla = {
+        m.local_table.name: m.class_ for m in mapper.registry.mappers
+    }
+    llaves = []
+    for atributo in mapper.column_attrs:
+        columna = atributo.columns[0]
+        if atributo.key == "organizacion_id":
+            continue
+        for fk in columna.foreign_keys:
+            tabla = fk.column.table.name
+            llaves.append((atributo.key, tabla, modelos_por_tabla.get(tabla)))
+    return tuple(llaves)
+
+
+def _nombre(tabla: str) -> str:
+    return _NOMBRES_TENANT.get(tabla, f"el registro de {tabla}")
 
-async def validate_documento_unico(
-    db: AsyncSession,
-    model_class,
-    organizacion_id: int,
-    numero_documento: str
-):
-    """
-    Verifica que NO exista un registro en 'model_class' (Cliente, Empleado, etc.)
-    con la misma organizacion_id y numero_documento.
-    Lanza ValueError si ya existe.
-    """
-    stmt = (
-        select(model_class)
-        .where(model_class.organizacion_id == organizacion_id)
-        .where(model_class.numero_documento == numero_documento)
-    )
-    result = await db.execute(stmt)
-    instance = result.scalars().first()
-
-    if instance:
-        raise ValueError(
-            f"El número de documento '{numero_documento}' "
-            f"ya está registrado en la organización {organizacion_id}."
-        )
 
+def _error(campo: str, mensaje: str, valor) -> dict:
+    return {
+        "type": "referencia_invalida",
+        "loc": ["body", campo],
+        "msg": mensaje,
+        "input": valor,
+    }
 
-async def validate_sucursal_same_org(
+
+async def validar_referencias(
     db: AsyncSession,
-    sucursal_id: int,
-    organizacion_id: int,
-    SucursalModel
-):
-    """
-    Verifica que la sucursal (sucursal_id) pertenezca
-    a la misma organizacion_id.
-    Lanza ValueError si no coincide o no existe.
-    """
-    stmt = select(SucursalModel).where(SucursalModel.id == sucursal_id)
-    result = await db.execute(stmt)
-    sucursal = result.scalars().first()
-
-    if not sucursal:
-        raise ValueError(f"No existe la sucursal con ID={sucursal_id}.")
-
-    if sucursal.organizacion_id != organizacion_id:
-        raise ValueError(
-            f"La sucursal {sucursal_id} pertenece a otra organización "
-            f"(ID {sucursal.organizacion_id}), no a {organizacion_id}."
+    modelo,
+    valores: dict,
+    organizacion_id: Optional[int]
+) -> None:
+    """
+    Valida TODAS las FKs presentes en `valores` (ids no nulos) de una vez:
+
+    - Catálogos y ubicaciones: contra el registro en memoria, sin consultas.
+    - Filas de la organización (sucursal, vendedor, ...): existencia y que
+      pertenezcan a `organizacion_id`, en UNA sola consulta UNION ALL.
+
+    Lanza ReferenciasInvalidas con la lista completa de violaciones.
+    """
+    referencias = obtener_referencias()
+    errores = []
+    consultas = []
+    pendientes = []  # (campo, tabla, valor) que se resuelven con la consulta
+
+    for campo, tabla, destino in _llaves_foraneas(modelo):
+        valor = valores.get(campo)
+        if valor is None:
+            continue
+
+        clave = _TABLA_A_REGISTRO.get(tabla)
+        if clave is not None and referencias.cargado:
+            if not referencias.existe(clave, valor):
+                errores.append(_error(campo, f"No existe {_nombre(tabla)} con ID={valor}.", valor))
+            continue
+
+        if destino is None:
+            continue
+        columnas = inspect(destino).columns
+        if "organizacion_id" in columnas:
+            org_col = columnas["organizacion_id"]
+        elif clave is not None:
+            # Catálogo sin registro cargado: solo existencia
+            org_col = literal(None, Integer)
+        else:
+            # Otras tablas globales: las valida la FK de la BD
+            continue
+        consultas.append(
+            select(
+                literal(campo).label("campo"),
+                columnas["id"].label("id"),
+                org_col.label("organizacion_id"),
+            ).where(columnas["id"] == valor)
         )
+        pendientes.append((campo, tabla, valor))
+
+    if consultas:
+        stmt = consultas[0] if len(consultas) == 1 else union_all(*consultas)
+        encontrados = {fila.campo: fila for fila in (await db.execute(stmt))}
+        for campo, tabla, valor in pendientes:
+            fila = encontrados.get(campo)
+            nombre = _nombre(tabla)
+            if fila is None:
+                errores.append(_error(campo, f"No existe {nombre} con ID={valor}.", valor))
+            elif fila.organizacion_id is not None and fila.organizacion_id != organizacion_id:
+                errores.append(_error(
+                    campo,
+                    f"{nombre.capitalize()} {valor} pertenece a otra organización.",
+                    valor
+                ))
+
+    if errores:
+        raise ReferenciasInvalidas(errores)
+
+
+async def validar_referencias_parcial(db: AsyncSession, modelo, campos: dict, actual) -> None:
+    """
+    validar_referencias para un PATCH: las FKs enviadas en `campos` contra la
+    organización efectiva (la nueva si cambia). Si cambia la organización,
+    también las FKs de filas de la organización que `actual` ya tenía y no
+    se envían (sucursal, vendedor): dejarían el registro apuntando a otro
+    tenant.
+    """
+    organizacion_id = campos.get("organizacion_id", actual.organizacion_id)
+    valores = dict(campos)
+    if organizacion_id != actual.organizacion_id:
+        for campo, _tabla, destino in _llaves_foraneas(modelo):
+            if campo in valores or destino is None:
+                continue
+            if "organizacion_id" in inspect(destino).columns:
+                valores[campo] = getattr(actual, campo)
+    await validar_referencias(db, modelo, valores, organizacion_id)
+
+
+async def manejar_referencias_invalidas(request: Request, exc: ReferenciasInvalidas):
+    """Exception handler de la app: 422 con todas las violaciones."""
+    return JSONResponse(status_code=422, content={"detail": exc.errores})
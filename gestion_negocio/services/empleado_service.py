@@ -3,30 +3,16 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.empleados import Empleado
-from models.organizaciones import Sucursal
 from schemas.empleados import EmpleadoCreateUpdateSchema
-from services.common_validations import (
-    validate_documento_unico,
-    validate_sucursal_same_org
-)
+from services.common_validations import validar_referencias
 from services.dv_calculator import calc_dv_if_nit
+from services.integridad_service import traducir_integridad
 
 async def create_empleado(db: AsyncSession, data: EmpleadoCreateUpdateSchema) -> Empleado:
-    # 1. Verificar que (organizacion_id, numero_documento) no exista
-    await validate_documento_unico(
-        db=db,
-        model_class=Empleado,
-        organizacion_id=data.organizacion_id,
-        numero_documento=data.numero_documento
-    )
+    # 1. Unicidad (organizacion_id, numero_documento): la valida uq_empleado_org_doc al guardar
 
-    # 2. Verificar que la sucursal pertenece a la misma org
-    await validate_sucursal_same_org(
-        db=db,
-        sucursal_id=data.sucursal_id,
-        organizacion_id=data.organizacion_id,
-        SucursalModel=Sucursal
-    )
+    # 2. Referencias (catálogos, sucursal, vendedor...): todas a la vez
+    await validar_referencias(db, Empleado, data.dict(), data.organizacion_id)
 
     # 3. Calcular DV si es NIT
     dv = calc_dv_if_nit(data.tipo_documento_id, data.numero_documento)
@@ -63,6 +49,7 @@ async def create_empleado(db: AsyncSession, data: EmpleadoCreateUpdateSchema) ->
 
     # Agregar y confirmar cambios
     db.add(empleado)
-    await db.commit()
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(empleado)
     return empleado
@@ -0,0 +1,133 @@
+# gestion_negocio/services/escritura_service.py
+
+"""
+Escrituras con INSERT/UPDATE ... RETURNING.
+
+El patrón `db.add(obj)` / `commit()` / `refresh(obj)` cuesta un SELECT extra
+por cada escritura (y a veces una tercera consulta para recargar relaciones).
+Estas funciones emiten UNA sentencia que devuelve la fila completa, ya como
+instancia ORM (queda en el identity map de la sesión), lista para el
+response_model:
+
+    bodega = await insertar_returning(
+        db, Bodega, {...}, anidados={"sucursal": ("nombre",)}
+    )
+    await db.commit()
+    return bodega
+
+- Las relaciones a tablas de referencia (tipo_documento, ciudad, ...) las
+  completa el registro en memoria (ReferenciasMixin), no hace falta pedirlas.
+- `anidados` es para relaciones many-to-one que el esquema de respuesta
+  anida (p.ej. BodegaRead.sucursal): las columnas pedidas se agregan al
+  RETURNING como subconsultas escalares y se asignan a la relación sin
+  disparar lazy loads.
+
+Como no pasan por el flush del ORM, los @validates del modelo no se
+ejecutan: el handler debe entregar los valores ya normalizados (DV, etc.).
+"""
+
+from typing import Optional
+
+from sqlalchemy import inspect, insert, select, update
+from sqlalchemy.orm import aliased, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _relacion(modelo, nombre: str):
+    rel = inspect(modelo).relationships[nombre]
+    (fk,) = rel.local_columns
+    return rel.mapper.class_, fk
+
+
+def _columnas_anidadas(modelo, anidados: dict, valores: Optional[dict]) -> list:
+    """
+    Subconsultas escalares para el RETURNING. En INSERT el id relacionado se
+    toma de `valores` (PostgreSQL no correlaciona con la fila insertada); en
+    UPDATE se correlaciona con la columna FK de la fila actualizada.
+    """
+    columnas = []
+    for nombre, campos in anidados.items():
+        destino, fk = _relacion(modelo, nombre)
+        alias = aliased(destino)
+        if valores is not None:
+            condicion = alias.id == valores.get(fk.key)
+        else:
+            condicion = alias.id == getattr(modelo, fk.key)
+        for campo in campos:
+            subconsulta = select(getattr(alias, campo)).where(condicion)
+            if valores is None:
+                subconsulta = subconsulta.correlate(modelo)
+            columnas.append(subconsulta.scalar_subquery().label(f"{nombre}__{campo}"))
+    return columnas
+
+
+async def _asignar_anidados(db: AsyncSession, modelo, obj, fila, anidados: dict):
+    for nombre, campos in anidados.items():
+        destino, fk = _relacion(modelo, nombre)
+        id_relacionado = getattr(obj, fk.key)
+        relacionado = None
+        if id_relacionado is not None:
+            relacionado = destino(id=id_relacionado, **{
+                campo: fila._mapping[f"{nombre}__{campo}"] for campo in campos
+            })
+            # Instancia "ya cargada" con solo esas columnas; merge(load=False)
+            # la enlaza al identity map sin consultar la BD.
+            make_transient_to_detached(relacionado)
+            relacionado = await db.merge(relacionado, load=False)
+        set_committed_value(obj, nombre, relacionado)
+
+
+async def insertar_returning(
+    db: AsyncSession,
+    modelo,
+    valores: dict,
+    anidados: Optional[dict] = None
+):
+    """INSERT ... RETURNING <todas las columnas> (+ anidados). Retorna la instancia ORM."""
+    anidados = anidados or {}
+    stmt = (
+        insert(modelo)
+        .values(**valores)
+        .returning(modelo, *_columnas_anidadas(modelo, anidados, valores))
+    )
+    fila = (await db.execute(stmt)).one()
+    obj = fila[0]
+    await _asignar_anidados(db, modelo, obj, fila, anidados)
+    return obj
+
+
+async def actualizar_returning(
+    db: AsyncSession,
+    modelo,
+    filtros: list,
+    valores: dict,
+    anidados: Optional[dict] = None
+):
+    """
+    UPDATE ... WHERE <filtros> RETURNING <todas las columnas> (+ anidados).
+    Retorna la instancia ORM actualizada, o None si ninguna fila coincide.
+    Si la entidad ya estaba cargada en la sesión, se actualiza esa misma instancia.
+    """
+    anidados = anidados or {}
+    if not valores:
+        # Nada que actualizar: solo se lee la fila (misma forma de respuesta)
+        stmt = (
+            select(modelo, *_columnas_anidadas(modelo, anidados, None))
+            .where(*filtros)
+            .execution_options(populate_existing=True)
+        )
+    else:
+        stmt = (
+            update(modelo)
+            .where(*filtros)
+            .values(**valores)
+            .returning(modelo, *_columnas_anidadas(modelo, anidados, None))
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+    fila = (await db.execute(stmt)).one_or_none()
+    if fila is None:
+        return None
+    obj = fila[0]
+    await _asignar_anidados(db, modelo, obj, fila, anidados)
+    return obj
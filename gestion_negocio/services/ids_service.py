@@ -0,0 +1,74 @@
+# gestion_negocio/services/ids_service.py
+
+"""
+Consulta de varios registros por id en una sola sentencia (`?ids=3,1,2`).
+
+    WHERE id = ANY(:ids) AND organizacion_id = :org
+
+Un solo parámetro de tipo arreglo (no un IN con un parámetro por id): la
+sentencia es la misma para 1 o 100 ids, así asyncpg reutiliza la sentencia
+preparada y pg_stat_statements la agrupa en una sola entrada.
+
+El resultado se devuelve en el orden pedido; los ids que no existen (o son
+de otra organización) se omiten.
+"""
+
+from sqlalchemy import Integer, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from models.usuarios import TipoUsuario
+
+IDS_MAX = 100
+
+
+def parsear_ids(texto: str) -> list[int]:
+    """
+    '3,1,2' => [3, 1, 2], sin duplicados y en el orden pedido.
+    Lanza ValueError si algún valor no es un entero o hay más de IDS_MAX.
+    """
+    ids = []
+    for parte in texto.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        try:
+            ids.append(int(parte))
+        except ValueError:
+            raise ValueError(f"ids inválido: '{parte}' no es un número")
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValueError("ids no puede estar vacío")
+    if len(ids) > IDS_MAX:
+        raise ValueError(f"Máximo {IDS_MAX} ids por consulta")
+    return ids
+
+
+def filtro_organizacion(modelo, usuario) -> list:
+    """Condición para `.where(...)`: la organización del usuario (superadmin: ninguna)."""
+    if usuario.tipo_usuario == TipoUsuario.superadmin:
+        return []
+    return [modelo.organizacion_id == usuario.organizacion_id]
+
+
+def filtros_ids(modelo, ids: list[int], usuario) -> list:
+    """Condiciones para `.where(...)`: id = ANY(:ids) y, salvo superadmin, la organización del usuario."""
+    return [modelo.id == any_(literal(ids, ARRAY(Integer))), *filtro_organizacion(modelo, usuario)]
+
+
+def ordenar_por_ids(filas, ids: list[int]) -> list:
+    """Reordena `filas` (objetos ORM o dicts con "id") según `ids`."""
+    por_id = {
+        (fila["id"] if isinstance(fila, dict) else fila.id): fila
+        for fila in filas
+    }
+    return [por_id[id_] for id_ in ids if id_ in por_id]
+
+
+def pagina_unica(filas: list) -> dict:
+    """Misma forma que los listados paginados, con todos los registros en una página."""
+    return {
+        "data": filas,
+        "page": 1,
+        "total_paginas": 1,
+        "total_registros": len(filas),
+    }
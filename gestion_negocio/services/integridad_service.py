@@ -0,0 +1,104 @@
+# gestion_negocio/services/integridad_service.py
+
+"""
+Traducción de IntegrityError a mensajes de negocio.
+
+La unicidad la garantizan las restricciones de la BD (UNIQUE y los índices
+únicos parciales), no un SELECT previo: el camino feliz es una sola
+sentencia y dos peticiones concurrentes ya no pueden colarse entre el
+chequeo y el INSERT. Si la BD rechaza la fila, el nombre de la restricción
+dice qué se duplicó y aquí se traduce al mismo 400 que antes daba el SELECT:
+
+    async with traducir_integridad(db):
+        cliente = await insertar_returning(db, Cliente, valores)
+        await db.commit()
+
+Los IntegrityError de restricciones no registradas se re-lanzan sin cambios.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Nombre de la restricción en PostgreSQL => mensaje (400) para el usuario
+MENSAJES_RESTRICCION = {
+    "uq_cliente_org_doc": "El número de identificación ya existe para esta organización.",
+    "uq_empleado_org_doc": "Documento duplicado en la misma organización.",
+    "uq_proveedor_org_doc": "El número de identificación ya está registrado en esta organización.",
+    "uq_cc_org_codigo": "Ya existe un centro de costo con ese código en esta organización.",
+    "uq_sucursal_principal_org": "Ya existe una sucursal principal en esta organización.",
+    "usuarios_email_key": "El email ya existe",
+    "permissions_nombre_key": "El nombre de permiso ya existe.",
+    "planes_nombre_plan_key": "Ya existe un plan con ese nombre.",
+}
+
+
+class ViolacionUnicidad(ValueError):
+    """La BD rechazó la escritura por una restricción conocida."""
+
+    def __init__(self, restriccion: str, mensaje: str):
+        super().__init__(mensaje)
+        self.restriccion = restriccion
+        self.mensaje = mensaje
+
+
+def nombre_restriccion(exc: IntegrityError) -> Optional[str]:
+    """Nombre de la restricción violada (asyncpg o psycopg), o None."""
+    origen = exc.orig
+    # Con asyncpg, SQLAlchemy envuelve la excepción del driver en __cause__
+    for candidato in (origen, getattr(origen, "__cause__", None)):
+        if candidato is None:
+            continue
+        nombre = getattr(candidato, "constraint_name", None)
+        if nombre:
+            return nombre
+        diag = getattr(candidato, "diag", None)
+        if diag is not None and getattr(diag, "constraint_name", None):
+            return diag.constraint_name
+    return None
+
+
+def mensaje_integridad(exc: IntegrityError, mensajes: Optional[dict] = None) -> Optional[str]:
+    restriccion = nombre_restriccion(exc)
+    if restriccion is None:
+        return None
+    return (mensajes or {}).get(restriccion) or MENSAJES_RESTRICCION.get(restriccion)
+
+
+@asynccontextmanager
+async def traducir_integridad(db: AsyncSession, mensajes: Optional[dict] = None):
+    """
+    Envuelve la escritura (y su commit). Si la BD la rechaza por una
+    restricción registrada, hace rollback y lanza ViolacionUnicidad.
+    `mensajes` permite que un endpoint use su propio texto para una
+    restricción (p.ej. el PATCH de clientes).
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        mensaje = mensaje_integridad(exc, mensajes)
+        if mensaje is None:
+            raise
+        await db.rollback()
+        raise ViolacionUnicidad(nombre_restriccion(exc), mensaje) from exc
+
+
+async def manejar_violacion_unicidad(request: Request, exc: ViolacionUnicidad):
+    """Exception handler de la app: misma forma que HTTPException(400)."""
+    return JSONResponse(status_code=400, content={"detail": exc.mensaje})
+
+
+async def manejar_integrity_error(request: Request, exc: IntegrityError):
+    """
+    Respaldo para escrituras que no usan `traducir_integridad`: si la
+    restricción es conocida responde 400 con su mensaje; si no, se deja
+    el 500 de siempre (la sesión hace rollback al cerrarse en get_db).
+    """
+    mensaje = mensaje_integridad(exc)
+    if mensaje is None:
+        raise exc
+    return JSONResponse(status_code=400, content={"detail": mensaje})
@@ -0,0 +1,164 @@
+# gestion_negocio/services/limite_service.py
+
+"""
+Limitación de intentos por token bucket.
+
+Cada clave (p.ej. "ip:1.2.3.4", "email:ana@x.com") tiene un balde de
+`capacidad` tokens que se recarga a `recarga` tokens por segundo; cada
+intento consume uno. Si no alcanza, se rechaza y se informa cuántos
+segundos faltan (Retry-After).
+
+El almacenamiento es intercambiable (BackendBuckets): por defecto vive en
+memoria del proceso, así que con varios workers cada uno lleva su propia
+cuenta (el límite efectivo es capacidad x workers). Para un límite
+compartido basta implementar `consumir` sobre un store común (Redis, ...)
+y pasarlo a `configurar_backend`.
+"""
+
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+
+class BackendBuckets(Protocol):
+    async def consumir(self, clave: str, capacidad: float, recarga: float, costo: float = 1.0) -> float:
+        """
+        Descuenta `costo` tokens del balde de `clave`.
+        Retorna 0.0 si se permitió, o los segundos hasta que alcance.
+        """
+        ...
+
+
+class _Shard:
+    __slots__ = ("lock", "baldes")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # clave => [tokens, instante de la última recarga, capacidad, recarga],
+        # del uso menos reciente al más reciente
+        self.baldes: OrderedDict[str, list] = OrderedDict()
+
+
+class BucketsEnMemoria:
+    """
+    Baldes en memoria repartidos en shards por hash de la clave. Cada shard
+    tiene su propio lock y su propio tope de claves: una ráfaga con miles
+    de emails distintos solo purga el shard donde cae, y nunca crece sin
+    límite.
+
+    Cada balde guarda su capacidad y su recarga (las claves de IP y de
+    email comparten shards con límites distintos). Con el shard lleno se
+    descartan primero los baldes ya recargados y después, en orden LRU,
+    los que deben a lo sumo un intento (descartarlos regala como mucho
+    ese intento, lo mismo que recibe la clave nueva). Un balde con más
+    intentos consumidos, el de una clave atacada, nunca se descarta: si
+    no hay otro, la clave nueva se rechaza (falla cerrado).
+    """
+
+    def __init__(self, shards: int = 16, max_claves_por_shard: int = 4096,
+                 reloj: Callable[[], float] = time.monotonic):
+        self.max_claves_por_shard = max_claves_por_shard
+        self._reloj = reloj
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def _shard(self, clave: str) -> _Shard:
+        return self._shards[zlib.crc32(clave.encode()) % len(self._shards)]
+
+    @staticmethod
+    def _tokens(balde: list, ahora: float) -> float:
+        tokens, ultimo, capacidad, recarga = balde
+        return min(capacidad, tokens + (ahora - ultimo) * recarga)
+
+    def _purgar(self, shard: _Shard, ahora: float) -> bool:
+        """Libera al menos una entrada del shard. False si no hay ninguna descartable."""
+        # Primero los baldes que ya se recargaron completos (equivalen a no tener entrada)
+        llenos = [
+            clave for clave, balde in shard.baldes.items()
+            if self._tokens(balde, ahora) >= balde[2]
+        ]
+        for clave in llenos:
+            del shard.baldes[clave]
+        if len(shard.baldes) < self.max_claves_por_shard:
+            return True
+        # Sigue lleno: el de uso menos reciente que debe a lo sumo un intento
+        for clave, balde in shard.baldes.items():
+            if self._tokens(balde, ahora) >= balde[2] - 1.0:
+                del shard.baldes[clave]
+                return True
+        return False
+
+    def consumir_sync(self, clave: str, capacidad: float, recarga: float, costo: float = 1.0) -> float:
+        ahora = self._reloj()
+        shard = self._shard(clave)
+        with shard.lock:
+            balde = shard.baldes.get(clave)
+            if balde is None:
+                if len(shard.baldes) >= self.max_claves_por_shard and not self._purgar(shard, ahora):
+                    # Solo quedan baldes frenando: no se les devuelven los intentos
+                    return costo / recarga
+                balde = shard.baldes[clave] = [capacidad, ahora, capacidad, recarga]
+            else:
+                balde[0] = self._tokens(balde, ahora)
+                balde[1] = ahora
+                shard.baldes.move_to_end(clave)
+
+            if balde[0] >= costo:
+                balde[0] -= costo
+                return 0.0
+            return (costo - balde[0]) / recarga
+
+    async def consumir(self, clave: str, capacidad: float, recarga: float, costo: float = 1.0) -> float:
+        return self.consumir_sync(clave, capacidad, recarga, costo)
+
+    def limpiar(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.baldes.clear()
+
+
+@dataclass(frozen=True)
+class Limite:
+    capacidad: float
+    recarga: float  # tokens por segundo
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> "Limite":
+        """'10/60' => 10 intentos de ráfaga, recarga de 10 cada 60 segundos."""
+        intentos, segundos = texto.split("/")
+        return cls(capacidad=float(intentos), recarga=float(intentos) / float(segundos))
+
+
+class LimitadorLogin:
+    """Dos baldes por intento: uno por IP y otro por email (normalizado)."""
+
+    def __init__(self, backend: BackendBuckets, por_ip: Limite, por_email: Limite):
+        self.backend = backend
+        self.por_ip = por_ip
+        self.por_email = por_email
+
+    async def verificar(self, ip: Optional[str], email: Optional[str]) -> float:
+        """0.0 si el intento puede seguir; si no, segundos de espera."""
+        if ip:
+            espera = await self.backend.consumir(f"ip:{ip}", self.por_ip.capacidad, self.por_ip.recarga)
+            if espera:
+                return espera
+        if email:
+            clave = f"email:{email.strip().lower()}"
+            return await self.backend.consumir(clave, self.por_email.capacidad, self.por_email.recarga)
+        return 0.0
+
+
+limitador_login = LimitadorLogin(
+    backend=BucketsEnMemoria(),
+    por_ip=Limite.desde_texto(os.getenv("LOGIN_LIMITE_IP", "30/60")),
+    por_email=Limite.desde_texto(os.getenv("LOGIN_LIMITE_EMAIL", "5/300")),
+)
+
+
+def configurar_backend(backend: BackendBuckets) -> None:
+    """Reemplaza el almacenamiento (p.ej. uno compartido entre workers)."""
+    limitador_login.backend = backend
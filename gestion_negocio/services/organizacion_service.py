@@ -0,0 +1,223 @@
+# gestion_negocio/services/organizacion_service.py
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import CursorResult, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from models.organizaciones import (
+    Organizacion,
+    Sucursal,
+    Bodega,
+    Caja,
+    CentroCosto,
+    TiendaVirtual,
+    NumeracionTransaccion
+)
+from models.planes import Plan
+from models.usuarios import Usuario
+from services.cache_service import CacheTTL
+
+# Tablas que se cuentan en el overview (etiqueta => modelo)
+CONTEOS_OVERVIEW = {
+    "sucursales": Sucursal,
+    "bodegas": Bodega,
+    "cajas": Caja,
+    "centros_costos": CentroCosto,
+    "tiendas_virtuales": TiendaVirtual,
+    "numeraciones": NumeracionTransaccion,
+    "usuarios": Usuario,
+}
+
+_MODELOS_OVERVIEW = tuple(CONTEOS_OVERVIEW.values()) + (Organizacion,)
+
+overview_cache = CacheTTL(ttl_segundos=float(os.getenv("OVERVIEW_CACHE_TTL", "60")))
+
+
+def _subconsulta_conteo(modelo):
+    return (
+        select(func.count(modelo.id))
+        .where(modelo.organizacion_id == Organizacion.id)
+        .correlate(Organizacion)
+        .scalar_subquery()
+    )
+
+
+async def obtener_overview(db: AsyncSession, org_id: int) -> Optional[dict]:
+    """
+    Devuelve los conteos de sub-entidades y el estado del plan de la
+    organización en UNA sola sentencia SQL (subconsultas escalares).
+    Retorna None si la organización no existe.
+    """
+    datos = overview_cache.get(org_id)
+    if datos is None:
+        stmt = (
+            select(
+                Organizacion.id,
+                Organizacion.nombre_fiscal,
+                Organizacion.estado,
+                Organizacion.plan_id,
+                Organizacion.fecha_inicio_plan,
+                Organizacion.fecha_fin_plan,
+                Organizacion.trial_activo,
+                Plan.nombre_plan,
+                Plan.max_usuarios,
+                Plan.max_empleados,
+                Plan.max_sucursales,
+                *[
+                    _subconsulta_conteo(modelo).label(etiqueta)
+                    for etiqueta, modelo in CONTEOS_OVERVIEW.items()
+                ]
+            )
+            .outerjoin(Plan, Plan.id == Organizacion.plan_id)
+            .where(Organizacion.id == org_id)
+        )
+        result = await db.execute(stmt)
+        row = result.first()
+        if not row:
+            return None
+        datos = dict(row._mapping)
+        overview_cache.set(org_id, datos)
+
+    return _armar_overview(datos)
+
+
+def _armar_overview(datos: dict) -> dict:
+    """
+    El estado del plan depende de la hora actual, por eso se calcula
+    al responder y no se guarda en la caché.
+    """
+    fecha_fin = datos["fecha_fin_plan"]
+    dias_restantes = None
+    plan_vigente = datos["plan_id"] is not None
+    if fecha_fin is not None:
+        if fecha_fin.tzinfo is None:
+            fecha_fin = fecha_fin.replace(tzinfo=timezone.utc)
+        restante = fecha_fin - datetime.now(timezone.utc)
+        dias_restantes = max(restante.days, 0)
+        plan_vigente = plan_vigente and restante.total_seconds() > 0
+
+    return {
+        "organizacion_id": datos["id"],
+        "nombre_fiscal": datos["nombre_fiscal"],
+        "estado": datos["estado"],
+        "plan": {
+            "plan_id": datos["plan_id"],
+            "nombre_plan": datos["nombre_plan"],
+            "max_usuarios": datos["max_usuarios"],
+            "max_empleados": datos["max_empleados"],
+            "max_sucursales": datos["max_sucursales"],
+            "fecha_inicio_plan": datos["fecha_inicio_plan"],
+            "fecha_fin_plan": datos["fecha_fin_plan"],
+            "trial_activo": bool(datos["trial_activo"]),
+            "plan_vigente": plan_vigente,
+            "dias_restantes": dias_restantes,
+        },
+        "conteos": {etiqueta: datos[etiqueta] or 0 for etiqueta in CONTEOS_OVERVIEW},
+    }
+
+
+# -----------------------------------------------------------------------------
+#             INVALIDACIÓN DE LA CACHÉ EN ESCRITURAS (eventos ORM)
+# -----------------------------------------------------------------------------
+def _orgs_afectadas(obj) -> set:
+    if isinstance(obj, Organizacion):
+        return {obj.id}
+    # Valor actual y, si cambió, el anterior (p.ej. usuario movido de org)
+    historial = inspect(obj).attrs.organizacion_id.history
+    return {obj.organizacion_id, *historial.deleted}
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_orgs_modificadas(session, flush_context):
+    pendientes = session.info.setdefault("overview_orgs", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _MODELOS_OVERVIEW):
+            pendientes.update(_orgs_afectadas(obj))
+
+
+def _columna_org(modelo):
+    return modelo.__table__.c.id if modelo is Organizacion else modelo.__table__.c.organizacion_id
+
+
+def _orgs_en_where(statement, columna) -> set:
+    """Valores de `columna == :valor` en el WHERE (filtro de la org en los PATCH/DELETE)."""
+    orgs = set()
+    if statement.whereclause is None:
+        return orgs
+    for elemento in visitors.iterate(statement.whereclause):
+        if (
+            isinstance(elemento, BinaryExpression)
+            and elemento.operator is operators.eq
+            and isinstance(elemento.right, BindParameter)
+            and getattr(elemento.left, "table", None) is columna.table
+            and getattr(elemento.left, "key", None) == columna.key
+        ):
+            orgs.add(elemento.right.value)
+    return orgs
+
+
+def _orgs_en_filas(filas, modelo, columna) -> set:
+    """Org de cada fila del RETURNING (instancia ORM o columna suelta)."""
+    orgs = set()
+    for fila in filas:
+        for valor in fila:
+            if isinstance(valor, modelo):
+                orgs.add(getattr(valor, columna.key))
+        if columna.key in fila._mapping:
+            orgs.add(fila._mapping[columna.key])
+    return orgs
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml_masivo(orm_execute_state):
+    """
+    insert()/update()/delete() directos (services/escritura_service.py) no
+    pasan por el flush. La org sale del RETURNING (valor nuevo) y del
+    filtro del WHERE (valor anterior); solo si no aparece en ninguno se
+    invalida toda la caché.
+    """
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, _MODELOS_OVERVIEW):
+        return None
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    modelo = mapper.class_
+    columna = _columna_org(modelo)
+    session = orm_execute_state.session
+    orgs = _orgs_en_where(orm_execute_state.statement, columna)
+
+    result = orm_execute_state.invoke_statement()
+    # Sin RETURNING el ORM entrega el CursorResult del driver, sin filas
+    if not isinstance(result, CursorResult) or result.returns_rows:
+        # Se leen las filas y se entrega una copia idéntica a quien ejecutó
+        congelado = result.freeze()
+        orgs |= _orgs_en_filas(congelado().all(), modelo, columna)
+        result = congelado()
+
+    orgs.discard(None)
+    if orgs:
+        session.info.setdefault("overview_orgs", set()).update(orgs)
+    else:
+        session.info["overview_invalidar_todo"] = True
+    return result
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_overview(session):
+    if session.info.pop("overview_invalidar_todo", False):
+        overview_cache.limpiar()
+    for org_id in session.info.pop("overview_orgs", ()):
+        if org_id is not None:
+            overview_cache.invalidar(org_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session):
+    session.info.pop("overview_orgs", None)
+    session.info.pop("overview_invalidar_todo", None)
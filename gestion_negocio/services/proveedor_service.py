@@ -3,34 +3,20 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.proveedores import Proveedor
-from models.organizaciones import Sucursal
 from schemas.proveedores import ProveedorSchema
-from services.common_validations import (
-    validate_documento_unico,
-    validate_sucursal_same_org
-)
+from services.common_validations import validar_referencias
 from services.dv_calculator import calc_dv_if_nit
+from services.integridad_service import traducir_integridad
 
 
 async def create_proveedor(db: AsyncSession, data: ProveedorSchema) -> Proveedor:
     """
     Crea un nuevo proveedor de forma asíncrona.
     """
-    # 1) Unicidad (organizacion_id, numero_documento)
-    await validate_documento_unico(
-        db=db,
-        model_class=Proveedor,
-        organizacion_id=data.organizacion_id,
-        numero_documento=data.numero_documento
-    )
+    # 1) Unicidad (organizacion_id, numero_documento): la valida uq_proveedor_org_doc al guardar
 
-    # 2) Verificar que la sucursal pertenece a la misma org
-    await validate_sucursal_same_org(
-        db=db,
-        sucursal_id=data.sucursal_id,
-        organizacion_id=data.organizacion_id,
-        SucursalModel=Sucursal
-    )
+    # 2) Referencias (catálogos, sucursal, vendedor...): todas a la vez
+    await validar_referencias(db, Proveedor, data.dict(), data.organizacion_id)
 
     # 3) Calcular DV si es NIT
     dv = calc_dv_if_nit(data.tipo_documento_id, data.numero_documento)
@@ -65,7 +51,8 @@ async def create_proveedor(db: AsyncSession, data: ProveedorSchema) -> Proveedor
         observacion=data.observacion
     )
     db.add(proveedor)
-    await db.commit()
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(proveedor)
     return proveedor
 
@@ -102,23 +89,10 @@ async def update_proveedor(db: AsyncSession, proveedor_id: int, data: ProveedorS
         # Si lo permites, verificar la unicidad en la nueva org
         pass
 
-    # 2) Si el numero_documento cambió => check unicidad
-    if data.numero_documento != proveedor.numero_documento:
-        await validate_documento_unico(
-            db=db,
-            model_class=Proveedor,
-            organizacion_id=data.organizacion_id,
-            numero_documento=data.numero_documento
-        )
+    # 2) Unicidad (organizacion_id, numero_documento): la valida uq_proveedor_org_doc al guardar
 
-    # 3) Si sucursal_id cambió => validar org
-    if data.sucursal_id is not None and data.sucursal_id != proveedor.sucursal_id:
-        await validate_sucursal_same_org(
-            db=db,
-            sucursal_id=data.sucursal_id,
-            organizacion_id=data.organizacion_id,
-            SucursalModel=Sucursal
-        )
+    # 3) Referencias (catálogos, sucursal, vendedor...): todas a la vez
+    await validar_referencias(db, Proveedor, data.dict(), data.organizacion_id)
 
     # 4) Recalcular DV si es NIT
     dv_calc = calc_dv_if_nit(data.tipo_documento_id, data.numero_documento)
@@ -150,6 +124,7 @@ async def update_proveedor(db: AsyncSession, proveedor_id: int, data: ProveedorS
     proveedor.sucursal_id = data.sucursal_id
     proveedor.observacion = data.observacion
 
-    await db.commit()
+    async with traducir_integridad(db):
+        await db.commit()
     await db.refresh(proveedor)
     return proveedor
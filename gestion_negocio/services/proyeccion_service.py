@@ -0,0 +1,106 @@
+# gestion_negocio/services/proyeccion_service.py
+
+"""
+Proyecciones por columnas ("sparse fieldsets") para los listados.
+
+En lugar de `select(Modelo)` + selectinload de las relaciones, se arma un
+`select(col1, col2, ...)` con SOLO las columnas pedidas y un outer join por
+cada relación solicitada. Las filas se devuelven como dicts con la misma
+forma que el esquema completo (las relaciones como objetos anidados), así el
+front puede pedir menos campos sin cambiar cómo los lee.
+"""
+
+from typing import Optional
+
+from sqlalchemy import inspect, select
+
+
+class RelacionProyectable:
+    """Relación many-to-one que se puede incluir en una proyección."""
+
+    def __init__(self, modelo, fk, columnas: tuple):
+        self.modelo = modelo
+        self.fk = fk
+        self.columnas = columnas
+
+
+class Proyeccion:
+    """
+    Describe qué campos de `modelo` se pueden pedir en un listado.
+
+    - columnas: todas las columnas propias del modelo.
+    - relaciones: nombre del campo anidado => RelacionProyectable.
+    - vistas: nombre de vista (p.ej. "summary") => lista de campos.
+    """
+
+    def __init__(self, modelo, relaciones: dict, vistas: dict):
+        self.modelo = modelo
+        self.columnas = {c.key: c for c in inspect(modelo).column_attrs}
+        self.relaciones = relaciones
+        self.vistas = vistas
+
+    def resolver_campos(self, fields: Optional[str], view: Optional[str]) -> Optional[list]:
+        """
+        Traduce los parámetros `fields` / `view` a la lista de campos a
+        proyectar. Retorna None si no se pidió proyección (respuesta completa).
+        Lanza ValueError si la vista o algún campo no existen.
+        """
+        if not fields and not view:
+            return None
+
+        campos = []
+        if view:
+            if view not in self.vistas:
+                raise ValueError(
+                    f"Vista '{view}' no soportada. Opciones: {', '.join(self.vistas)}"
+                )
+            campos.extend(self.vistas[view])
+        if fields:
+            campos.extend(c.strip() for c in fields.split(",") if c.strip())
+
+        desconocidos = [
+            c for c in campos if c not in self.columnas and c not in self.relaciones
+        ]
+        if desconocidos:
+            raise ValueError(f"Campos no soportados: {', '.join(desconocidos)}")
+
+        # El id siempre va (el front lo usa como key de fila); sin duplicados
+        return list(dict.fromkeys(["id", *campos]))
+
+    def construir_select(self, campos: list):
+        """select(...) con las columnas pedidas y los joins estrictamente necesarios."""
+        columnas = []
+        joins = []
+        for campo in campos:
+            if campo in self.relaciones:
+                rel = self.relaciones[campo]
+                columnas.extend(
+                    getattr(rel.modelo, col).label(f"{campo}__{col}")
+                    for col in rel.columnas
+                )
+                joins.append(rel)
+            else:
+                columnas.append(self.columnas[campo].expression.label(campo))
+
+        stmt = select(*columnas).select_from(self.modelo)
+        for rel in joins:
+            stmt = stmt.outerjoin(rel.modelo, rel.modelo.id == rel.fk)
+        return stmt
+
+    def armar_filas(self, rows, campos: list) -> list:
+        """Convierte las filas planas en dicts con las relaciones anidadas."""
+        data = []
+        for row in rows:
+            valores = row._mapping
+            item = {}
+            for campo in campos:
+                if campo in self.relaciones:
+                    columnas = self.relaciones[campo].columnas
+                    if valores[f"{campo}__id"] is None:
+                        item[campo] = None
+                    else:
+                        item[campo] = {col: valores[f"{campo}__{col}"] for col in columnas}
+                else:
+                    item[campo] = valores[campo]
+            data.append(item)
+        return data
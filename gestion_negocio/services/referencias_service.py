@@ -0,0 +1,211 @@
+# gestion_negocio/services/referencias_service.py
+
+"""
+Registro en memoria de tablas de referencia (catálogos y ubicaciones).
+
+Estas tablas casi nunca cambian, así que en vez de hacer join/selectinload
+en cada listado se cargan completas al arrancar el proceso y los esquemas
+de respuesta completan `tipo_documento`, `departamento`, `ciudad`, ... por id
+(ver `ReferenciasMixin` en schemas/common_schemas.py).
+
+- El snapshot es inmutable: una recarga construye uno nuevo y lo reemplaza
+  de forma atómica, los lectores nunca ven datos a medio cargar.
+- `version` solo aumenta cuando el contenido realmente cambió; `huellas`
+  identifica el contenido de cada tabla (GET /bootstrap las publica para
+  que el frontend solo vuelva a pedir las que cambiaron).
+- Cada worker tiene su propio snapshot; se refresca cada
+  REFERENCIAS_REFRESH_SEGUNDOS o con POST /catalogos/recargar-referencias.
+- Los GET de /catalogos y /ubicaciones se sirven desde el snapshot: el JSON
+  de cada tabla se arma una vez por versión y sus variantes gzip/br se
+  comprimen una vez por proceso (core.compresion.CuerpoPrecomprimido).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from sqlalchemy import inspect, select
+
+from core.compresion import CuerpoPrecomprimido
+
+from models.catalogos import (
+    TipoDocumento,
+    RegimenTributario,
+    TipoPersona,
+    Moneda,
+    TarifaPrecios,
+    ActividadEconomica,
+    FormaPago,
+    Retencion,
+    TipoMarketing,
+    RutaLogistica
+)
+from models.ubicaciones import Departamento, Ciudad
+
+logger = logging.getLogger(__name__)
+
+# Nombre de la tabla en el registro => modelo
+TABLAS_REFERENCIA = {
+    "tipos_documento": TipoDocumento,
+    "regimenes_tributarios": RegimenTributario,
+    "tipos_persona": TipoPersona,
+    "monedas": Moneda,
+    "tarifas_precios": TarifaPrecios,
+    "actividades_economicas": ActividadEconomica,
+    "formas_pago": FormaPago,
+    "retenciones": Retencion,
+    "tipos_marketing": TipoMarketing,
+    "rutas_logisticas": RutaLogistica,
+    "departamentos": Departamento,
+    "ciudades": Ciudad,
+}
+
+REFRESH_SEGUNDOS = float(os.getenv("REFERENCIAS_REFRESH_SEGUNDOS", "3600"))
+
+_VACIO = MappingProxyType({})
+
+
+class SnapshotReferencias:
+    """Foto inmutable de todas las tablas de referencia."""
+
+    __slots__ = ("version", "huella", "huellas", "cargado_en", "_tablas", "_json")
+
+    def __init__(self, tablas: dict, version: int, huella: str, cargado_en: Optional[datetime]):
+        self._tablas = MappingProxyType({
+            nombre: MappingProxyType({fila["id"]: MappingProxyType(fila) for fila in filas})
+            for nombre, filas in tablas.items()
+        })
+        self.version = version
+        self.huella = huella
+        self.huellas = MappingProxyType({nombre: _huella({nombre: filas}) for nombre, filas in tablas.items()})
+        self.cargado_en = cargado_en
+        # Caché derivada (no cambia lo que el snapshot representa)
+        self._json = {}
+
+    def __setattr__(self, nombre, valor):
+        if hasattr(self, nombre):
+            raise AttributeError("SnapshotReferencias es inmutable")
+        object.__setattr__(self, nombre, valor)
+
+    @property
+    def cargado(self) -> bool:
+        return self.cargado_en is not None
+
+    def get(self, tabla: str, id_: Optional[int]) -> Optional[Mapping]:
+        if id_ is None:
+            return None
+        return self._tablas.get(tabla, _VACIO).get(id_)
+
+    def existe(self, tabla: str, id_: Optional[int]) -> bool:
+        return self.get(tabla, id_) is not None
+
+    def listar(self, tabla: str) -> tuple:
+        return tuple(self._tablas.get(tabla, _VACIO).values())
+
+    def json(self, tabla: str, **filtros) -> CuerpoPrecomprimido:
+        """Filas de `tabla` (filtradas por igualdad) como JSON listo para servir."""
+        clave = (tabla, *sorted(filtros.items()))
+        cuerpo = self._json.get(clave)
+        if cuerpo is None:
+            filas = [
+                dict(fila) for fila in self.listar(tabla)
+                if all(fila.get(campo) == valor for campo, valor in filtros.items())
+            ]
+            # Mismo formato que JSONResponse
+            cuerpo = CuerpoPrecomprimido(
+                json.dumps(filas, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            )
+            # Filtros sin resultados no se guardan: la caché queda acotada
+            # por los valores que existen
+            if filas or not filtros:
+                self._json[clave] = cuerpo
+        return cuerpo
+
+    def resumen(self) -> dict:
+        return {
+            "version": self.version,
+            "huella": self.huella,
+            "cargado_en": self.cargado_en,
+            "tablas": {nombre: len(filas) for nombre, filas in self._tablas.items()},
+        }
+
+
+_snapshot = SnapshotReferencias({}, version=0, huella="", cargado_en=None)
+_lock_recarga = asyncio.Lock()
+
+
+def obtener_referencias() -> SnapshotReferencias:
+    """Snapshot vigente (nunca None; vacío si aún no se ha cargado)."""
+    return _snapshot
+
+
+def _huella(tablas: dict) -> str:
+    contenido = repr([
+        (nombre, [sorted(fila.items()) for fila in filas])
+        for nombre, filas in sorted(tablas.items())
+    ])
+    return hashlib.sha1(contenido.encode()).hexdigest()[:12]
+
+
+async def respuesta_referencias(request, tabla: str, **filtros):
+    """
+    Respuesta precomprimida con las filas de `tabla` desde el snapshot, o
+    None si el registro aún no se cargó (el llamador consulta la BD).
+    """
+    snapshot = _snapshot
+    if not snapshot.cargado:
+        return None
+    return await snapshot.json(tabla, **filtros).respuesta(request)
+
+
+async def _leer_tablas(db) -> dict:
+    tablas = {}
+    for nombre, modelo in TABLAS_REFERENCIA.items():
+        columnas = [c.expression for c in inspect(modelo).column_attrs]
+        result = await db.execute(select(*columnas).order_by(modelo.id))
+        tablas[nombre] = [dict(row._mapping) for row in result]
+    return tablas
+
+
+async def recargar_referencias(db=None) -> SnapshotReferencias:
+    """
+    Lee todas las tablas de referencia y publica un snapshot nuevo.
+    Si `db` es None abre su propia sesión.
+    """
+    global _snapshot
+
+    async with _lock_recarga:
+        if db is None:
+            from database import AsyncSessionLocal
+            async with AsyncSessionLocal() as sesion:
+                tablas = await _leer_tablas(sesion)
+        else:
+            tablas = await _leer_tablas(db)
+
+        huella = _huella(tablas)
+        actual = _snapshot
+        version = actual.version if huella == actual.huella else actual.version + 1
+        _snapshot = SnapshotReferencias(
+            tablas,
+            version=version,
+            huella=huella,
+            cargado_en=datetime.now(timezone.utc)
+        )
+        return _snapshot
+
+
+async def refrescar_periodicamente(intervalo: float = REFRESH_SEGUNDOS):
+    """Tarea en segundo plano: recarga el registro cada `intervalo` segundos."""
+    while True:
+        # Si la carga inicial falló se reintenta más seguido
+        espera = intervalo if _snapshot.cargado else min(intervalo, 30)
+        await asyncio.sleep(espera)
+        try:
+            await recargar_referencias()
+        except Exception:
+            logger.exception("No se pudo recargar el registro de referencias")
@@ -0,0 +1,253 @@
+# gestion_negocio/services/sync_service.py
+
+"""
+Sincronización incremental para clientes con copia local (POS offline).
+
+    GET /sync/clientes                 primera carga (por páginas)
+    GET /sync/clientes?since=<cursor>  solo lo que cambió desde el cursor
+
+Cada respuesta trae las filas creadas o modificadas ("cambios") y los ids
+eliminados ("eliminados"), más un cursor opaco para la siguiente llamada.
+El cliente aplica primero los cambios y después las bajas.
+
+- Cambios: keyset por (fecha_actualizacion, id), con índice
+  (organizacion_id, fecha_actualizacion, id): cada página es un range scan,
+  sin OFFSET ni conteos.
+- Bajas: lápidas en la tabla `eliminaciones`, que se escriben en el mismo
+  flush que el DELETE (evento before_flush de la sesión). Un delete()
+  masivo no pasa por el flush: quien lo use debe insertar las lápidas.
+- Cambio de organización: para la organización anterior la fila es una
+  baja. El flush escribe esa lápida si cambia organizacion_id de una
+  instancia; los PATCH/PUT con UPDATE directo (actualizar_returning)
+  llaman registrar_cambio_organizacion() antes de actualizar.
+- fecha_actualizacion es la hora de inicio de la transacción que escribió
+  la fila, y una transacción puede confirmar después de que otra más nueva
+  ya se sincronizó. Por eso solo se sirven filas con más de SYNC_MARGEN_S
+  segundos: lo más reciente llega en la siguiente llamada. Una transacción
+  que tarda más de SYNC_MARGEN_S en confirmar queda por detrás de un
+  cursor que ya pasó su fecha: sus filas no se entregan hasta que vuelvan
+  a cambiar y sus lápidas no se entregan nunca. Las transacciones que
+  escriben en estas tablas deben durar menos que el margen (o subirlo).
+- Las lápidas se conservan SYNC_RETENCION_DIAS. La posición de lápidas
+  del cursor es la última entregada o, si ya se entregaron todas, el
+  horizonte de esa llamada (hora del servidor menos el margen) con id 0:
+  el cliente tiene todas las bajas anteriores a ese punto. Si ese punto
+  es más viejo que la retención, las lápidas siguientes pudieron
+  purgarse: 410 y el cliente debe volver a cargar todo. Una organización
+  sin bajas no vence mientras el cliente sincronice dentro de la
+  retención.
+"""
+
+import base64
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import delete, event, func, inspect, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from models.clientes import Cliente
+from models.empleados import Empleado
+from models.productos import Producto
+from models.proveedores import Proveedor
+from models.sincronizacion import Eliminacion
+from schemas.clientes import ClienteResponseSchema
+from schemas.empleados import EmpleadoResponseSchema
+from schemas.productos import ProductoSyncSchema
+from schemas.proveedores import ProveedorResponseSchema
+
+SYNC_LIMITE = int(os.getenv("SYNC_LIMITE", "500"))
+SYNC_LIMITE_MAX = 2000
+SYNC_MARGEN_S = float(os.getenv("SYNC_MARGEN_S", "5"))
+SYNC_RETENCION_DIAS = int(os.getenv("SYNC_RETENCION_DIAS", "30"))
+
+T = TypeVar("T")
+
+
+class RespuestaSync(BaseModel, Generic[T]):
+    entidad: str
+    cambios: List[T]
+    eliminados: List[int]
+    cursor: str
+    hay_mas: bool
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+class CursorVencido(Exception):
+    """El cursor es anterior a la retención de lápidas: hay que recargar todo."""
+
+
+class EntidadSync:
+    def __init__(self, modelo, esquema, por_organizacion: bool = True):
+        self.modelo = modelo
+        self.tabla = modelo.__tablename__
+        self.respuesta = RespuestaSync[esquema]
+        self.por_organizacion = por_organizacion
+
+
+ENTIDADES = {
+    "clientes": EntidadSync(Cliente, ClienteResponseSchema),
+    "empleados": EntidadSync(Empleado, EmpleadoResponseSchema),
+    "proveedores": EntidadSync(Proveedor, ProveedorResponseSchema),
+    # productos no tiene organizacion_id (catálogo compartido, como GET /productos)
+    "productos": EntidadSync(Producto, ProductoSyncSchema, por_organizacion=False),
+}
+_POR_MODELO = {entidad.modelo: entidad for entidad in ENTIDADES.values()}
+
+
+# -----------------------------------------------------------------------------
+#                                 CURSOR
+# -----------------------------------------------------------------------------
+def codificar_cursor(cambios: Optional[tuple], eliminados: Optional[tuple]) -> str:
+    """(fecha, id) de la última fila entregada y hasta dónde se entregaron las lápidas."""
+    datos = [
+        [posicion[0].isoformat(), posicion[1]] if posicion else None
+        for posicion in (cambios, eliminados)
+    ]
+    return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(texto: str) -> tuple:
+    try:
+        relleno = "=" * (-len(texto) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(texto + relleno))
+        pos_cambios, pos_eliminados = (
+            (datetime.fromisoformat(posicion[0]), int(posicion[1])) if posicion else None
+            for posicion in datos
+        )
+    except Exception:
+        raise CursorInvalido("Cursor de sincronización inválido")
+    for posicion in (pos_cambios, pos_eliminados):
+        if posicion is not None and posicion[0].tzinfo is None:
+            raise CursorInvalido("Cursor de sincronización inválido")
+    return pos_cambios, pos_eliminados
+
+
+# -----------------------------------------------------------------------------
+#                                 CONSULTA
+# -----------------------------------------------------------------------------
+def _despues_de(columnas: tuple, posicion: Optional[tuple]) -> list:
+    if posicion is None:
+        return []
+    return [tuple_(*columnas) > tuple_(literal(posicion[0]), literal(posicion[1]))]
+
+
+def _filtro_organizacion(columna, entidad: EntidadSync, organizacion_id: Optional[int]) -> list:
+    if not entidad.por_organizacion:
+        return []
+    return [columna == organizacion_id]
+
+
+async def cambios_desde(db, entidad: EntidadSync, organizacion_id: Optional[int],
+                        since: Optional[str], limite: int = SYNC_LIMITE) -> dict:
+    """Contenido de RespuestaSync para `entidad` desde el cursor `since`."""
+    modelo = entidad.modelo
+    # Hora del servidor de BD (la misma que escribe fecha_actualizacion)
+    ahora = (await db.execute(select(func.now()))).scalar_one()
+    horizonte = ahora - timedelta(seconds=SYNC_MARGEN_S)
+
+    pos_cambios = None
+    # Primera carga: las bajas anteriores no le sirven al cliente
+    pos_eliminados = (horizonte, 0)
+    if since:
+        pos_cambios, pos_eliminados = decodificar_cursor(since)
+        # Sin posición de lápidas (formato anterior del cursor) no se sabe
+        # si se purgaron bajas pendientes: se trata como vencido
+        if pos_eliminados is None or pos_eliminados[0] < ahora - timedelta(days=SYNC_RETENCION_DIAS):
+            raise CursorVencido()
+
+    columnas = (modelo.fecha_actualizacion, modelo.id)
+    filas = (await db.execute(
+        select(modelo)
+        .where(
+            *_filtro_organizacion(getattr(modelo, "organizacion_id", None), entidad, organizacion_id),
+            modelo.fecha_actualizacion < horizonte,
+            *_despues_de(columnas, pos_cambios),
+        )
+        .order_by(*columnas)
+        .limit(limite + 1)
+    )).scalars().all()
+
+    lapidas = []
+    if since:
+        columnas_lapida = (Eliminacion.fecha_eliminacion, Eliminacion.id)
+        lapidas = (await db.execute(
+            select(Eliminacion.fecha_eliminacion, Eliminacion.id, Eliminacion.registro_id)
+            .where(
+                Eliminacion.tabla == entidad.tabla,
+                *_filtro_organizacion(Eliminacion.organizacion_id, entidad, organizacion_id),
+                Eliminacion.fecha_eliminacion < horizonte,
+                *_despues_de(columnas_lapida, pos_eliminados),
+            )
+            .order_by(*columnas_lapida)
+            .limit(limite + 1)
+        )).all()
+
+    hay_mas = len(filas) > limite or len(lapidas) > limite
+    filas = filas[:limite]
+    if filas:
+        pos_cambios = (filas[-1].fecha_actualizacion, filas[-1].id)
+    if len(lapidas) > limite:
+        lapidas = lapidas[:limite]
+        pos_eliminados = (lapidas[-1].fecha_eliminacion, lapidas[-1].id)
+    elif pos_eliminados < (horizonte, 0):
+        # Todas las bajas anteriores al horizonte ya se entregaron
+        pos_eliminados = (horizonte, 0)
+
+    return {
+        "entidad": entidad.tabla,
+        "cambios": filas,
+        "eliminados": [lapida.registro_id for lapida in lapidas],
+        "cursor": codificar_cursor(pos_cambios, pos_eliminados),
+        "hay_mas": hay_mas,
+    }
+
+
+async def purgar_eliminaciones(db) -> int:
+    """Borra las lápidas fuera de la retención. Retorna cuántas."""
+    limite = datetime.now(timezone.utc) - timedelta(days=SYNC_RETENCION_DIAS)
+    result = await db.execute(delete(Eliminacion).where(Eliminacion.fecha_eliminacion < limite))
+    await db.commit()
+    return result.rowcount
+
+
+# -----------------------------------------------------------------------------
+#                     LÁPIDAS EN CADA DELETE (evento ORM)
+# -----------------------------------------------------------------------------
+def _lapida(entidad: EntidadSync, registro_id: int, organizacion_id: Optional[int]) -> Eliminacion:
+    return Eliminacion(tabla=entidad.tabla, registro_id=registro_id, organizacion_id=organizacion_id)
+
+
+def registrar_cambio_organizacion(db, actual, organizacion_id: Optional[int]) -> None:
+    """
+    Antes de un UPDATE directo que puede mover `actual` a `organizacion_id`:
+    lápida para la organización anterior (su copia local debe soltar la
+    fila; la nueva la recibe como cambio). No hace nada si no cambia.
+    """
+    entidad = _POR_MODELO.get(type(actual))
+    if entidad is None or not entidad.por_organizacion:
+        return
+    if organizacion_id is None or organizacion_id == actual.organizacion_id:
+        return
+    db.add(_lapida(entidad, actual.id, actual.organizacion_id))
+
+
+@event.listens_for(Session, "before_flush")
+def _registrar_eliminaciones(session, flush_context, instances):
+    for obj in list(session.deleted):
+        entidad = _POR_MODELO.get(type(obj))
+        if entidad is not None:
+            session.add(_lapida(entidad, obj.id, getattr(obj, "organizacion_id", None)))
+    # Instancias movidas a otra organización: baja para la anterior
+    for obj in list(session.dirty):
+        entidad = _POR_MODELO.get(type(obj))
+        if entidad is None or not entidad.por_organizacion:
+            continue
+        for anterior in inspect(obj).attrs.organizacion_id.history.deleted:
+            if anterior is not None and anterior != obj.organizacion_id:
+                session.add(_lapida(entidad, obj.id, anterior))
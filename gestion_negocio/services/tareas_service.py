@@ -0,0 +1,17 @@
+# gestion_negocio/services/tareas_service.py
+
+"""
+Handlers de la cola de trabajos (core/trabajos.py). Importar este módulo
+los registra; lo importan main.py y `python -m core.trabajos`.
+"""
+
+from core.trabajos import ContextoTrabajo, trabajo
+from services.sync_service import purgar_eliminaciones
+
+
+@trabajo("sync.purgar_eliminaciones", max_intentos=3, timeout_s=600, cada_s=24 * 3600)
+async def purgar_lapidas(ctx: ContextoTrabajo) -> dict:
+    """Borra las lápidas de sincronización fuera de la retención (una vez al día)."""
+    async with ctx.sesion() as db:
+        eliminadas = await purgar_eliminaciones(db)
+    return {"eliminadas": eliminadas}